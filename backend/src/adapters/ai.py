@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import os
 import re
-from typing import Optional
+from typing import List, Optional
 
+import httpx
 from dotenv import load_dotenv
-from openai import OpenAI
-from src.protocols.ai import AIClientProtocol
+from openai import AsyncOpenAI
+from src.adapters.ai_batching import batch_call_timeout
+from src.core.config import settings
+from src.protocols.ai import BatchAIClientProtocol
+from src.schemas.ai_service import AnalyzeRequest
 from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
 
 # Загружаем переменные окружения из .env (локальная разработка)
@@ -18,6 +24,11 @@ YC_API_KEY = os.getenv("YC_API_KEY")
 YC_MODEL = os.getenv("YC_MODEL", "yandexgpt-lite/rc")
 
 
+def yandex_credentials_configured() -> bool:
+    """Заданы ли ключи YandexGPT (без них YandexAIClient не создать)."""
+    return bool(YC_FOLDER_ID and YC_API_KEY)
+
+
 # ==========================
 #  PROMPT для YandexGPT
 #  (та же логика, что в тестовом скрипте, но без эскалации)
@@ -108,6 +119,24 @@ EXECUTOR_RESPONSE_SYSTEM_PROMPT = """
 """.strip()
 
 
+# Пачка заявок одним запросом: та же логика, на входе и выходе — массивы
+EXECUTOR_RESPONSE_BATCH_PROMPT = EXECUTOR_RESPONSE_SYSTEM_PROMPT + """
+
+ПАКЕТНЫЙ РЕЖИМ:
+- Вместо одного объекта тебе передают JSON-массив таких объектов,
+  у каждого есть дополнительное поле "index".
+- Проанализируй каждый объект независимо от остальных.
+- Верни строго один JSON-массив той же длины, где каждый элемент —
+  объект ответа описанного выше формата плюс поле "index" из входа.
+"""
+
+# Версия "модель + промпт": меняется при любой правке промпта или YC_MODEL,
+# по ней автоматически инвалидируется кэш решений
+EXECUTOR_RESPONSE_PROMPT_VERSION = hashlib.sha256(
+    f"{YC_MODEL}\n{EXECUTOR_RESPONSE_SYSTEM_PROMPT}".encode()
+).hexdigest()[:16]
+
+
 def _extract_json_maybe(text: str) -> dict:
     """
     Аккуратно вытаскиваем JSON из ответа модели.
@@ -121,28 +150,164 @@ def _extract_json_maybe(text: str) -> dict:
     return json.loads(candidate)
 
 
-class YandexAIClient(AIClientProtocol):
+def build_executor_payload(
+    complaint_description: str,
+    update: ExecutorUpdateRequest,
+) -> dict:
+    """
+    Формируем структурированный payload (как в тесте) для модели.
+    """
+
+    # Пытаемся аккуратно вытащить максимум полей из update.
+    # Если каких-то атрибутов нет в ExecutorUpdateRequest — будет None, всё ок.
+    complaint_id = getattr(update, "complaint_id", None)
+    status = getattr(update, "status", None)
+    district = getattr(update, "district", None)
+    executor_id = getattr(update, "executor_id", None)
+
+    real_duration_days = getattr(update, "real_duration_days", None)
+    expected_duration_days = getattr(
+        update, "expected_duration_days", None)
+    delay_days = getattr(update, "delay_days", None)
+    football_threshold_days = getattr(
+        update, "football_threshold_days", None)
+    ratio_to_expected = getattr(update, "ratio_to_expected", None)
+
+    timing = {
+        "real_duration_days": float(real_duration_days) if real_duration_days is not None else None,
+        "expected_duration_days": float(expected_duration_days) if expected_duration_days is not None else None,
+        "delay_days": float(delay_days) if delay_days is not None else None,
+        "football_threshold_days": float(football_threshold_days) if football_threshold_days is not None else None,
+        "ratio_to_expected": float(ratio_to_expected) if ratio_to_expected is not None else None,
+    }
+
+    return {
+        "complaint_id": int(complaint_id) if complaint_id is not None else None,
+        "status": status,
+        "district": int(district) if district is not None else None,
+        "executor_id": int(executor_id) if executor_id is not None else None,
+        "texts": {
+            "description": complaint_description,
+            "executor_response": update.response_text,
+        },
+        "timing": timing,
+    }
+
+
+def parse_executor_result(data: dict) -> ExecutorUpdateResult:
+    """
+    Маппим JSON модели (decision, is_forward, is_blocking_bounce,
+    target_executor_name, moderator_message, ai_badge) на ExecutorUpdateResult.
+    """
+    decision = data.get("decision")
+    is_forward = bool(data.get("is_forward"))
+    is_blocking_bounce = bool(data.get("is_blocking_bounce"))
+    target_executor_name: Optional[str] = data.get("target_executor_name")
+    moderator_message: Optional[str] = data.get("moderator_message")
+    ai_badge: Optional[str] = data.get("ai_badge")
+
+    return ExecutorUpdateResult(
+        decision=decision,
+        is_forward=is_forward,
+        is_blocking_bounce=is_blocking_bounce,
+        target_executor_name=target_executor_name,
+        moderator_message=moderator_message,
+        ai_badge=ai_badge,
+        source="llm",
+    )
+
+
+def create_ai_http_client(
+    max_connections: int = settings.ai_max_connections,
+    timeout: float = settings.ai_request_timeout,
+) -> httpx.AsyncClient:
+    """
+    Общий пул HTTP-соединений до YandexGPT.
+    Один клиент на процесс: keep-alive соединения переиспользуются между запросами.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        timeout=httpx.Timeout(timeout, connect=5.0),
+    )
+
+
+def _extract_json_array_maybe(text: str) -> list:
+    match = re.search(r"\[.*\]", text, flags=re.DOTALL)
+    if not match:
+        raise ValueError(
+            f"JSON-массив не найден в тексте ответа модели:\n{text[:200]}...")
+    data = json.loads(match.group(0))
+    if not isinstance(data, list):
+        raise TypeError("Ответ модели не является массивом")
+    return data
+
+
+class YandexAIClient(BatchAIClientProtocol):
     """
     Реальный клиент ИИ: ходит в YandexGPT через OpenAI-совместимый API.
+    Работает асинхронно (AsyncOpenAI поверх общего пула httpx),
+    поэтому ожидание ответа модели не блокирует event loop.
     Для работы нужны переменные окружения:
       - YC_FOLDER_ID
       - YC_API_KEY
       - (опционально) YC_MODEL
     """
 
-    def __init__(self) -> None:
-        if not YC_FOLDER_ID or not YC_API_KEY:
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        timeout: float = settings.ai_request_timeout,
+        max_concurrency: int = settings.ai_max_concurrency,
+        batch_item_timeout: float = settings.ai_batch_item_timeout,
+    ) -> None:
+        if not yandex_credentials_configured():
             raise RuntimeError(
                 "YandexAIClient: YC_FOLDER_ID и YC_API_KEY должны быть заданы "
                 "в переменных окружения или в .env"
             )
 
-        self._client = OpenAI(
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or create_ai_http_client(timeout=timeout)
+        self._timeout = timeout
+        self._batch_item_timeout = batch_item_timeout
+        # Ограничиваем число одновременных запросов к модели из процесса
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self._client = AsyncOpenAI(
             api_key=YC_API_KEY,
             base_url="https://rest-assistant.api.cloud.yandex.net/v1",
             project=YC_FOLDER_ID,
+            http_client=self._http_client,
+            timeout=timeout,
+            max_retries=settings.ai_max_retries,
         )
 
+    async def aclose(self) -> None:
+        await self._client.close()
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def _complete(
+        self,
+        instructions: str,
+        payload: object,
+        max_output_tokens: int = 400,
+        timeout: Optional[float] = None,
+    ) -> str:
+        async with self._semaphore:
+            response = await self._client.responses.create(
+                model=f"gpt://{YC_FOLDER_ID}/{YC_MODEL}",
+                temperature=0.1,
+                instructions=instructions,
+                input=json.dumps(payload, ensure_ascii=False),
+                max_output_tokens=max_output_tokens,
+                timeout=timeout or self._timeout,
+            )
+        return response.output_text
+
     async def analyze_executor_response(
         self,
         *,
@@ -156,68 +321,71 @@ class YandexAIClient(AIClientProtocol):
           moderator_message, ai_badge.
         Мы маппим это на ExecutorUpdateResult.
         """
+        payload = build_executor_payload(complaint_description, update)
 
-        # Пытаемся аккуратно вытащить максимум полей из update.
-        # Если каких-то атрибутов нет в ExecutorUpdateRequest — будет None, всё ок.
-        complaint_id = getattr(update, "complaint_id", None)
-        status = getattr(update, "status", None)
-        district = getattr(update, "district", None)
-        executor_id = getattr(update, "executor_id", None)
-
-        real_duration_days = getattr(update, "real_duration_days", None)
-        expected_duration_days = getattr(
-            update, "expected_duration_days", None)
-        delay_days = getattr(update, "delay_days", None)
-        football_threshold_days = getattr(
-            update, "football_threshold_days", None)
-        ratio_to_expected = getattr(update, "ratio_to_expected", None)
-
-        timing = {
-            "real_duration_days": float(real_duration_days) if real_duration_days is not None else None,
-            "expected_duration_days": float(expected_duration_days) if expected_duration_days is not None else None,
-            "delay_days": float(delay_days) if delay_days is not None else None,
-            "football_threshold_days": float(football_threshold_days) if football_threshold_days is not None else None,
-            "ratio_to_expected": float(ratio_to_expected) if ratio_to_expected is not None else None,
-        }
-
-        payload = {
-            "complaint_id": int(complaint_id) if complaint_id is not None else None,
-            "status": status,
-            "district": int(district) if district is not None else None,
-            "executor_id": int(executor_id) if executor_id is not None else None,
-            "texts": {
-                "description": complaint_description,
-                "executor_response": update.response_text,
-            },
-            "timing": timing,
-        }
-
-        response = self._client.responses.create(
-            model=f"gpt://{YC_FOLDER_ID}/{YC_MODEL}",
-            temperature=0.1,
-            instructions=EXECUTOR_RESPONSE_SYSTEM_PROMPT,
-            input=json.dumps(payload, ensure_ascii=False),
-            max_output_tokens=400,
-        )
-
-        raw = response.output_text
+        raw = await self._complete(EXECUTOR_RESPONSE_SYSTEM_PROMPT, payload)
 
         # Страхуемся от лишнего текста вокруг JSON
         data = _extract_json_maybe(raw)
 
-        # Шесть полей из ответа модели
-        decision = data.get("decision")
-        is_forward = bool(data.get("is_forward"))
-        is_blocking_bounce = bool(data.get("is_blocking_bounce"))
-        target_executor_name: Optional[str] = data.get("target_executor_name")
-        moderator_message: Optional[str] = data.get("moderator_message")
-        ai_badge: Optional[str] = data.get("ai_badge")
-
-        return ExecutorUpdateResult(
-            decision=decision,
-            is_forward=is_forward,
-            is_blocking_bounce=is_blocking_bounce,
-            target_executor_name=target_executor_name,
-            moderator_message=moderator_message,
-            ai_badge=ai_badge,
+        return parse_executor_result(data)
+
+    async def analyze_batch(
+        self, items: List[AnalyzeRequest]
+    ) -> List[ExecutorUpdateResult]:
+        """
+        Несколько заявок одним запросом к модели (системный промпт уходит один раз).
+        Таймаут растёт с размером пачки (batch_call_timeout). Если модель вернула
+        что-то не то — откатываемся на поштучные вызовы, но только в пределах
+        оставшегося бюджета пачки: иначе ожидающие ждали бы два полных таймаута.
+        """
+        if len(items) == 1:
+            item = items[0]
+            return [
+                await self.analyze_executor_response(
+                    complaint_description=item.complaint_description,
+                    update=item.update,
+                )
+            ]
+
+        loop = asyncio.get_running_loop()
+        budget = batch_call_timeout(
+            len(items), base=self._timeout, per_item=self._batch_item_timeout
         )
+        deadline = loop.time() + budget
+        payload = [
+            {"index": i, **build_executor_payload(item.complaint_description, item.update)}
+            for i, item in enumerate(items)
+        ]
+        try:
+            raw = await self._complete(
+                EXECUTOR_RESPONSE_BATCH_PROMPT,
+                payload,
+                max_output_tokens=400 * len(items),
+                timeout=budget,
+            )
+            data = _extract_json_array_maybe(raw)
+            by_index = {
+                int(entry["index"]): parse_executor_result(entry) for entry in data
+            }
+            if sorted(by_index) != list(range(len(items))):
+                raise ValueError("Модель вернула не все элементы пачки")
+            return [by_index[i] for i in range(len(items))]
+        except (ValueError, KeyError, TypeError):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise
+            return list(
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        *(
+                            self.analyze_executor_response(
+                                complaint_description=item.complaint_description,
+                                update=item.update,
+                            )
+                            for item in items
+                        )
+                    ),
+                    timeout=remaining,
+                )
+            )
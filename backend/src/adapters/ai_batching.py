@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.protocols.ai import (
+    AIBatchSizeMismatch,
+    AIClientProtocol,
+    BatchAIClientProtocol,
+)
+from src.schemas.ai_service import AnalyzeRequest
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+_Pending = tuple[AnalyzeRequest, asyncio.Future, float]
+
+
+def batch_call_timeout(
+    batch_size: int,
+    base: float = settings.ai_request_timeout,
+    per_item: float = settings.ai_batch_item_timeout,
+) -> float:
+    """
+    Бюджет времени на пачку: ответ модели растёт с числом элементов,
+    поэтому одного таймаута одиночного вызова ей мало.
+    """
+    return base + per_item * max(batch_size - 1, 0)
+
+
+class MicroBatchingAIClient(AIClientProtocol):
+    """
+    Собирает одновременные вызовы анализа в пачки: ждёт до window_ms
+    или до max_batch_size запросов, отправляет их одним analyze_batch
+    и раздаёт результаты ожидающим корутинам.
+    """
+
+    def __init__(
+        self,
+        inner: BatchAIClientProtocol,
+        window_ms: float = settings.ai_batch_window_ms,
+        max_batch_size: int = settings.ai_batch_max_size,
+    ) -> None:
+        self._inner = inner
+        self._window = window_ms / 1000
+        self._max_batch_size = max_batch_size
+        self._pending: list[_Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # держим ссылки на задачи отправки, чтобы их не собрал GC
+        self._tasks: set[asyncio.Task] = set()
+
+    async def analyze_executor_response(
+        self,
+        *,
+        complaint_description: str,
+        update: ExecutorUpdateRequest,
+    ) -> ExecutorUpdateResult:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        request = AnalyzeRequest(
+            complaint_description=complaint_description, update=update
+        )
+        self._pending.append((request, future, time.perf_counter()))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[_Pending]) -> None:
+        metrics.incr("ai_batch.batches")
+        metrics.observe("ai_batch.size", len(batch))
+        metrics.observe("ai_batch.fill_ratio", len(batch) / self._max_batch_size)
+        started = time.perf_counter()
+        try:
+            results = await self._inner.analyze_batch([request for request, _, _ in batch])
+            if len(results) != len(batch):
+                metrics.incr("ai_batch.size_mismatch")
+                raise AIBatchSizeMismatch(
+                    f"analyze_batch вернул {len(results)} результатов на {len(batch)} запросов"
+                )
+
+            finished = time.perf_counter()
+            metrics.observe("ai_batch.upstream_ms", (finished - started) * 1000)
+            for (_, future, enqueued_at), result in zip(batch, results, strict=True):
+                # ожидание в окне + сам запрос
+                metrics.observe("ai_batch.item_latency_ms", (finished - enqueued_at) * 1000)
+                if not future.done():
+                    future.set_result(result)
+        except BaseException as e:
+            # ни один ожидающий не должен повиснуть: ошибка (или отмена) — всем
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
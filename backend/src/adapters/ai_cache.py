@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.adapters.ai import EXECUTOR_RESPONSE_PROMPT_VERSION
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.db.models import AIDecisionCache
+from src.protocols.ai import AIClientProtocol
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str | None) -> str:
+    """
+    Нормализуем текст, чтобы одинаковые по сути отписки давали один ключ:
+    регистр, ё/е, пробелы и переводы строк.
+    """
+    if not text:
+        return ""
+    text = text.lower().replace("ё", "е")
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def make_cache_key(
+    complaint_description: str,
+    response_text: str,
+    version: str = EXECUTOR_RESPONSE_PROMPT_VERSION,
+) -> str:
+    raw = "\x1f".join(
+        [version, _normalize(complaint_description), _normalize(response_text)]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _LRUTTLCache:
+    """
+    Небольшой LRU-кэш в памяти процесса с ограничением по времени жизни записи.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, ExecutorUpdateResult]] = OrderedDict()
+
+    def get(self, key: str) -> ExecutorUpdateResult | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: ExecutorUpdateResult) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+
+class CachedAIClient(AIClientProtocol):
+    """
+    Кэш решений перед клиентом ИИ.
+    Два уровня: LRU+TTL в памяти процесса и таблица ai_decision_cache в Postgres
+    (переживает рестарты и общая для всех воркеров).
+    Ключ включает версию промпта/модели, поэтому при её смене старые записи
+    просто перестают находиться, а при первом обращении к БД — удаляются.
+    """
+
+    def __init__(
+        self,
+        inner: AIClientProtocol,
+        session_factory: async_sessionmaker[AsyncSession],
+        ttl_seconds: int = settings.ai_cache_ttl_seconds,
+        max_entries: int = settings.ai_cache_max_entries,
+        version: str = EXECUTOR_RESPONSE_PROMPT_VERSION,
+    ) -> None:
+        self._inner = inner
+        self._session_factory = session_factory
+        self._ttl_seconds = ttl_seconds
+        self._version = version
+        self._memory = _LRUTTLCache(max_entries, ttl_seconds)
+        self._stale_purged = False
+
+    async def analyze_executor_response(
+        self,
+        *,
+        complaint_description: str,
+        update: ExecutorUpdateRequest,
+    ) -> ExecutorUpdateResult:
+        key = make_cache_key(complaint_description, update.response_text, self._version)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            metrics.incr("ai_cache.memory_hits")
+            return cached.model_copy(update={"source": "cache"})
+
+        cached = await self._load(key)
+        if cached is not None:
+            metrics.incr("ai_cache.db_hits")
+            self._memory.set(key, cached)
+            return cached.model_copy(update={"source": "cache"})
+
+        metrics.incr("ai_cache.misses")
+        result = await self._inner.analyze_executor_response(
+            complaint_description=complaint_description,
+            update=update,
+        )
+        self._memory.set(key, result)
+        await self._store(key, result)
+        return result.model_copy()
+
+    async def _load(self, key: str) -> ExecutorUpdateResult | None:
+        min_created_at = datetime.utcnow() - timedelta(seconds=self._ttl_seconds)
+        try:
+            async with self._session_factory() as session:
+                if not self._stale_purged:
+                    await self._purge_stale(session, min_created_at)
+                stmt = select(AIDecisionCache.result).filter(
+                    AIDecisionCache.cache_key == key,
+                    AIDecisionCache.created_at >= min_created_at,
+                )
+                row = (await session.execute(stmt)).scalar_one_or_none()
+        except Exception:
+            # Кэш — оптимизация: при проблемах с БД просто идём в модель
+            logger.exception("ai_decision_cache: ошибка чтения")
+            return None
+        if row is None:
+            return None
+        return ExecutorUpdateResult.model_validate(row)
+
+    async def _store(self, key: str, result: ExecutorUpdateResult) -> None:
+        values = {
+            "cache_key": key,
+            "model_version": self._version,
+            "result": result.model_dump(mode="json"),
+            "created_at": datetime.utcnow(),
+        }
+        stmt = insert(AIDecisionCache).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AIDecisionCache.cache_key],
+            set_={
+                "result": stmt.excluded.result,
+                "created_at": stmt.excluded.created_at,
+            },
+        )
+        try:
+            async with self._session_factory() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except Exception:
+            logger.exception("ai_decision_cache: ошибка записи")
+
+    async def _purge_stale(self, session: AsyncSession, min_created_at: datetime) -> None:
+        """
+        Один раз за жизнь процесса чистим записи другой версии промпта/модели
+        и просроченные по TTL.
+        """
+        await session.execute(
+            delete(AIDecisionCache).where(
+                (AIDecisionCache.model_version != self._version)
+                | (AIDecisionCache.created_at < min_created_at)
+            )
+        )
+        await session.commit()
+        self._stale_purged = True
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import httpx
+
+from src.adapters.ai_batching import batch_call_timeout
+from src.core.config import settings
+from src.protocols.ai import AIBatchSizeMismatch, BatchAIClientProtocol
+from src.schemas.ai_service import (
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
+    AnalyzeRequest,
+)
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+
+class HttpAIClient(BatchAIClientProtocol):
+    """
+    Клиент отдельного ai-service (settings.ai_service_url).
+    API-процесс не держит ключей YandexGPT — только пул соединений до ai-service.
+    """
+
+    def __init__(
+        self,
+        base_url: str = settings.ai_service_url,
+        timeout: float = settings.ai_request_timeout,
+        max_connections: int = settings.ai_max_connections,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        self._owns_http_client = http_client is None
+        self._timeout = timeout
+        self._http_client = http_client or httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(timeout, connect=5.0),
+        )
+
+    async def aclose(self) -> None:
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def analyze_executor_response(
+        self,
+        *,
+        complaint_description: str,
+        update: ExecutorUpdateRequest,
+    ) -> ExecutorUpdateResult:
+        request = AnalyzeRequest(
+            complaint_description=complaint_description, update=update
+        )
+        # ai-service сам склеивает одиночные /analyze в пачки — ждём как пачку
+        timeout = (
+            batch_call_timeout(settings.ai_batch_max_size, base=self._timeout)
+            if settings.ai_batch_enabled
+            else self._timeout
+        )
+        response = await self._http_client.post(
+            "/analyze",
+            json=request.model_dump(mode="json"),
+            timeout=httpx.Timeout(timeout, connect=5.0),
+        )
+        response.raise_for_status()
+        return ExecutorUpdateResult.model_validate(response.json())
+
+    async def analyze_batch(
+        self, items: list[AnalyzeRequest]
+    ) -> list[ExecutorUpdateResult]:
+        request = AnalyzeBatchRequest(items=items)
+        response = await self._http_client.post(
+            "/analyze/batch",
+            json=request.model_dump(mode="json"),
+            timeout=httpx.Timeout(
+                batch_call_timeout(len(items), base=self._timeout), connect=5.0
+            ),
+        )
+        response.raise_for_status()
+        results = AnalyzeBatchResponse.model_validate(response.json()).results
+        if len(results) != len(items):
+            raise AIBatchSizeMismatch(
+                f"ai-service вернул {len(results)} результатов на {len(items)} запросов"
+            )
+        return results
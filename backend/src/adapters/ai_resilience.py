@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.protocols.ai import AIClientProtocol, AIUnavailableError
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+logger = logging.getLogger(__name__)
+
+
+class LimiterRejected(Exception):
+    pass
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD-лимит параллельных запросов к модели:
+    быстрый успешный ответ — лимит растёт на 1/limit (≈ +1 за «окно»),
+    медленный ответ или ошибка — лимит умножается на backoff_ratio,
+    но не чаще раза за окно: вызовы, начатые до последнего снижения,
+    лимит уже не снижают (одна волна медленных ответов — одно снижение).
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = settings.ai_limiter_initial_limit,
+        min_limit: int = settings.ai_limiter_min_limit,
+        max_limit: int = settings.ai_limiter_max_limit,
+        target_latency_ms: float = settings.ai_limiter_target_latency_ms,
+        queue_timeout: float = settings.ai_limiter_queue_timeout,
+        backoff_ratio: float = 0.7,
+    ) -> None:
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._target_latency = target_latency_ms / 1000
+        self._queue_timeout = queue_timeout
+        self._backoff_ratio = backoff_ratio
+        self._in_flight = 0
+        self._last_decrease_at = float("-inf")
+        self._cond = asyncio.Condition()
+        metrics.set("ai_limiter.limit", self._limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            try:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: self._in_flight < int(self._limit)),
+                    timeout=self._queue_timeout,
+                )
+            except TimeoutError:
+                raise LimiterRejected("AI upstream concurrency limit reached") from None
+            self._in_flight += 1
+
+    async def release(self, started: float, ok: bool | None) -> None:
+        """
+        started — time.monotonic() начала вызова; ok=None — вызов отменён,
+        сигнала о состоянии модели нет, лимит не меняем.
+        """
+        async with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if ok is None:
+                pass
+            elif ok and now - started <= self._target_latency:
+                self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+            elif started >= self._last_decrease_at:
+                self._limit = max(self._min_limit, self._limit * self._backoff_ratio)
+                self._last_decrease_at = now
+            metrics.set("ai_limiter.limit", self._limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """
+    closed → (failure_threshold ошибок подряд) → open → (reset_seconds) → half_open:
+    пропускаем один пробный вызов; успех закрывает, ошибка снова открывает.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.ai_breaker_failure_threshold,
+        reset_seconds: float = settings.ai_breaker_reset_seconds,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        if self._state == "closed":
+            return True
+        if self._state == "open":
+            if time.monotonic() - self._opened_at < self._reset_seconds:
+                return False
+            self._set_state("half_open")
+        # half_open: ровно один пробный запрос
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        if self._state != "closed":
+            self._set_state("closed")
+
+    def cancel_trial(self) -> None:
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._state == "half_open" or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state("open")
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.warning("ai circuit breaker: %s -> %s", self._state, state)
+        self._state = state
+        metrics.incr(f"ai_breaker.transitions.{state}")
+
+
+class ResilientAIClient(AIClientProtocol):
+    """
+    Защищает эндпоинт от проблем YandexGPT: адаптивный лимит параллелизма,
+    таймаут вызова и circuit breaker. Когда модель недоступна (breaker открыт,
+    очередь лимита переполнена, ошибка или таймаут вызова) — AIUnavailableError:
+    заявка остаётся как есть, API отвечает 503, воркер повторяет задание с backoff.
+    Уверенные случаи без модели уже разобрал RuleFirstAIClient снаружи.
+    """
+
+    def __init__(
+        self,
+        inner: AIClientProtocol,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        call_timeout: float = settings.ai_request_timeout,
+    ) -> None:
+        self._inner = inner
+        self._limiter = limiter or AdaptiveConcurrencyLimiter()
+        self._breaker = breaker or CircuitBreaker()
+        self._call_timeout = call_timeout
+
+    async def analyze_executor_response(
+        self,
+        *,
+        complaint_description: str,
+        update: ExecutorUpdateRequest,
+    ) -> ExecutorUpdateResult:
+        if not self._breaker.allow():
+            metrics.incr("ai_resilience.short_circuited")
+            raise AIUnavailableError("ИИ временно недоступен (circuit breaker открыт)")
+
+        try:
+            await self._limiter.acquire()
+        except LimiterRejected:
+            metrics.incr("ai_resilience.rejected")
+            # вызова не было — это не ошибка модели
+            self._breaker.cancel_trial()
+            raise AIUnavailableError("ИИ перегружен, повторите позже") from None
+        except BaseException:
+            self._breaker.cancel_trial()
+            raise
+
+        started = time.monotonic()
+        ok: bool | None = None
+        try:
+            result = await asyncio.wait_for(
+                self._inner.analyze_executor_response(
+                    complaint_description=complaint_description,
+                    update=update,
+                ),
+                timeout=self._call_timeout,
+            )
+            ok = True
+        except Exception as e:
+            ok = False
+            self._breaker.record_failure()
+            metrics.incr("ai_resilience.errors")
+            logger.warning("ai upstream error: %r", e)
+            raise AIUnavailableError("ИИ временно недоступен") from e
+        except BaseException:
+            # вызывающего отменили (клиент отключился, внешний таймаут): о модели
+            # это ничего не говорит, но пробный вызов half_open надо освободить,
+            # иначе breaker навсегда останется в half_open
+            metrics.incr("ai_resilience.cancelled")
+            self._breaker.cancel_trial()
+            raise
+        finally:
+            await self._limiter.release(started, ok)
+
+        self._breaker.record_success()
+        return result
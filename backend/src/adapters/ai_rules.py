@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.protocols.ai import AIClientProtocol
+from src.protocols.repo import ExecutorRepositoryProtocol
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================
+#  Лексикон (те же триггеры, что описаны в EXECUTOR_RESPONSE_SYSTEM_PROMPT)
+# ==========================
+
+# Перекладывание на конкретного адресата: «перенаправить в …», «заявка передана в …»,
+# «обратитесь в ГИБДД». Адресат — всё до конца фразы.
+_FORWARD_RE = re.compile(
+    r"(?:перенаправ\w*|переадресова\w*|передан\w*|передаем|передаём|направлен\w*|обратитесь)"
+    r"(?:\s+(?:заявк\w*|обращени\w*|жалоб\w*|для\s+рассмотрения|по\s+компетенции))*"
+    r"\s+(?:в|во)\s+(?P<target>[^.,;:!?\n()]+)",
+    flags=re.IGNORECASE,
+)
+
+# Плохой футбол: отказ без указания адресата
+_STOP_RE = re.compile(
+    r"не\s+(?:наша|нашей|в\s+нашей)\s+компетенци\w*"
+    r"|не\s+относ\w*\s+к\s+(?:нашей\s+)?компетенци\w*"
+    r"|не\s+относимся"
+    r"|вне\s+(?:нашей\s+)?компетенци\w*"
+    r"|мы\s+(?:этим\s+)?не\s+занимаемся"
+    r"|не\s+входит\s+в\s+(?:наши\s+|нашу\s+)?(?:полномочи\w*|обязанност\w*|компетенци\w*)",
+    flags=re.IGNORECASE,
+)
+
+# Размытый адресат: «обратитесь в соответствующую организацию» — это тоже stop
+_VAGUE_TARGET_RE = re.compile(
+    r"^(?:соответствующ\w*|компетентн\w*|надлежащ\w*|уполномоченн\w*|"
+    r"друг\w*|иную|иные|профильн\w*|нужн\w*)\b",
+    flags=re.IGNORECASE,
+)
+
+# «Передана в работу», «направлено в план»: после предлога стоит не организация,
+# а ход работ — такое совпадение _FORWARD_RE не считается перенаправлением
+_NON_ORGANIZATION_TARGETS = frozenset({
+    "работу", "работе", "план", "плане", "бригаду", "бригады", "исполнение",
+    "производство", "очередь", "график", "обработку", "реестр", "архив",
+    "течение", "срок", "ближайшее", "порядке",
+})
+
+# Исполнитель работает по заявке: ответ по существу
+_OK_RE = re.compile(
+    r"(?<!не\s)(?:работы\s+)?(?:выполнен\w*|устранен\w*|отремонтирован\w*|"
+    r"восстановлен\w*|заменен\w*|вывезен\w*|убран\w*|очищен\w*|установлен\w*|"
+    r"(?:принят\w*|передан\w*|направлен\w*)\s+в\s+(?:работу|исполнение)|"
+    r"включен\w*\s+в\s+план\w*)",
+    flags=re.IGNORECASE,
+)
+
+_NEGATION_RE = re.compile(r"\bне\s+(?:выполнен|устранен|отремонтирован|восстановлен)", re.IGNORECASE)
+
+# Длинные ответы чаще содержат нюансы — снижаем уверенность
+_LONG_RESPONSE_CHARS = 400
+
+_BADGES = {
+    "forward": "Перенаправлена ИИ",
+    "stop": "Остановлена ИИ",
+    "ok": "Без вмешательства ИИ",
+}
+
+
+def _is_non_organization(raw: str) -> bool:
+    words = raw.strip(" \t\"'«»").split(maxsplit=1)
+    return bool(words) and words[0].lower() in _NON_ORGANIZATION_TARGETS
+
+
+def _clean_target(raw: str) -> str | None:
+    target = raw.strip(" \t\"'«»")
+    if not target or _VAGUE_TARGET_RE.match(target):
+        return None
+    return target[:255]
+
+
+def _result(
+    decision: str,
+    confidence: float,
+    moderator_message: str,
+    target_executor_name: str | None = None,
+) -> ExecutorUpdateResult:
+    return ExecutorUpdateResult(
+        decision=decision,
+        is_forward=decision == "forward",
+        is_blocking_bounce=decision == "stop",
+        target_executor_name=target_executor_name,
+        moderator_message=moderator_message,
+        ai_badge=_BADGES[decision],
+        confidence=confidence,
+        source="rule",
+    )
+
+
+class RuleBasedClassifier:
+    """
+    Быстрый локальный классификатор ответа исполнителя по лексикону.
+    Всегда возвращает ExecutorUpdateResult; confidence=0.0 означает
+    «не знаю — спроси модель».
+    """
+
+    def classify(self, response_text: str) -> ExecutorUpdateResult:
+        text = response_text or ""
+
+        forward_target: str | None = None
+        vague_forward = False
+        for match in _FORWARD_RE.finditer(text):
+            if _is_non_organization(match.group("target")):
+                continue
+            target = _clean_target(match.group("target"))
+            if target is None:
+                vague_forward = True
+            elif forward_target is None:
+                forward_target = target
+
+        is_stop = bool(_STOP_RE.search(text)) or vague_forward
+        is_ok = bool(_OK_RE.search(text)) and not _NEGATION_RE.search(text)
+
+        if forward_target is not None:
+            # «не наша компетенция, передано в ГИБДД» — адресат указан, значит forward
+            confidence = 0.85 if (is_stop or is_ok) else 0.9
+            result = _result(
+                "forward",
+                confidence,
+                f"Исполнитель перенаправил заявку: {forward_target}",
+                target_executor_name=forward_target,
+            )
+        elif is_stop and not is_ok:
+            result = _result(
+                "stop",
+                0.9,
+                "Исполнитель отказался от заявки, не указав ответственного",
+            )
+        elif is_ok and not is_stop:
+            result = _result("ok", 0.85, "Исполнитель работает по заявке")
+        else:
+            # Нет триггеров или они противоречат друг другу
+            result = _result("ok", 0.0, "Правила не дали уверенного решения")
+
+        if len(text) > _LONG_RESPONSE_CHARS and result.confidence:
+            result.confidence = round(result.confidence - 0.1, 2)
+        return result
+
+
+class RuleFirstAIClient(AIClientProtocol):
+    """
+    Сначала пробуем локальные правила; модель вызываем, только если
+    уверенность правил ниже порога. Путь решения пишется в result.source
+    и в лог.
+    Адресат перенаправления по правилам проверяется по справочнику
+    исполнителей (если он передан): не нашёлся — решает модель.
+    """
+
+    def __init__(
+        self,
+        inner: AIClientProtocol,
+        classifier: RuleBasedClassifier | None = None,
+        confidence_threshold: float = settings.ai_rules_confidence_threshold,
+        executor_repo: ExecutorRepositoryProtocol | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self._inner = inner
+        self._classifier = classifier or RuleBasedClassifier()
+        self._threshold = confidence_threshold
+        self._executor_repo = executor_repo
+        self._session_factory = session_factory
+
+    async def analyze_executor_response(
+        self,
+        *,
+        complaint_description: str,
+        update: ExecutorUpdateRequest,
+    ) -> ExecutorUpdateResult:
+        started = time.perf_counter()
+        result = self._classifier.classify(update.response_text)
+        metrics.observe("ai_rules.classify_ms", (time.perf_counter() - started) * 1000)
+
+        if (
+            result.is_forward
+            and result.confidence is not None
+            and result.confidence >= self._threshold
+            and not await self._target_exists(result.target_executor_name)
+        ):
+            # иначе сервис не найдёт исполнителя и заблокирует заявку
+            metrics.incr("ai_rules.unresolved_targets")
+            result.confidence = round(min(result.confidence, self._threshold - 0.1), 2)
+
+        if result.confidence is not None and result.confidence >= self._threshold:
+            metrics.incr("ai_rules.rule_decisions")
+        else:
+            metrics.incr("ai_rules.llm_decisions")
+            result = await self._inner.analyze_executor_response(
+                complaint_description=complaint_description,
+                update=update,
+            )
+
+        logger.info(
+            "executor decision: path=%s decision=%s confidence=%s executor_id=%s",
+            result.source,
+            result.decision,
+            result.confidence,
+            update.executor_id,
+        )
+        return result
+
+    async def _target_exists(self, name: str | None) -> bool:
+        if self._executor_repo is None or self._session_factory is None:
+            return True
+        if not name:
+            return False
+        try:
+            async with self._session_factory() as session:
+                executor = await self._executor_repo.get_executor_by_name(session, name)
+        except Exception:
+            # справочник недоступен — не рискуем, пусть решает модель
+            logger.exception("ai_rules: не удалось проверить исполнителя %r", name)
+            return False
+        return executor is not None
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from src.adapters.ai_rules import RuleBasedClassifier
+from src.protocols.ai import BatchAIClientProtocol
+from src.schemas.ai_service import AnalyzeRequest
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+
+class StubAIClient(BatchAIClientProtocol):
+    """
+    Заглушка ИИ для тестов и локального запуска без ключей YandexGPT:
+    решение по правилам, а если правила молчат — «ok».
+    """
+
+    def __init__(self) -> None:
+        self._classifier = RuleBasedClassifier()
+
+    async def aclose(self) -> None:
+        pass
+
+    async def analyze_executor_response(
+        self,
+        *,
+        complaint_description: str,
+        update: ExecutorUpdateRequest,
+    ) -> ExecutorUpdateResult:
+        result = self._classifier.classify(update.response_text)
+        result.source = "stub"
+        return result
+
+    async def analyze_batch(
+        self, items: list[AnalyzeRequest]
+    ) -> list[ExecutorUpdateResult]:
+        return [
+            await self.analyze_executor_response(
+                complaint_description=item.complaint_description,
+                update=item.update,
+            )
+            for item in items
+        ]
@@ -1,18 +1,145 @@
 # app/adapters/repositories.py
-from datetime import datetime
-from typing import Optional, List
+import html
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Optional, List, Sequence, Tuple
 
+from sqlalchemy import (
+    RowMapping,
+    String,
+    BigInteger,
+    all_,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    exists,
+    func,
+    literal_column,
+    or_,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from src.db.models import Executor, Complaint, Moderator, TicketStatus
+
+from src.core.pagination import Keyset
+from src.schemas.complaint import ComplaintFilter
+from src.db.models import (
+    normalize_executor_name,
+    Executor,
+    Complaint,
+    Moderator,
+    TicketStatus,
+    ExecutorUpdateJob,
+    IdempotencyKey,
+    OutboxEvent,
+)
 from src.protocols.repo import (
     ExecutorRepositoryProtocol,
     ComplaintRepositoryProtocol,
     ModeratorRepositoryProtocol,
     TicketStatusRepositoryProtocol,
+    ExecutorUpdateJobRepositoryProtocol,
+    IdempotencyKeyRepositoryProtocol,
+    OutboxRepositoryProtocol,
 )
 
 
+def _apply_complaint_filter(stmt, filters: Optional[ComplaintFilter]):
+    """
+    Накладывает фильтры на выборку жалоб. Формы запросов согласованы
+    с составными индексами ix_complaints_* (равенство + created_at, complaint_id).
+    """
+    if filters is None:
+        return stmt
+    if filters.status is not None:
+        stmt = stmt.filter(Complaint.status == filters.status.value)
+    if filters.district is not None:
+        stmt = stmt.filter(Complaint.district == filters.district)
+    if filters.executor_id is not None:
+        stmt = stmt.filter(Complaint.executor_id == filters.executor_id)
+    if filters.created_from is not None:
+        stmt = stmt.filter(Complaint.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        stmt = stmt.filter(Complaint.created_at < filters.created_to)
+    if filters.open_only:
+        stmt = stmt.filter(Complaint.final_status_at.is_(None))
+    return stmt
+
+
+def _bigint_array(name: str, values: Sequence[int]):
+    return bindparam(name, list(values), type_=ARRAY(BigInteger))
+
+
+async def _copy_records(
+    session: AsyncSession,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[dict],
+) -> None:
+    """
+    COPY … FROM STDIN через asyncpg в рамках текущей транзакции сессии.
+    """
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table,
+        records=[tuple(row[column] for column in columns) for row in rows],
+        columns=list(columns),
+    )
+
+
+# Колонки заявки для выгрузок (без search_vector)
+_EXPORT_COMPLAINT_COLUMNS = (
+    Complaint.complaint_id,
+    Complaint.created_at,
+    Complaint.execution_date,
+    Complaint.final_status_at,
+    Complaint.status,
+    Complaint.address,
+    Complaint.executor_id,
+    Complaint.district,
+    Complaint.description,
+    Complaint.resolution,
+)
+
+# Колонки для COPY при массовом импорте
+_COPY_COMPLAINT_COLUMNS = [column.key for column in _EXPORT_COMPLAINT_COLUMNS]
+_COPY_TICKET_STATUS_COLUMNS = [
+    "status_code",
+    "complaint_id",
+    "data",
+    "executor_id",
+    "sort_order",
+    "description",
+]
+
+# Поля справочника, которые обновляет синхронизация
+_SYNC_EXECUTOR_COLUMNS = ["name", "organization", "phone", "email", "is_active"]
+
+_FTS_CONFIG = cast("russian", REGCONFIG)
+# ts_headline размечает совпадения служебными символами (Private Use Area), а не <b>:
+# текст жалобы пользовательский, HTML из него экранируем уже после разметки
+_HIGHLIGHT_START = "\ue000"
+_HIGHLIGHT_STOP = "\ue001"
+_HEADLINE_OPTIONS = (
+    "MaxFragments=2, MaxWords=20, MinWords=5, FragmentDelimiter= … , "
+    f"StartSel={_HIGHLIGHT_START}, StopSel={_HIGHLIGHT_STOP}"
+)
+
+
+def _render_snippet(raw: str) -> str:
+    """
+    Экранированный фрагмент, совпадения — <b>…</b>.
+    """
+    return (
+        html.escape(raw or "")
+        .replace(_HIGHLIGHT_START, "<b>")
+        .replace(_HIGHLIGHT_STOP, "</b>")
+    )
+
+
 class ExecutorRepository(ExecutorRepositoryProtocol):
     async def create_executor(
         self,
@@ -27,7 +154,6 @@ class ExecutorRepository(ExecutorRepositoryProtocol):
         )
         session.add(executor)
         await session.flush()
-        await session.commit()
         return executor
 
     async def get_executor(
@@ -40,10 +166,63 @@ class ExecutorRepository(ExecutorRepositoryProtocol):
     async def get_executor_by_name(
         self, session: AsyncSession, name: str
     ) -> Optional[Executor]:
-        stmt = select(Executor).filter(Executor.name == name)
+        # выключенные синхронизацией исполнители не должны получать пересылки
+        stmt = select(Executor).filter(
+            Executor.normalized_name == normalize_executor_name(name),
+            Executor.is_active.is_(True),
+        )
         result = await session.execute(stmt)
         return result.scalars().first()
 
+    async def get_existing_executor_ids(
+        self, session: AsyncSession, executor_ids: Sequence[int]
+    ) -> set[int]:
+        if not executor_ids:
+            return set()
+        stmt = select(Executor.executor_id).filter(Executor.executor_id.in_(executor_ids))
+        result = await session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def upsert_executors(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> List[Tuple[int, bool]]:
+        """
+        INSERT … ON CONFLICT (normalized_name) DO UPDATE. Строки, у которых ничего
+        не поменялось, не трогаются и не возвращаются. Возвращает (executor_id, создан ли).
+        """
+        stmt = insert(Executor).values(
+            [{**row, "is_active": True} for row in rows]
+        )
+        changed = [
+            getattr(Executor, column).is_distinct_from(stmt.excluded[column])
+            for column in _SYNC_EXECUTOR_COLUMNS
+        ]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Executor.normalized_name],
+            set_={column: stmt.excluded[column] for column in _SYNC_EXECUTOR_COLUMNS},
+            where=or_(*changed),
+        ).returning(
+            Executor.executor_id,
+            # xmax = 0 только у только что вставленной строки
+            literal_column("xmax = 0").label("inserted"),
+        )
+        result = await session.execute(stmt)
+        return [(row.executor_id, row.inserted) for row in result]
+
+    async def deactivate_executors_except(
+        self, session: AsyncSession, normalized_names: Sequence[str]
+    ) -> List[int]:
+        # Массив одним параметром: имён могут быть тысячи
+        names = bindparam("names", list(normalized_names), type_=ARRAY(String))
+        stmt = (
+            update(Executor)
+            .where(Executor.is_active.is_(True), Executor.normalized_name != all_(names))
+            .values(is_active=False)
+            .returning(Executor.executor_id)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
     async def update_executor(
         self,
         session: AsyncSession,
@@ -65,7 +244,6 @@ class ExecutorRepository(ExecutorRepositoryProtocol):
                 executor.email = email
             session.add(executor)
             await session.flush()
-            await session.commit()
             return executor
         raise ValueError("Executor not found")
 
@@ -74,7 +252,6 @@ class ExecutorRepository(ExecutorRepositoryProtocol):
         if executor:
             await session.delete(executor)
             await session.flush()
-            await session.commit()
 
 
 class ComplaintRepository(ComplaintRepositoryProtocol):
@@ -96,23 +273,168 @@ class ComplaintRepository(ComplaintRepositoryProtocol):
         )
         session.add(complaint)
         await session.flush()
-        await session.commit()
         return complaint
 
+    async def allocate_complaint_ids(
+        self, session: AsyncSession, count: int
+    ) -> List[int]:
+        # Один запрос на пачку id из последовательности BIGSERIAL
+        sequence = func.pg_get_serial_sequence(
+            Complaint.__tablename__, Complaint.complaint_id.name
+        )
+        stmt = select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def copy_complaints(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> None:
+        # complaint_id уже выделены через allocate_complaint_ids
+        await _copy_records(
+            session, Complaint.__tablename__, _COPY_COMPLAINT_COLUMNS, rows
+        )
+
     async def get_complaint(
-        self, session: AsyncSession, complaint_id: int
+        self, session: AsyncSession, complaint_id: int, for_update: bool = False
     ) -> Optional[Complaint]:
         stmt = select(Complaint).filter(Complaint.complaint_id == complaint_id)
+        if for_update:
+            # Блокируем строку до конца транзакции и перечитываем актуальные значения
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
         result = await session.execute(stmt)
         return result.scalars().first()
 
+    async def get_complaints(
+        self, session: AsyncSession, complaint_ids: Sequence[int]
+    ) -> List[Complaint]:
+        # WHERE complaint_id = ANY(:ids) — массив одним параметром
+        stmt = select(Complaint).filter(
+            Complaint.complaint_id == any_(_bigint_array("complaint_ids", complaint_ids))
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def bulk_update_complaints(
+        self, session: AsyncSession, complaint_ids: Sequence[int], values: dict
+    ) -> List[Complaint]:
+        """
+        Один UPDATE … RETURNING на все заявки; объекты в сессии
+        получают новые значения из RETURNING.
+        """
+        stmt = (
+            update(Complaint)
+            .where(Complaint.complaint_id == any_(_bigint_array("complaint_ids", complaint_ids)))
+            .values(**values)
+            .returning(Complaint)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
     async def list_complaints(
-        self, session: AsyncSession, limit: int = 50, offset: int = 0
+        self,
+        session: AsyncSession,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Keyset] = None,
+        filters: Optional[ComplaintFilter] = None,
     ) -> List[Complaint]:
-        stmt = select(Complaint).limit(limit).offset(offset)
+        # Новые сверху; complaint_id — тай-брейкер для одинаковых created_at
+        stmt = select(Complaint).order_by(
+            Complaint.created_at.desc(), Complaint.complaint_id.desc()
+        )
+        stmt = _apply_complaint_filter(stmt, filters)
+        if after is not None:
+            # keyset: строки строго «после» последней выданной,
+            # идёт по индексу ix_complaints_created_at_id без OFFSET
+            stmt = stmt.filter(
+                tuple_(Complaint.created_at, Complaint.complaint_id) < tuple_(*after)
+            )
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
         result = await session.execute(stmt)
         return list(result.scalars().all())
 
+    async def search_complaints(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        filters: Optional[ComplaintFilter] = None,
+    ) -> List[Tuple[Complaint, float, str]]:
+        ts_query = func.websearch_to_tsquery(_FTS_CONFIG, query)
+        rank = func.ts_rank_cd(Complaint.search_vector, ts_query).label("rank")
+
+        # Сначала по GIN-индексу находим и ранжируем страницу id,
+        # ts_headline считаем только для неё — он дорогой
+        page = select(Complaint.complaint_id, rank).filter(
+            Complaint.search_vector.op("@@")(ts_query)
+        )
+        page = (
+            _apply_complaint_filter(page, filters)
+            .order_by(rank.desc(), Complaint.complaint_id.desc())
+            .limit(limit)
+            .offset(offset)
+            .subquery()
+        )
+
+        # маркеры, встреченные в самом тексте, убираем — иначе они стали бы тегами
+        text = func.translate(
+            func.concat_ws(" ", Complaint.description, Complaint.address, Complaint.resolution),
+            _HIGHLIGHT_START + _HIGHLIGHT_STOP,
+            "",
+        )
+        snippet = func.ts_headline(_FTS_CONFIG, text, ts_query, _HEADLINE_OPTIONS)
+        stmt = (
+            select(Complaint, page.c.rank, snippet)
+            .join(page, page.c.complaint_id == Complaint.complaint_id)
+            .order_by(page.c.rank.desc(), Complaint.complaint_id.desc())
+        )
+        result = await session.execute(stmt)
+        return [
+            (complaint, rank, _render_snippet(snippet))
+            for complaint, rank, snippet in result.all()
+        ]
+
+    async def stream_complaints(
+        self,
+        session: AsyncSession,
+        filters: Optional[ComplaintFilter] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        # Голые строки вместо ORM-объектов; серверный курсор отдаёт порциями
+        stmt = select(*_EXPORT_COMPLAINT_COLUMNS).order_by(Complaint.complaint_id)
+        stmt = _apply_complaint_filter(stmt, filters)
+        result = await session.stream(stmt.execution_options(yield_per=yield_per))
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    async def stream_complaint_timelines(
+        self,
+        session: AsyncSession,
+        filters: Optional[ComplaintFilter] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        # Заявка × её статусы; строки одной заявки идут подряд в порядке хронологии
+        stmt = (
+            select(
+                *_EXPORT_COMPLAINT_COLUMNS,
+                TicketStatus.status_code.label("ts_status_code"),
+                TicketStatus.data.label("ts_data"),
+                TicketStatus.sort_order.label("ts_sort_order"),
+                TicketStatus.executor_id.label("ts_executor_id"),
+                TicketStatus.description.label("ts_description"),
+            )
+            .outerjoin(TicketStatus, TicketStatus.complaint_id == Complaint.complaint_id)
+            .order_by(Complaint.complaint_id, TicketStatus.data, TicketStatus.sort_order)
+        )
+        stmt = _apply_complaint_filter(stmt, filters)
+        result = await session.stream(stmt.execution_options(yield_per=yield_per))
+        async for partition in result.mappings().partitions():
+            yield partition
+
     async def update_complaint(
         self,
         session: AsyncSession,
@@ -121,29 +443,38 @@ class ComplaintRepository(ComplaintRepositoryProtocol):
         resolution: Optional[str],
         executor_id: Optional[int],
         address: Optional[str],
-    ) -> Complaint:
-        complaint = await self.get_complaint(session, complaint_id)
-        if complaint:
-            if status is not None:
-                complaint.status = status
-            if resolution is not None:
-                complaint.resolution = resolution
-            if executor_id is not None:
-                complaint.executor_id = executor_id
-            if address is not None:
-                complaint.address = address
-            session.add(complaint)
-            await session.flush()
-            await session.commit()
-            return complaint
-        raise ValueError("Complaint not found")
+        final_status_at: Optional[datetime] = None,
+    ) -> Optional[Complaint]:
+        """
+        Один UPDATE … RETURNING без предварительного SELECT: меняются только
+        переданные (не None) поля, объект в сессии получает значения из RETURNING.
+        None — заявки нет.
+        """
+        values = {
+            "status": status,
+            "resolution": resolution,
+            "executor_id": executor_id,
+            "address": address,
+            "final_status_at": final_status_at,
+        }
+        values = {key: value for key, value in values.items() if value is not None}
+        if not values:
+            return await self.get_complaint(session, complaint_id)
+        stmt = (
+            update(Complaint)
+            .where(Complaint.complaint_id == complaint_id)
+            .values(**values)
+            .returning(Complaint)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
 
     async def delete_complaint(self, session: AsyncSession, complaint_id: int) -> None:
         complaint = await self.get_complaint(session, complaint_id)
         if complaint:
             await session.delete(complaint)
             await session.flush()
-            await session.commit()
 
 
 class ModeratorRepository(ModeratorRepositoryProtocol):
@@ -160,7 +491,6 @@ class ModeratorRepository(ModeratorRepositoryProtocol):
         )
         session.add(moderator)
         await session.flush()
-        await session.commit()
         return moderator
 
     async def get_moderator(
@@ -191,7 +521,6 @@ class ModeratorRepository(ModeratorRepositoryProtocol):
                 moderator.phone = phone
             session.add(moderator)
             await session.flush()
-            await session.commit()
             return moderator
         raise ValueError("Moderator not found")
 
@@ -200,7 +529,6 @@ class ModeratorRepository(ModeratorRepositoryProtocol):
         if moderator:
             await session.delete(moderator)
             await session.flush()
-            await session.commit()
 
 
 class TicketStatusRepository(TicketStatusRepositoryProtocol):
@@ -222,16 +550,88 @@ class TicketStatusRepository(TicketStatusRepositoryProtocol):
         )
         session.add(ticket_status)
         await session.flush()
-        await session.commit()
         return ticket_status
 
+    async def create_ticket_statuses(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> None:
+        # один INSERT … VALUES (…), (…) на все строки
+        if rows:
+            await session.execute(insert(TicketStatus).values(list(rows)))
+
+    async def copy_ticket_statuses(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> None:
+        await _copy_records(
+            session, TicketStatus.__tablename__, _COPY_TICKET_STATUS_COLUMNS, rows
+        )
+
     async def get_ticket_status(
         self, session: AsyncSession, complaint_id: int,
     ) -> List[TicketStatus]:
-        stmt = select(TicketStatus).filter(Complaint.complaint_id == complaint_id)
+        # Хронология одной заявки: индекс (complaint_id, data)
+        stmt = (
+            select(TicketStatus)
+            .filter(TicketStatus.complaint_id == complaint_id)
+            .order_by(TicketStatus.data, TicketStatus.sort_order)
+        )
         result = await session.execute(stmt)
         return list(result.scalars().all())
 
+    async def has_executor_status(
+        self, session: AsyncSession, complaint_id: int, executor_id: Optional[int],
+    ) -> bool:
+        """
+        Был ли исполнитель в хронологии заявки (EXISTS по индексу complaint_id).
+        """
+        stmt = select(
+            exists().where(
+                TicketStatus.complaint_id == complaint_id,
+                TicketStatus.executor_id.is_not_distinct_from(executor_id),
+            )
+        )
+        result = await session.execute(stmt)
+        return bool(result.scalar())
+
+    async def get_ticket_statuses(
+        self, session: AsyncSession, complaint_ids: Sequence[int],
+    ) -> Dict[int, List[TicketStatus]]:
+        """
+        Хронологии нескольких заявок одним запросом.
+        """
+        timelines: Dict[int, List[TicketStatus]] = {
+            complaint_id: [] for complaint_id in complaint_ids
+        }
+        if not timelines:
+            return timelines
+        stmt = (
+            select(TicketStatus)
+            .filter(TicketStatus.complaint_id.in_(list(timelines)))
+            .order_by(TicketStatus.complaint_id, TicketStatus.data, TicketStatus.sort_order)
+        )
+        result = await session.execute(stmt)
+        for ticket_status in result.scalars():
+            timelines[ticket_status.complaint_id].append(ticket_status)
+        return timelines
+
+    async def _get_ticket_status_entry(
+        self,
+        session: AsyncSession,
+        complaint_id: int,
+        status_code: str,
+        data: Optional[datetime] = None,
+    ) -> Optional[TicketStatus]:
+        # Без data — последняя запись с этим статусом
+        stmt = select(TicketStatus).filter(
+            TicketStatus.complaint_id == complaint_id,
+            TicketStatus.status_code == status_code,
+        )
+        if data is not None:
+            stmt = stmt.filter(TicketStatus.data == data)
+        stmt = stmt.order_by(TicketStatus.data.desc()).limit(1)
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
     async def update_ticket_status(
         self,
         session: AsyncSession,
@@ -241,8 +641,8 @@ class TicketStatusRepository(TicketStatusRepositoryProtocol):
         sort_order: int,
         executor_id: Optional[int],
     ) -> TicketStatus:
-        ticket_status = await self.get_ticket_status(
-            session, complaint_id, status_code, datetime.utcnow()
+        ticket_status = await self._get_ticket_status_entry(
+            session, complaint_id, status_code
         )
         if ticket_status:
             if description is not None:
@@ -253,17 +653,250 @@ class TicketStatusRepository(TicketStatusRepositoryProtocol):
                 ticket_status.executor_id = executor_id
             session.add(ticket_status)
             await session.flush()
-            await session.commit()
             return ticket_status
         raise ValueError("TicketStatus not found")
 
     async def delete_ticket_status(
         self, session: AsyncSession, complaint_id: int, status_code: str, data: datetime
     ) -> None:
-        ticket_status = await self.get_ticket_status(
+        ticket_status = await self._get_ticket_status_entry(
             session, complaint_id, status_code, data
         )
         if ticket_status:
             await session.delete(ticket_status)
             await session.flush()
-            await session.commit()
+
+
+class ExecutorUpdateJobRepository(ExecutorUpdateJobRepositoryProtocol):
+    async def enqueue_job(
+        self,
+        session: AsyncSession,
+        complaint_id: int,
+        payload: dict,
+        max_attempts: int,
+    ) -> ExecutorUpdateJob:
+        job = ExecutorUpdateJob(
+            complaint_id=complaint_id,
+            payload=payload,
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts,
+        )
+        session.add(job)
+        await session.flush()
+        return job
+
+    async def get_job(
+        self, session: AsyncSession, job_id: int
+    ) -> Optional[ExecutorUpdateJob]:
+        stmt = select(ExecutorUpdateJob).filter(ExecutorUpdateJob.job_id == job_id)
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
+    async def claim_jobs(
+        self, session: AsyncSession, limit: int, lease_seconds: float
+    ) -> List[ExecutorUpdateJob]:
+        """
+        Забираем готовые задания. SKIP LOCKED — несколько воркеров не мешают
+        друг другу; running с истёкшей арендой (упавший воркер) забирается заново,
+        но только пока не исчерпаны попытки (см. fail_exhausted_jobs).
+        """
+        now = datetime.utcnow()
+        stmt = (
+            select(ExecutorUpdateJob)
+            .filter(
+                ExecutorUpdateJob.status.in_(["queued", "running"]),
+                ExecutorUpdateJob.run_after <= now,
+                ExecutorUpdateJob.attempts < ExecutorUpdateJob.max_attempts,
+            )
+            .order_by(ExecutorUpdateJob.run_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(stmt)
+        jobs = list(result.scalars().all())
+        for job in jobs:
+            job.status = "running"
+            job.attempts += 1
+            job.run_after = now + timedelta(seconds=lease_seconds)
+        await session.flush()
+        return jobs
+
+    async def fail_exhausted_jobs(self, session: AsyncSession) -> int:
+        """
+        Задания, которые роняют воркер (аренда истекла, попытки кончились),
+        переводим в failed — иначе они навсегда зависнут в running.
+        """
+        stmt = (
+            update(ExecutorUpdateJob)
+            .where(
+                ExecutorUpdateJob.status.in_(["queued", "running"]),
+                ExecutorUpdateJob.run_after <= datetime.utcnow(),
+                ExecutorUpdateJob.attempts >= ExecutorUpdateJob.max_attempts,
+            )
+            .values(
+                status="failed",
+                last_error=func.coalesce(
+                    ExecutorUpdateJob.last_error, "Lease expired: max attempts exhausted"
+                ),
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def complete_job(self, session: AsyncSession, job_id: int) -> None:
+        stmt = (
+            update(ExecutorUpdateJob)
+            .where(ExecutorUpdateJob.job_id == job_id)
+            .values(status="done", last_error=None, updated_at=datetime.utcnow())
+        )
+        await session.execute(stmt)
+
+    async def fail_job(
+        self,
+        session: AsyncSession,
+        job_id: int,
+        error: str,
+        retry_at: Optional[datetime],
+    ) -> None:
+        values = {"last_error": error, "updated_at": datetime.utcnow()}
+        if retry_at is None:
+            values["status"] = "failed"
+        else:
+            values["status"] = "queued"
+            values["run_after"] = retry_at
+        stmt = (
+            update(ExecutorUpdateJob)
+            .where(ExecutorUpdateJob.job_id == job_id)
+            .values(**values)
+        )
+        await session.execute(stmt)
+
+
+class IdempotencyKeyRepository(IdempotencyKeyRepositoryProtocol):
+    async def get_key(
+        self, session: AsyncSession, scope: str, key: str
+    ) -> Optional[IdempotencyKey]:
+        stmt = select(IdempotencyKey).filter(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
+    async def claim_key(
+        self, session: AsyncSession, scope: str, key: str, request_hash: str
+    ) -> bool:
+        """
+        True — ключ наш; False — его уже занял параллельный запрос.
+        """
+        stmt = (
+            insert(IdempotencyKey)
+            .values(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["scope", "key"])
+            .returning(IdempotencyKey.scope)
+        )
+        result = await session.execute(stmt)
+        claimed = result.scalar_one_or_none() is not None
+        return claimed
+
+    async def takeover_key(
+        self, session: AsyncSession, scope: str, key: str, locked_before: datetime
+    ) -> bool:
+        """
+        Перехватываем ключ, зависший без ответа (упавший запрос).
+        """
+        stmt = (
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.response.is_(None),
+                IdempotencyKey.created_at < locked_before,
+            )
+            .values(created_at=datetime.utcnow())
+            .returning(IdempotencyKey.scope)
+        )
+        result = await session.execute(stmt)
+        taken = result.scalar_one_or_none() is not None
+        return taken
+
+    async def save_response(
+        self,
+        session: AsyncSession,
+        scope: str,
+        key: str,
+        status_code: int,
+        response: dict,
+    ) -> None:
+        stmt = (
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(status_code=status_code, response=response)
+        )
+        await session.execute(stmt)
+
+    async def delete_key(self, session: AsyncSession, scope: str, key: str) -> None:
+        stmt = delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key
+        )
+        await session.execute(stmt)
+
+
+class OutboxRepository(OutboxRepositoryProtocol):
+    async def add_event(
+        self, session: AsyncSession, event_type: str, payload: dict
+    ) -> None:
+        """
+        Событие пишется в той же транзакции, что и изменение заявки:
+        откат — нет события, коммит — событие точно будет разослано.
+        """
+        session.add(OutboxEvent(event_type=event_type, payload=payload))
+
+    async def claim_events(
+        self, session: AsyncSession, limit: int
+    ) -> List[OutboxEvent]:
+        """
+        Пачка неразосланных событий по порядку записи. SKIP LOCKED — несколько
+        диспетчеров (API и отдельный воркер) не рассылают одно событие дважды.
+        """
+        stmt = (
+            select(OutboxEvent)
+            .filter(OutboxEvent.published_at.is_(None))
+            .order_by(OutboxEvent.event_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def mark_published(
+        self, session: AsyncSession, event_ids: Sequence[int]
+    ) -> None:
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.event_id == any_(_bigint_array("event_ids", event_ids)))
+            .values(published_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+
+    async def delete_published(
+        self, session: AsyncSession, published_before: datetime, limit: int
+    ) -> int:
+        # порциями, чтобы чистка не держала долгую блокировку
+        batch = (
+            select(OutboxEvent.event_id)
+            .filter(OutboxEvent.published_at < published_before)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        stmt = delete(OutboxEvent).where(OutboxEvent.event_id.in_(batch))
+        result = await session.execute(stmt)
+        return result.rowcount
@@ -0,0 +1,63 @@
+"""
+ai-service: отдельный процесс, который владеет пулом соединений до YandexGPT.
+API ходит сюда через HttpAIClient (settings.ai_backend = "service").
+
+    uv run uvicorn src.ai_service.main:app --host 0.0.0.0 --port 8001
+"""
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+
+from src.adapters.ai import YandexAIClient
+from src.adapters.ai_batching import MicroBatchingAIClient
+from src.adapters.ai_stub import StubAIClient
+from src.core.config import settings
+from src.schemas.ai_service import (
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
+    AnalyzeRequest,
+)
+from src.schemas.executor_update import ExecutorUpdateResult
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # В режиме заглушки ключи YandexGPT не нужны
+    client = StubAIClient() if settings.ai_service_stub else YandexAIClient()
+    app.state.ai_client = client
+    # Одиночные /analyze от разных API-воркеров тоже склеиваем в пачки
+    app.state.single_client = (
+        MicroBatchingAIClient(client) if settings.ai_batch_enabled else client
+    )
+
+    yield
+
+    await client.aclose()
+
+
+app = FastAPI(
+    title="Lobachevsky AI service",
+    lifespan=lifespan,
+)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "stub": settings.ai_service_stub}
+
+
+@app.post("/analyze", response_model=ExecutorUpdateResult)
+async def analyze(payload: AnalyzeRequest, request: Request):
+    return await request.app.state.single_client.analyze_executor_response(
+        complaint_description=payload.complaint_description,
+        update=payload.update,
+    )
+
+
+@app.post("/analyze/batch", response_model=AnalyzeBatchResponse)
+async def analyze_batch(payload: AnalyzeBatchRequest, request: Request):
+    """
+    Пачка независимых анализов одним запросом к модели.
+    """
+    results = await request.app.state.ai_client.analyze_batch(payload.items)
+    return AnalyzeBatchResponse(results=results)
@@ -0,0 +1,52 @@
+from typing import Annotated
+
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import get_session
+from src.schemas.bulk import ExecutorSyncItem, ExecutorSyncReport, ImportReport
+from src.services.complaint_import import ComplaintImportService, ImportFormat
+from src.services.executor_directory import ExecutorDirectoryService
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+)
+
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+
+
+@router.post("/complaints/import", response_model=ImportReport)
+@inject
+async def import_complaints(
+    request: Request,
+    db: SessionDep,
+    import_service: FromDishka[ComplaintImportService],
+    format: ImportFormat = "csv",
+):
+    """
+    Массовый импорт жалоб: тело запроса — CSV (с заголовком) или JSONL,
+    читается потоком. Ошибочные строки возвращаются в отчёте, остальные загружаются.
+    """
+    return await import_service.import_complaints(db, request.stream(), format)
+
+
+@router.post("/executors/sync", response_model=ExecutorSyncReport)
+@inject
+async def sync_executors(
+    items: list[ExecutorSyncItem],
+    db: SessionDep,
+    directory_service: FromDishka[ExecutorDirectoryService],
+    deactivate_missing: bool = True,
+):
+    """
+    Синхронизация справочника исполнителей с полным списком организаций:
+    upsert по нормализованному имени, отсутствующие в списке выключаются.
+    """
+    try:
+        return await directory_service.sync(
+            db, items, deactivate_missing=deactivate_missing
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
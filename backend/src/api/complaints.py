@@ -1,33 +1,96 @@
 # app/api/v1/complaints.py
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from dishka.integrations.fastapi import FromDishka, inject
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dto import ExecutorDTO, ComplaintDTO, ModeratorDTO, TicketStatusDTO
+from src.api.dto import (
+    BulkTransitionResultDTO,
+    ExecutorDTO,
+    ComplaintDTO,
+    ComplaintSearchHitDTO,
+    ModeratorDTO,
+    TicketStatusDTO,
+    ComplaintTimelineDTO,
+    ExecutorUpdateJobDTO,
+)
+from src.api.idempotency import IdempotencyKeyHeader, run_idempotent
+from src.core.config import settings
+from src.core.pagination import InvalidCursorError
 from src.db.session import get_session
+from src.protocols.ai import AIUnavailableError
 from src.schemas.complaint import (
+    ComplaintBulkTransition,
     ComplaintCreate,
+    ComplaintFilter,
     ComplaintUpdate,
     ModeratorCreate,
     ModeratorUpdate,
 )
 from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorCreateRequest
 from src.services.complaints import ComplaintService
+from src.services.idempotency import IdempotencyService
 
 router = APIRouter()
 
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 
 
+def _parse_ids(raw: str) -> list[int]:
+    """
+    "1,2,3" → [1, 2, 3] без дублей, с ограничением на размер пачки.
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated integers")
+    if not ids:
+        raise HTTPException(status_code=422, detail="ids must not be empty")
+    if len(ids) > settings.max_batch_ids:
+        raise HTTPException(
+            status_code=422, detail=f"Too many ids (max {settings.max_batch_ids})"
+        )
+    return ids
+
+
 @router.get("/statuses/")
 @inject
-async def list_complaints(
+async def list_ticket_statuses(
     db: SessionDep,
     complaint_service: FromDishka[ComplaintService],
-    complaint_id: int,
+    complaint_id: int | None = None,
+    complaint_ids: str | None = None,
 ):
+    if complaint_ids is not None:
+        # ?complaint_ids=1,2,3 — хронологии нескольких заявок одним запросом
+        timelines = await complaint_service.get_ticket_statuses(
+            db, complaint_ids=_parse_ids(complaint_ids)
+        )
+        return [
+            ComplaintTimelineDTO(
+                complaint_id=timeline_complaint_id,
+                statuses=[
+                    TicketStatusDTO(
+                        complaint_id=status.complaint_id,
+                        status_code=status.status_code,
+                        data=status.data,
+                        sort_order=status.sort_order,
+                        executor_id=status.executor_id,
+                        description=status.description,
+                    )
+                    for status in statuses
+                ],
+            )
+            for timeline_complaint_id, statuses in timelines.items()
+        ]
+
+    if complaint_id is None:
+        raise HTTPException(
+            status_code=422, detail="complaint_id or complaint_ids is required"
+        )
     statuses = await complaint_service.get_ticket_status(db, complaint_id=complaint_id)
     if not statuses:
         raise HTTPException(status_code=404, detail="No complaints found")
@@ -43,45 +106,115 @@ async def list_complaints(
         for status in statuses
     ]
 
+
 @router.post("/complaints")
 @inject
 async def create_complaint(
-    complaint_data: ComplaintCreate, db: SessionDep, complaint_service: FromDishka[ComplaintService],
+    complaint_data: ComplaintCreate,
+    db: SessionDep,
+    complaint_service: FromDishka[ComplaintService],
+    idempotency_service: FromDishka[IdempotencyService],
+    idempotency_key: IdempotencyKeyHeader = None,
 ):
-    try:
-        complaint = await complaint_service.create_complaint(
-            db,
-            description=complaint_data.description,
-            district=complaint_data.district,
-            status=complaint_data.status,
-            executor_id=complaint_data.executor_id,
-            address=complaint_data.address,
-        )
-        return ComplaintDTO(
-            complaint_id=complaint.complaint_id,
-            status=complaint.status,
-            executor_id=complaint.executor_id,
-            address=complaint.address,
-            district=complaint.district,
-            description=complaint.description,
-            resolution=complaint.resolution,
-            created_at=complaint.created_at,
-            execution_date=complaint.execution_date,
-            final_status_at=complaint.final_status_at,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    async def handle():
+        try:
+            complaint = await complaint_service.create_complaint(
+                db,
+                description=complaint_data.description,
+                district=complaint_data.district,
+                status=complaint_data.status,
+                executor_id=complaint_data.executor_id,
+                address=complaint_data.address,
+            )
+            return ComplaintDTO(
+                complaint_id=complaint.complaint_id,
+                status=complaint.status,
+                executor_id=complaint.executor_id,
+                address=complaint.address,
+                district=complaint.district,
+                description=complaint.description,
+                resolution=complaint.resolution,
+                created_at=complaint.created_at,
+                execution_date=complaint.execution_date,
+                final_status_at=complaint.final_status_at,
+            )
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await run_idempotent(
+        db,
+        idempotency_service,
+        scope="create_complaint",
+        key=idempotency_key,
+        payload=complaint_data.model_dump(mode="json"),
+        handler=handle,
+    )
 
 
+@router.get("/complaints")
 @router.get("/complaints/")
 @inject
 async def list_complaints(
+    response: Response,
     db: SessionDep,
     complaint_service: FromDishka[ComplaintService],
-    limit: int = 50,
-    offset: int = 0,
+    filters: Annotated[ComplaintFilter, Depends()],
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+    ids: str | None = Query(None, description="complaint_id через запятую"),
 ):
-    complaints = await complaint_service.list_complaints(db, limit=limit, offset=offset)
+    """
+    Новые заявки сверху. Следующая страница — по курсору из заголовка
+    X-Next-Cursor (?cursor=…); offset оставлен для старых клиентов.
+    Фильтры: status, district, executor_id, created_from/created_to, open_only.
+
+    С ?ids=1,2,3 — несколько заявок одним запросом в порядке ids
+    (несуществующие id пропускаются), фильтры и пагинация не применяются.
+    """
+    if ids is not None:
+        complaints = await complaint_service.get_complaints(db, _parse_ids(ids))
+        return [
+            ComplaintDTO(
+                complaint_id=complaint.complaint_id,
+                status=complaint.status,
+                executor_id=complaint.executor_id,
+                address=complaint.address,
+                district=complaint.district,
+                description=complaint.description,
+                resolution=complaint.resolution,
+                created_at=complaint.created_at,
+                execution_date=complaint.execution_date,
+                final_status_at=complaint.final_status_at,
+            )
+            for complaint in complaints
+        ]
+
+    if (
+        filters.created_from is not None
+        and filters.created_to is not None
+        and filters.created_from >= filters.created_to
+    ):
+        raise HTTPException(
+            status_code=422, detail="created_from must be earlier than created_to"
+        )
+    if cursor is not None or offset == 0:
+        if cursor is not None and offset:
+            raise HTTPException(
+                status_code=422, detail="cursor and offset are mutually exclusive"
+            )
+        try:
+            complaints, next_cursor = await complaint_service.list_complaints_page(
+                db, limit=limit, cursor=cursor, filters=filters
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+    else:
+        complaints = await complaint_service.list_complaints(
+            db, limit=limit, offset=offset, filters=filters
+        )
     if not complaints:
         raise HTTPException(status_code=404, detail="No complaints found")
     return [
@@ -101,6 +234,100 @@ async def list_complaints(
     ]
 
 
+# Объявлен до /complaints/{complaint_id}, иначе "search" уйдёт в complaint_id
+@router.get("/complaints/search", response_model=list[ComplaintSearchHitDTO])
+@inject
+async def search_complaints(
+    db: SessionDep,
+    complaint_service: FromDishka[ComplaintService],
+    filters: Annotated[ComplaintFilter, Depends()],
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+):
+    """
+    Полнотекстовый поиск по описанию, адресу и резолюции (русская морфология),
+    по убыванию релевантности; фильтры — как у GET /complaints/.
+    """
+    hits = await complaint_service.search_complaints(
+        db, query=q, limit=limit, offset=offset, filters=filters
+    )
+    return [
+        ComplaintSearchHitDTO(
+            complaint=ComplaintDTO(
+                complaint_id=complaint.complaint_id,
+                status=complaint.status,
+                executor_id=complaint.executor_id,
+                address=complaint.address,
+                district=complaint.district,
+                description=complaint.description,
+                resolution=complaint.resolution,
+                created_at=complaint.created_at,
+                execution_date=complaint.execution_date,
+                final_status_at=complaint.final_status_at,
+            ),
+            rank=rank,
+            snippet=snippet,
+        )
+        for complaint, rank, snippet in hits
+    ]
+
+
+@router.post("/complaints/bulk-transition", response_model=BulkTransitionResultDTO)
+@inject
+async def bulk_transition(
+    transition: ComplaintBulkTransition,
+    db: SessionDep,
+    complaint_service: FromDishka[ComplaintService],
+):
+    """
+    Одинаковые изменения (status / resolution / executor_id) для набора заявок
+    одной транзакцией.
+    """
+    if (
+        transition.status is None
+        and transition.resolution is None
+        and transition.executor_id is None
+    ):
+        raise HTTPException(
+            status_code=422, detail="status, resolution or executor_id is required"
+        )
+    complaint_ids = list(dict.fromkeys(transition.complaint_ids))
+    if len(complaint_ids) > settings.max_batch_ids:
+        raise HTTPException(
+            status_code=422, detail=f"Too many ids (max {settings.max_batch_ids})"
+        )
+    try:
+        complaints = await complaint_service.bulk_transition(
+            db,
+            complaint_ids,
+            status=transition.status,
+            resolution=transition.resolution,
+            executor_id=transition.executor_id,
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Executor not found")
+    updated_ids = {complaint.complaint_id for complaint in complaints}
+    return BulkTransitionResultDTO(
+        updated=[
+            ComplaintDTO(
+                complaint_id=complaint.complaint_id,
+                status=complaint.status,
+                executor_id=complaint.executor_id,
+                address=complaint.address,
+                district=complaint.district,
+                description=complaint.description,
+                resolution=complaint.resolution,
+                created_at=complaint.created_at,
+                execution_date=complaint.execution_date,
+                final_status_at=complaint.final_status_at,
+            )
+            for complaint in complaints
+        ],
+        missing=[cid for cid in complaint_ids if cid not in updated_ids],
+    )
+
+
 @router.get("/complaints/{complaint_id}")
 @inject
 async def get_complaint(
@@ -179,13 +406,17 @@ async def delete_complaint(
 async def create_executor(
     executor_data: ExecutorCreateRequest, db: SessionDep, complaint_service: FromDishka[ComplaintService],
 ):
-    executor = await complaint_service.create_executor(
-        db,
-        name=executor_data.name,
-        organization=executor_data.organization,
-        phone=executor_data.phone,
-        email=executor_data.email,
-    )
+    try:
+        executor = await complaint_service.create_executor(
+            db,
+            name=executor_data.name,
+            organization=executor_data.organization,
+            phone=executor_data.phone,
+            email=executor_data.email,
+        )
+    except IntegrityError:
+        # normalized_name уникален
+        raise HTTPException(status_code=409, detail="Executor with this name already exists")
     return ExecutorDTO(
         executor_id=executor.executor_id,
         name=executor.name,
@@ -264,11 +495,38 @@ async def handle_executor_update(
     executor_update: ExecutorUpdateRequest,
     db: SessionDep,
     complaint_service: FromDishka[ComplaintService],
+    idempotency_service: FromDishka[IdempotencyService],
+    async_mode: bool = False,
+    idempotency_key: IdempotencyKeyHeader = None,
 ):
-    try:
-        complaint = await complaint_service.handle_executor_update(
-            db, complaint_id=complaint_id, update=executor_update
-        )
+    async def handle():
+        if async_mode:
+            # Ставим в очередь и сразу отвечаем 202 — анализ выполнит воркер
+            job = await complaint_service.enqueue_executor_update(
+                db, complaint_id=complaint_id, update=executor_update
+            )
+            if job is None:
+                raise HTTPException(status_code=404, detail="Complaint not found")
+            return JSONResponse(
+                status_code=202,
+                content={"job_id": job.job_id, "status": job.status},
+                headers={"Location": f"/executor-update-jobs/{job.job_id}"},
+            )
+
+        try:
+            complaint = await complaint_service.handle_executor_update(
+                db, complaint_id=complaint_id, update=executor_update
+            )
+        except AIUnavailableError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(int(settings.ai_breaker_reset_seconds))},
+            ) from e
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if complaint is None:
+            raise HTTPException(status_code=404, detail="Complaint not found")
         return ComplaintDTO(
             complaint_id=complaint.complaint_id,
             status=complaint.status,
@@ -281,8 +539,59 @@ async def handle_executor_update(
             execution_date=complaint.execution_date,
             final_status_at=complaint.final_status_at,
         )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+
+    return await run_idempotent(
+        db,
+        idempotency_service,
+        scope="executor_update",
+        key=idempotency_key,
+        payload={
+            "complaint_id": complaint_id,
+            "async_mode": async_mode,
+            **executor_update.model_dump(mode="json"),
+        },
+        handler=handle,
+    )
+
+
+@router.get("/executor-update-jobs/{job_id}")
+@inject
+async def get_executor_update_job(
+    job_id: int,
+    db: SessionDep,
+    complaint_service: FromDishka[ComplaintService],
+):
+    job = await complaint_service.get_executor_update_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    complaint_dto = None
+    if job.status == "done":
+        complaint = await complaint_service.get_complaint(db, job.complaint_id)
+        if complaint:
+            complaint_dto = ComplaintDTO(
+                complaint_id=complaint.complaint_id,
+                status=complaint.status,
+                executor_id=complaint.executor_id,
+                address=complaint.address,
+                district=complaint.district,
+                description=complaint.description,
+                resolution=complaint.resolution,
+                created_at=complaint.created_at,
+                execution_date=complaint.execution_date,
+                final_status_at=complaint.final_status_at,
+            )
+
+    return ExecutorUpdateJobDTO(
+        job_id=job.job_id,
+        complaint_id=job.complaint_id,
+        status=job.status,
+        attempts=job.attempts,
+        last_error=job.last_error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        complaint=complaint_dto,
+    )
 
 
 @router.post("/moderators")
@@ -29,6 +29,19 @@ class ComplaintDTO(BaseModel):
     resolution: str | None
 
 
+class BulkTransitionResultDTO(BaseModel):
+    updated: list[ComplaintDTO]
+    # id, которых нет в БД
+    missing: list[int]
+
+
+class ComplaintSearchHitDTO(BaseModel):
+    complaint: ComplaintDTO
+    rank: float
+    # фрагменты текста, HTML-экранированы; совпадения обёрнуты в <b>…</b>
+    snippet: str
+
+
 class ModeratorDTO(BaseModel):
 
     moderator_id: int
@@ -50,3 +63,21 @@ class TicketStatusDTO(BaseModel):
 
     sort_order: int
     description: str | None
+
+
+class ComplaintTimelineDTO(BaseModel):
+    complaint_id: int
+    statuses: list[TicketStatusDTO]
+
+
+class ExecutorUpdateJobDTO(BaseModel):
+    job_id: int
+    complaint_id: int
+    status: str
+    attempts: int
+    last_error: str | None
+    created_at: datetime
+    updated_at: datetime
+
+    # заполняется, когда задание выполнено
+    complaint: ComplaintDTO | None = None
@@ -0,0 +1,189 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Annotated, Any, Literal
+
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from starlette.background import BackgroundTask
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.db.session import ExportSessionLocal
+from src.schemas.complaint import ComplaintFilter
+from src.services.complaints import ComplaintService
+
+router = APIRouter(
+    prefix="/export",
+    tags=["export"],
+)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+_COMPLAINT_FIELDS = [
+    "complaint_id",
+    "created_at",
+    "execution_date",
+    "final_status_at",
+    "status",
+    "address",
+    "executor_id",
+    "district",
+    "description",
+    "resolution",
+]
+# колонки статуса в выборке заявка × статусы (префикс ts_ снимается в NDJSON)
+_STATUS_FIELDS = [
+    "ts_status_code",
+    "ts_data",
+    "ts_sort_order",
+    "ts_executor_id",
+    "ts_description",
+]
+
+_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+Partitions = AsyncIterator[Sequence[RowMapping]]
+
+
+# ======== кодирование порций ========
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _json_line(obj: dict) -> str:
+    return json.dumps(obj, ensure_ascii=False, default=_plain) + "\n"
+
+
+async def _ndjson_complaints(partitions: Partitions) -> AsyncIterator[str]:
+    async for rows in partitions:
+        metrics.incr("export.rows", len(rows))
+        yield "".join(_json_line(dict(row)) for row in rows)
+
+
+async def _ndjson_timelines(partitions: Partitions) -> AsyncIterator[str]:
+    """
+    Одна строка NDJSON на заявку со списком статусов. Строки одной заявки
+    приходят подряд (ORDER BY complaint_id), поэтому держим в памяти только текущую.
+    """
+    current: dict | None = None
+    async for rows in partitions:
+        metrics.incr("export.rows", len(rows))
+        lines = []
+        for row in rows:
+            if current is None or current["complaint_id"] != row["complaint_id"]:
+                if current is not None:
+                    lines.append(_json_line(current))
+                current = {field: row[field] for field in _COMPLAINT_FIELDS}
+                current["statuses"] = []
+            if row["ts_status_code"] is not None:
+                current["statuses"].append(
+                    {field[len("ts_"):]: row[field] for field in _STATUS_FIELDS}
+                )
+        if lines:
+            yield "".join(lines)
+    if current is not None:
+        yield _json_line(current)
+
+
+async def _csv_rows(partitions: Partitions, fields: list[str]) -> AsyncIterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    yield buf.getvalue()
+    async for rows in partitions:
+        metrics.incr("export.rows", len(rows))
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows([_plain(row[field]) for field in fields] for row in rows)
+        yield buf.getvalue()
+
+
+async def _stream(
+    complaint_service: ComplaintService,
+    filters: ComplaintFilter,
+    format: ExportFormat,
+    with_timelines: bool,
+    filename: str,
+) -> StreamingResponse:
+    # Своя сессия из пула выгрузок: соединение берём до ответа, чтобы занятый
+    # пул дал честный 503, а не оборванный посреди потока 200
+    session = ExportSessionLocal()
+    try:
+        await session.connection()
+    except PoolTimeoutError:
+        await session.close()
+        metrics.incr("export.pool_exhausted")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many exports in progress",
+            headers={"Retry-After": str(int(settings.export_pool_timeout))},
+        ) from None
+    except BaseException:
+        await session.close()
+        raise
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            partitions = complaint_service.stream_complaints(
+                session, filters=filters, with_timelines=with_timelines
+            )
+            if format == "csv":
+                fields = _COMPLAINT_FIELDS + (_STATUS_FIELDS if with_timelines else [])
+                chunks = _csv_rows(partitions, fields)
+            elif with_timelines:
+                chunks = _ndjson_timelines(partitions)
+            else:
+                chunks = _ndjson_complaints(partitions)
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await session.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+        # если клиент ушёл до начала потока, тело не запустится — закрываем и здесь
+        background=BackgroundTask(session.close),
+    )
+
+
+# ======== эндпоинты ========
+
+@router.get("/complaints")
+@inject
+async def export_complaints(
+    complaint_service: FromDishka[ComplaintService],
+    filters: Annotated[ComplaintFilter, Depends()],
+    format: ExportFormat = "ndjson",
+):
+    """
+    Потоковая выгрузка заявок (по complaint_id) с фильтрами как у GET /complaints/.
+    """
+    return await _stream(complaint_service, filters, format, False, "complaints")
+
+
+@router.get("/complaints/timelines")
+@inject
+async def export_complaint_timelines(
+    complaint_service: FromDishka[ComplaintService],
+    filters: Annotated[ComplaintFilter, Depends()],
+    format: ExportFormat = "ndjson",
+):
+    """
+    Заявки вместе с хронологией статусов: NDJSON — заявка со списком statuses,
+    CSV — строка на каждый статус (заявка без статусов — одна строка с пустыми ts_*).
+    """
+    return await _stream(complaint_service, filters, format, True, "complaint_timelines")
@@ -0,0 +1,56 @@
+import json
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any
+
+from fastapi import Header, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import outer_transaction
+from src.services.idempotency import IdempotencyConflictError, IdempotencyService
+
+IdempotencyKeyHeader = Annotated[
+    str | None, Header(alias="Idempotency-Key", max_length=255)
+]
+
+
+async def run_idempotent(
+    session: AsyncSession,
+    idempotency_service: IdempotencyService,
+    scope: str,
+    key: str | None,
+    payload: dict,
+    handler: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Выполняет handler один раз на Idempotency-Key: повтор получает сохранённый ответ.
+    Без заголовка — обычный вызов.
+    """
+    if key is None:
+        return await handler()
+
+    try:
+        stored = await idempotency_service.begin(session, scope, key, payload)
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=409 if e.in_progress else 422, detail=str(e))
+    if stored is not None:
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.response,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    # изменения обработчика и сохранённый ответ — один commit
+    try:
+        async with outer_transaction(session):
+            result = await handler()
+            if isinstance(result, Response):
+                status_code, content = result.status_code, json.loads(result.body)
+            else:
+                status_code, content = 200, jsonable_encoder(result)
+            await idempotency_service.complete(session, scope, key, status_code, content)
+    except Exception:
+        await idempotency_service.abort(session, scope, key)
+        raise
+    return result
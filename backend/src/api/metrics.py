@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from src.core.metrics import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Счётчики процесса: кэш ИИ и т.п.
+    """
+    return metrics.snapshot()
@@ -1,14 +1,25 @@
 from typing import Annotated, List
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from pydantic import BaseModel
 from dishka.integrations.fastapi import FromDishka, inject
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.idempotency import IdempotencyKeyHeader, run_idempotent
+from src.core.pagination import InvalidCursorError
 from src.db.session import get_session
 from src.schemas.complaint import ComplaintStatus
 from src.services.complaints import ComplaintService
+from src.services.idempotency import IdempotencyService
 
 router = APIRouter(
     prefix="/api",
@@ -53,25 +64,38 @@ async def create_ticket(
     payload: TicketCreate,
     db: SessionDep,
     complaint_service: FromDishka[ComplaintService],
+    idempotency_service: FromDishka[IdempotencyService],
+    idempotency_key: IdempotencyKeyHeader = None,
 ):
     """
     Адаптер: принимает JSON от фронта и создаёт Complaint в БД.
+    Повтор с тем же Idempotency-Key вернёт уже созданный тикет.
     """
-    complaint = await complaint_service.create_complaint(
-        db,
-        description=payload.description,
-        district=str(payload.category_id or ""),      # временно кладём category_id как строку
-        status=ComplaintStatus.NEW,
-        executor_id=None,
-        address="",                                   # можно потом нормально заполнить
-    )
+    async def handle():
+        complaint = await complaint_service.create_complaint(
+            db,
+            description=payload.description,
+            district=str(payload.category_id or ""),      # временно кладём category_id как строку
+            status=ComplaintStatus.NEW,
+            executor_id=None,
+            address="",                                   # можно потом нормально заполнить
+        )
+
+        # Вернём структуру в формате, который ждёт фронт
+        return TicketRead(
+            id=complaint.complaint_id,
+            description=complaint.description,
+            created_at=complaint.created_at,
+            relevance=payload.relevance,
+        )
 
-    # Вернём структуру в формате, который ждёт фронт
-    return TicketRead(
-        id=complaint.complaint_id,
-        description=complaint.description,
-        created_at=complaint.created_at,
-        relevance=payload.relevance,
+    return await run_idempotent(
+        db,
+        idempotency_service,
+        scope="create_ticket",
+        key=idempotency_key,
+        payload=payload.model_dump(mode="json"),
+        handler=handle,
     )
 
 
@@ -80,16 +104,24 @@ async def create_ticket(
 @router.get("/tickets", response_model=List[TicketRead])
 @inject
 async def list_tickets(
+    response: Response,
     db: SessionDep,
     complaint_service: FromDishka[ComplaintService],
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
 ):
     """
-    Отдаём последние жалобы как список тикетов.
+    Отдаём последние жалобы как список тикетов (новые сверху, сортирует БД).
+    Следующая страница — ?cursor= из заголовка X-Next-Cursor.
     """
-    complaints = await complaint_service.list_complaints(db, limit=100, offset=0)
-
-    # Если надо, можно сортировать по created_at убыванию
-    complaints_sorted = sorted(complaints, key=lambda c: c.created_at, reverse=True)
+    try:
+        complaints, next_cursor = await complaint_service.list_complaints_page(
+            db, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     return [
         TicketRead(
@@ -98,7 +130,7 @@ async def list_tickets(
             created_at=c.created_at,
             relevance=5,  # пока константа, фронту достаточно
         )
-        for c in complaints_sorted
+        for c in complaints
     ]
 
 
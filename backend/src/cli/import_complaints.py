@@ -0,0 +1,65 @@
+"""
+Массовый импорт исторических жалоб из CSV или JSONL:
+    uv run python -m src.cli.import_complaints complaints.csv
+    uv run python -m src.cli.import_complaints - --format jsonl < complaints.jsonl
+
+Печатает отчёт (JSON) в stdout; код возврата 1, если были ошибочные строки.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+from src.core.config import settings
+from src.db.session import AsyncSessionLocal, engine
+from src.di.container import container
+from src.services.complaint_import import ComplaintImportService
+
+_CHUNK_SIZE = 1 << 16
+
+
+async def _read_chunks(stream: BinaryIO) -> AsyncIterator[bytes]:
+    # блокирующее чтение файла — в потоке, чтобы не держать event loop
+    while chunk := await asyncio.to_thread(stream.read, _CHUNK_SIZE):
+        yield chunk
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import historical complaints")
+    parser.add_argument("path", help="CSV/JSONL file, '-' for stdin")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        help="input format (default: by file extension, csv for stdin)",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> int:
+    format = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+    if args.path == "-":
+        stream = sys.stdin.buffer
+    else:
+        stream = await asyncio.to_thread(Path(args.path).open, "rb")
+    try:
+        import_service = await container.get(ComplaintImportService)
+        async with AsyncSessionLocal() as session:
+            report = await import_service.import_complaints(
+                session, _read_chunks(stream), format, batch_size=args.batch_size
+            )
+    finally:
+        stream.close()
+        await container.close()
+        await engine.dispose()
+
+    print(report.model_dump_json(indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main(_parse_args())))
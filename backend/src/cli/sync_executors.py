@@ -0,0 +1,72 @@
+"""
+Синхронизация справочника исполнителей из файла (JSON-массив или CSV с заголовком
+name,organization,phone,email):
+    uv run python -m src.cli.sync_executors organizations.json
+    uv run python -m src.cli.sync_executors organizations.csv --keep-missing
+
+Печатает отчёт (JSON) в stdout. Файл с ошибками валидации не применяется целиком.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from pathlib import Path
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.db.session import AsyncSessionLocal, engine
+from src.di.container import container
+from src.schemas.bulk import ExecutorSyncItem
+from src.services.executor_directory import ExecutorDirectoryService
+
+_items_adapter = TypeAdapter(list[ExecutorSyncItem])
+
+
+def _load_items(path: Path) -> list[ExecutorSyncItem]:
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            # пустая ячейка = поле не задано
+            raw = [
+                {key: value for key, value in row.items() if value != ""}
+                for row in csv.DictReader(f)
+            ]
+        else:
+            raw = json.load(f)
+    return _items_adapter.validate_python(raw)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync executor directory")
+    parser.add_argument("path", type=Path, help="JSON array or CSV file")
+    parser.add_argument(
+        "--keep-missing",
+        action="store_true",
+        help="do not deactivate executors missing from the file",
+    )
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        items = _load_items(args.path)
+    except (ValidationError, ValueError) as e:
+        print(f"{args.path}: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        directory_service = await container.get(ExecutorDirectoryService)
+        async with AsyncSessionLocal() as session:
+            report = await directory_service.sync(
+                session, items, deactivate_missing=not args.keep_missing
+            )
+    finally:
+        await container.close()
+        await engine.dispose()
+
+    print(report.model_dump_json(indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(_parse_args())))
@@ -13,8 +13,101 @@ class Settings(BaseSettings):
 
     database_url: PostgresDsn = "postgresql+asyncpg://portal:portal@db:5432/portal"
 
+    # Откуда API берёт решения ИИ:
+    #   "local"   — сам ходит в YandexGPT (нужны YC_FOLDER_ID / YC_API_KEY,
+    #               без них — заглушка с предупреждением в логе)
+    #   "service" — через отдельный ai-service по ai_service_url
+    #   "stub"    — локальная заглушка на правилах (тесты, разработка)
+    ai_backend: str = "local"
     ai_service_url: str = "http://ai-service:8001"
+    # ai-service сам работает заглушкой, без YandexGPT
+    ai_service_stub: bool = False
+
+    # Клиент YandexGPT: таймаут одного вызова, ретраи, пул и лимит параллельных запросов
+    ai_request_timeout: float = 30.0
+    ai_max_retries: int = 1
+    ai_max_connections: int = 32
+    ai_max_concurrency: int = 16
+
+    # Кэш решений ИИ: LRU в памяти процесса + таблица ai_decision_cache
+    ai_cache_enabled: bool = True
+    ai_cache_ttl_seconds: int = 7 * 24 * 3600
+    ai_cache_max_entries: int = 10_000
+
+    # Локальный классификатор по правилам: модель зовём только ниже порога уверенности
+    ai_rules_enabled: bool = True
+    ai_rules_confidence_threshold: float = 0.8
+
+    # Микро-батчинг одновременных анализов: окно ожидания и размер пачки.
+    # Таймаут пачки = ai_request_timeout + ai_batch_item_timeout на каждый элемент сверх первого
+    ai_batch_enabled: bool = True
+    ai_batch_window_ms: float = 10.0
+    ai_batch_max_size: int = 16
+    ai_batch_item_timeout: float = 2.0
+
+    # Защита от проблем YandexGPT: AIMD-лимит параллелизма и circuit breaker
+    ai_resilience_enabled: bool = True
+    ai_limiter_initial_limit: int = 8
+    ai_limiter_min_limit: int = 1
+    ai_limiter_max_limit: int = 64
+    ai_limiter_target_latency_ms: float = 8000.0
+    ai_limiter_queue_timeout: float = 2.0
+    ai_breaker_failure_threshold: int = 5
+    ai_breaker_reset_seconds: float = 30.0
+
+    # Очередь executor_update_jobs: воркеры внутри API (0 — только отдельный процесс)
+    executor_update_workers: int = 2
+    executor_update_job_batch_size: int = 4
+    executor_update_job_max_attempts: int = 5
+    executor_update_job_poll_interval: float = 1.0
+    executor_update_job_lease_seconds: float = 120.0
+    executor_update_job_backoff_seconds: float = 5.0
+    executor_update_job_backoff_max_seconds: float = 300.0
+
+    # Idempotency-Key: через сколько секунд ключ без ответа считается брошенным
+    idempotency_lock_seconds: int = 300
+
+    # Куда уходят уведомления /ws/notifications:
+    #   "local"    — хаб внутри этого процесса (один воркер, разработка)
+    #   "postgres" — NOTIFY в канал notifications_channel, клиентов держит
+    #                отдельный notifier (websocket_notifier_url), слушающий LISTEN
+    notifications_backend: str = "local"
+    notifications_channel: str = "complaint_events"
     websocket_notifier_url: str = "ws://notifier:8002/ws"
 
+    # Хаб /ws/notifications: очередь отправки на клиента (переполнение — отключаем
+    # медленного клиента), таймаут одной отправки, интервал ping и входящая очередь хаба
+    ws_client_queue_size: int = 100
+    ws_send_timeout: float = 5.0
+    ws_heartbeat_seconds: float = 20.0
+    ws_inbound_queue_size: int = 10_000
+    # Подписок (топиков) на одно соединение
+    ws_max_topics_per_client: int = 100
+    # Сколько последних событий хранить для повтора после переподключения (?since=)
+    ws_replay_buffer_size: int = 10_000
+
+    # Outbox событий (outbox_events): диспетчер внутри API и воркера, размер пачки,
+    # период опроса (после коммита сервис будит диспетчер сразу) и сколько часов
+    # хранить уже разосланные события; сколько ждать места во входящей очереди хаба
+    # (не дождались — пачка остаётся в outbox до следующей попытки)
+    outbox_dispatcher_enabled: bool = True
+    outbox_batch_size: int = 500
+    outbox_poll_interval: float = 1.0
+    outbox_retention_hours: float = 24.0
+    outbox_publish_timeout: float = 5.0
+
+    # Максимум id в пакетных запросах (?complaint_ids=…)
+    max_batch_ids: int = 500
+
+    # Выгрузки (/export/*): отдельный маленький пул соединений, чтобы долгие
+    # выгрузки не занимали пул API, и размер порции серверного курсора
+    export_pool_size: int = 2
+    export_pool_timeout: float = 10.0
+    export_yield_per: int = 1000
+
+    # Массовый импорт жалоб: строк в одной COPY-транзакции и ошибок в отчёте
+    import_batch_size: int = 5000
+    import_max_errors: int = 1000
+
 
 settings = Settings()
@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+
+class Metrics:
+    """
+    Простейший реестр метрик процесса: счётчики, текущие значения и сводки (count/sum/max).
+    Отдаётся как JSON через GET /metrics.
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+        self._summaries: dict[str, dict[str, float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        summary = self._summaries.get(name)
+        if summary is None:
+            summary = {"count": 0, "sum": 0.0, "max": value}
+            self._summaries[name] = summary
+        summary["count"] += 1
+        summary["sum"] += value
+        summary["max"] = max(summary["max"], value)
+
+    def snapshot(self) -> dict:
+        summaries = {
+            name: {
+                **summary,
+                "avg": summary["sum"] / summary["count"] if summary["count"] else 0.0,
+            }
+            for name, summary in self._summaries.items()
+        }
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+            "summaries": summaries,
+        }
+
+
+metrics = Metrics()
@@ -0,0 +1,28 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+# Позиция в выдаче, отсортированной по (created_at DESC, complaint_id DESC)
+Keyset = tuple[datetime, int]
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, complaint_id: int) -> str:
+    """
+    Непрозрачный для клиента курсор: base64url от JSON с последним ключом страницы.
+    """
+    raw = json.dumps([created_at.isoformat(), complaint_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, complaint_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(complaint_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
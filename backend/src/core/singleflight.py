@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from src.core.metrics import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Схлопывание одинаковых одновременных вызовов: пока по ключу идёт вызов,
+    остальные ждут его результат вместо того, чтобы делать ту же работу.
+    Счётчики: singleflight.<name>.executed / .coalesced в /metrics.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._calls: dict[K, asyncio.Future] = {}
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            metrics.incr(f"singleflight.{self._name}.coalesced")
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Отменили ведущий вызов, а не нас — пробуем ещё раз сами
+                current = asyncio.current_task()
+                if future.cancelled() and current is not None and not current.cancelling():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        metrics.incr(f"singleflight.{self._name}.executed")
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # исключение получат ожидающие; помечаем его как извлечённое
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
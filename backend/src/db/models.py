@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from typing import List, Optional
 
@@ -11,8 +12,12 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     ForeignKey,
+    Computed,
+    Index,
+    text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import Mapped, deferred, mapped_column, relationship, validates
 
 from src.db.base import Base
 
@@ -21,6 +26,22 @@ from src.db.base import Base
 # EXECUTORS
 # ============================
 
+# Пробельные символы перечислены явно (ровно те, что str.isspace()): \s
+# в регулярках Postgres зависит от локали и, например, не ловит неразрывный пробел
+_NAME_WHITESPACE = re.compile(
+    "[\t\n\v\f\r\u001c-\u001f \u0085\u00a0\u1680\u2000-\u200a"
+    "\u2028\u2029\u202f\u205f\u3000]+"
+)
+
+
+def normalize_executor_name(name: str) -> str:
+    """
+    Ключ справочника исполнителей: регистр, ё/е и лишние пробелы не важны.
+    То же выражение — в db/schema.sql для заполнения существующих строк.
+    """
+    return _NAME_WHITESPACE.sub(" ", name).strip(" ").lower().replace("ё", "е")
+
+
 class Executor(Base):
     __tablename__ = "executors"
 
@@ -29,6 +50,10 @@ class Executor(Base):
     )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # уникальный ключ для поиска по имени и синхронизации справочника
+    normalized_name: Mapped[str] = mapped_column(
+        String(255), unique=True, nullable=False
+    )
     organization: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -45,11 +70,23 @@ class Executor(Base):
         "TicketStatus", back_populates="executor", foreign_keys="TicketStatus.executor_id"
     )
 
+    @validates("name")
+    def _sync_normalized_name(self, key: str, name: str) -> str:
+        self.normalized_name = normalize_executor_name(name)
+        return name
+
 
 # ============================
 # COMPLAINTS
 # ============================
 
+# description важнее адреса, адрес важнее резолюции
+COMPLAINT_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(address, '')), 'B') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(resolution, '')), 'C')"
+)
+
 
 class Complaint(Base):
     __tablename__ = "complaints"
@@ -86,6 +123,16 @@ class Complaint(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     resolution: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Полнотекстовый поиск (русская морфология): считается самой БД,
+    # в обычные SELECT не попадает (deferred)
+    search_vector: Mapped[Optional[str]] = deferred(
+        mapped_column(
+            TSVECTOR,
+            Computed(COMPLAINT_SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        )
+    )
+
     # --- relationships ---
 
     executor: Mapped[Optional["Executor"]] = relationship(
@@ -103,6 +150,28 @@ class Complaint(Base):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        # ленты заявок: ORDER BY created_at DESC, complaint_id DESC + keyset-курсор
+        Index("ix_complaints_created_at_id", "created_at", "complaint_id"),
+        # фильтры списка: равенство по полю + та же сортировка/курсор
+        Index("ix_complaints_status_created_at", "status", "created_at", "complaint_id"),
+        Index("ix_complaints_district_created_at", "district", "created_at", "complaint_id"),
+        Index(
+            "ix_complaints_executor_id_created_at",
+            "executor_id",
+            "created_at",
+            "complaint_id",
+        ),
+        # открытые заявки (final_status_at IS NULL) — малая часть таблицы
+        Index(
+            "ix_complaints_open_created_at",
+            "created_at",
+            "complaint_id",
+            postgresql_where=text("final_status_at IS NULL"),
+        ),
+        Index("ix_complaints_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 # ============================
 # MODERATORS
@@ -187,3 +256,125 @@ class TicketStatus(Base):
         back_populates="ticket_statuses",
         foreign_keys=[executor_id],
     )
+
+    __table_args__ = (
+        # хронология заявки: WHERE complaint_id = ? ORDER BY data
+        Index("ix_ticket_statuses_complaint_id_data", "complaint_id", "data"),
+    )
+
+
+# ============================
+# AI DECISION CACHE
+# ============================
+
+class AIDecisionCache(Base):
+    __tablename__ = "ai_decision_cache"
+
+    # sha256 от версии промпта/модели и нормализованных текстов
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model_version: Mapped[str] = mapped_column(String(64), nullable=False)
+    result: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,  # naive datetime
+        nullable=False,
+    )
+
+
+# ============================
+# EXECUTOR UPDATE JOBS
+# ============================
+
+class ExecutorUpdateJob(Base):
+    __tablename__ = "executor_update_jobs"
+
+    job_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True
+    )
+    complaint_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("complaints.complaint_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # ExecutorUpdateRequest в JSON
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # queued → running → done | failed (running с истёкшей арендой забирается повторно)
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5, nullable=False)
+    # для queued — когда можно брать (backoff), для running — конец аренды
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (
+        # очередь: только незавершённые задания, по времени готовности
+        Index(
+            "ix_executor_update_jobs_pending",
+            "run_after",
+            postgresql_where=status.in_(["queued", "running"]),
+        ),
+    )
+
+
+# ============================
+# IDEMPOTENCY KEYS
+# ============================
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # операция (create_complaint, create_ticket, executor_update) + ключ клиента
+    scope: Mapped[str] = mapped_column(String(50), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    # sha256 тела запроса: тот же ключ с другим телом — ошибка клиента
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # пока запрос выполняется — NULL
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    response: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+
+# ============================
+# OUTBOX
+# ============================
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    event_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True
+    )
+    # block, redirect, bulk_transition, …
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    # сообщение для /ws/notifications целиком
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    # NULL — ещё не разослано диспетчером
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # очередь диспетчера: только неразосланные, по порядку записи
+        Index(
+            "ix_outbox_events_pending",
+            "event_id",
+            postgresql_where=published_at.is_(None),
+        ),
+    )
@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -11,7 +14,58 @@ AsyncSessionLocal = async_sessionmaker(
     bind=engine, expire_on_commit=False, class_=AsyncSession
 )
 
+# Отдельный пул под потоковые выгрузки: держат соединение минутами
+export_engine = create_async_engine(
+    str(settings.database_url),
+    echo=False,
+    pool_size=settings.export_pool_size,
+    max_overflow=0,
+    pool_timeout=settings.export_pool_timeout,
+)
+ExportSessionLocal = async_sessionmaker(
+    bind=export_engine, expire_on_commit=False, class_=AsyncSession
+)
+
 
 async def get_session() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Одна транзакция на операцию сервиса: репозитории только добавляют изменения
+    в сессию, а здесь ровно один commit (или rollback при ошибке).
+    Внутри outer_transaction не коммитит — только flush, коммит делает внешний блок.
+    """
+    if session.info.get(_OUTER_TRANSACTION):
+        yield session
+        await session.flush()
+        return
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+
+
+_OUTER_TRANSACTION = "outer_transaction"
+
+
+@asynccontextmanager
+async def outer_transaction(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Объединяет unit_of_work всех вызванных внутри сервисов с тем, что вызывающий
+    пишет после них (ответ на Idempotency-Key), в один commit.
+    """
+    session.info[_OUTER_TRANSACTION] = True
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        session.info.pop(_OUTER_TRANSACTION, None)
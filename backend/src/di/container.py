@@ -1,3 +1,6 @@
+import logging
+from typing import AsyncIterable
+
 from dishka import (
     provide,
     Scope,
@@ -6,22 +9,60 @@ from dishka import (
 )
 from dishka.integrations.fastapi import FastapiProvider
 
-from src.protocols.ai import AIClientProtocol
+from src.protocols.ai import AIClientProtocol, BatchAIClientProtocol
 from src.protocols.repo import (
     ComplaintRepositoryProtocol,
     ExecutorRepositoryProtocol,
     ModeratorRepositoryProtocol,
     TicketStatusRepositoryProtocol,
+    ExecutorUpdateJobRepositoryProtocol,
+    IdempotencyKeyRepositoryProtocol,
+    OutboxRepositoryProtocol,
 )
 from src.adapters.repo import (
     ComplaintRepository,
     ModeratorRepository,
     TicketStatusRepository,
     ExecutorRepository,
+    ExecutorUpdateJobRepository,
+    IdempotencyKeyRepository,
+    OutboxRepository,
 )
-from src.adapters.ai import YandexAIClient
+from src.adapters.ai import YandexAIClient, yandex_credentials_configured
+from src.adapters.ai_batching import MicroBatchingAIClient, batch_call_timeout
+from src.adapters.ai_cache import CachedAIClient
+from src.adapters.ai_http import HttpAIClient
+from src.adapters.ai_resilience import ResilientAIClient
+from src.adapters.ai_rules import RuleFirstAIClient
+from src.adapters.ai_stub import StubAIClient
+from src.core.config import settings
+from src.db.session import AsyncSessionLocal
 
+from src.services.complaint_import import ComplaintImportService
 from src.services.complaints import ComplaintService
+from src.services.executor_directory import ExecutorDirectoryService
+from src.services.idempotency import IdempotencyService
+
+logger = logging.getLogger(__name__)
+
+
+def create_llm_client() -> BatchAIClientProtocol:
+    """
+    Нижний клиент модели по settings.ai_backend. Без ключей YandexGPT режим
+    "local" не падает, а работает заглушкой: иначе не поднялись бы ни
+    эндпоинты заявок, ни воркер.
+    """
+    if settings.ai_backend == "service":
+        return HttpAIClient()
+    if settings.ai_backend == "stub":
+        return StubAIClient()
+    if not yandex_credentials_configured():
+        logger.warning(
+            "ai_backend=local, но YC_FOLDER_ID/YC_API_KEY не заданы — "
+            "работаем на заглушке StubAIClient"
+        )
+        return StubAIClient()
+    return YandexAIClient()
 
 
 class AppProvider(Provider):
@@ -39,9 +80,44 @@ class AppProvider(Provider):
     ticket_repo = provide(
         source=TicketStatusRepository, provides=TicketStatusRepositoryProtocol
     )
-    ai_adapter = provide(source=YandexAIClient, provides=AIClientProtocol)
+    job_repo = provide(
+        source=ExecutorUpdateJobRepository, provides=ExecutorUpdateJobRepositoryProtocol
+    )
+    idempotency_repo = provide(
+        source=IdempotencyKeyRepository, provides=IdempotencyKeyRepositoryProtocol
+    )
+    outbox_repo = provide(
+        source=OutboxRepository, provides=OutboxRepositoryProtocol
+    )
+
+    @provide
+    async def ai_adapter(self) -> AsyncIterable[AIClientProtocol]:
+        # Один асинхронный клиент с общим пулом соединений на весь процесс
+        llm_client = create_llm_client()
+        client: AIClientProtocol = llm_client
+        call_timeout = settings.ai_request_timeout
+        if settings.ai_batch_enabled:
+            client = MicroBatchingAIClient(llm_client)
+            # вызывающий ждёт всю пачку, а не одиночный ответ
+            call_timeout = batch_call_timeout(settings.ai_batch_max_size)
+        if settings.ai_resilience_enabled:
+            client = ResilientAIClient(client, call_timeout=call_timeout)
+        # решения заглушки не кэшируем: они вытеснили бы ответы модели
+        if settings.ai_cache_enabled and not isinstance(llm_client, StubAIClient):
+            client = CachedAIClient(client, session_factory=AsyncSessionLocal)
+        if settings.ai_rules_enabled:
+            client = RuleFirstAIClient(
+                client,
+                executor_repo=ExecutorRepository(),
+                session_factory=AsyncSessionLocal,
+            )
+        yield client
+        await llm_client.aclose()
 
     complaints_service = provide(ComplaintService)
+    idempotency_service = provide(IdempotencyService)
+    complaint_import_service = provide(ComplaintImportService)
+    executor_directory_service = provide(ExecutorDirectoryService)
 
 
 provider = AppProvider()
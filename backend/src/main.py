@@ -1,15 +1,28 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dishka.integrations.fastapi import setup_dishka
 
+from src.api.admin import router as admin_router
 from src.api.complaints import router as complaints_router
+from src.api.export import router as export_router
 from src.api.ws import router as ws_router
+from src.api.metrics import router as metrics_router
 from src.api.tickets_front import router as tickets_front_router
+from src.core.config import settings
 from src.di.container import container
-from src.db.session import engine
+from src.notifications.outbox import (
+    OutboxDispatcher,
+    start_outbox_dispatcher,
+    wake_outbox_dispatcher,
+)
+from src.notifications.publisher import publisher
+from src.protocols.repo import OutboxRepositoryProtocol
+from src.db.session import AsyncSessionLocal, engine, export_engine
 from src.db.base import Base
+from src.workers.executor_updates import ExecutorUpdateWorker, start_workers
 
 
 @asynccontextmanager
@@ -19,10 +32,36 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
     # можно тут же подгрузить справочники, категории, сервисы и т.п.
 
+    # рассылка /ws/notifications: свой хаб или NOTIFY для notifier
+    await publisher.start()
+
+    # воркеры очереди executor_update_jobs
+    stop_event = asyncio.Event()
+    workers = start_workers(
+        ExecutorUpdateWorker(container, session_factory=AsyncSessionLocal),
+        settings.executor_update_workers,
+        stop_event,
+    )
+    # рассылка событий из outbox_events через publisher
+    workers += start_outbox_dispatcher(
+        OutboxDispatcher(
+            await container.get(OutboxRepositoryProtocol),
+            publisher,
+            session_factory=AsyncSessionLocal,
+        ),
+        stop_event,
+    )
+
     yield
 
     # ✅ код остановки (опционально)
+    stop_event.set()
+    wake_outbox_dispatcher()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await publisher.stop()
+    await container.close()
     await engine.dispose()
+    await export_engine.dispose()
 
 
 app = FastAPI(
@@ -42,5 +81,10 @@ app.add_middleware(
 setup_dishka(container, app)
 
 app.include_router(complaints_router)
-app.include_router(ws_router)
+if settings.notifications_backend == "local":
+    # иначе /ws/notifications обслуживает notifier
+    app.include_router(ws_router)
 app.include_router(tickets_front_router)
+app.include_router(metrics_router)
+app.include_router(export_router)
+app.include_router(admin_router)
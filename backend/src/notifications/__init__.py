@@ -0,0 +1,3 @@
+"""
+Доставка уведомлений клиентам /ws/notifications.
+"""
@@ -0,0 +1,391 @@
+import asyncio
+import json
+import logging
+import re
+import uuid
+from collections import deque
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from src.core.config import settings
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 1013 Try Again Later — клиент не успевает читать, пусть переподключится
+_SLOW_CONSUMER_CLOSE_CODE = 1013
+# 1008 Policy Violation — некорректная подписка при подключении
+_BAD_SUBSCRIPTION_CLOSE_CODE = 1008
+_PING_FRAME = json.dumps({"type": "ping"})
+
+# ============================
+# Топики подписок
+# ============================
+
+# all — все события (поведение до появления подписок);
+# complaint:<id>, district:<название>, executor:<id>, type:<тип события> (type:block — все блокировки)
+TOPIC_ALL = "all"
+_TOPIC_RE = re.compile(r"all|complaint:\d+|executor:\d+|type:[a-z_]{1,50}|district:\S.{0,254}")
+
+
+def topic_kind(topic: str) -> str:
+    return topic.split(":", 1)[0]
+
+
+def validate_topics(topics: Iterable[str]) -> list[str]:
+    """
+    Проверяет и нормализует список топиков; ValueError на первом некорректном.
+    """
+    result = []
+    for topic in topics:
+        topic = str(topic).strip()
+        if not _TOPIC_RE.fullmatch(topic):
+            raise ValueError(f"Некорректный топик: {topic[:100]!r}")
+        result.append(topic)
+    return result
+
+
+def event_topics(message: dict) -> set[str]:
+    """
+    Топики, которым адресовано событие: по заявке (или заявкам массового
+    перехода), району, исполнителю и типу события, плюс all.
+    """
+    topics = {TOPIC_ALL}
+    complaint_ids = list(message.get("complaint_ids") or [])
+    if message.get("complaint_id") is not None:
+        complaint_ids.append(message["complaint_id"])
+    topics.update(f"complaint:{complaint_id}" for complaint_id in complaint_ids)
+    districts = list(message.get("districts") or [])
+    if message.get("district"):
+        districts.append(message["district"])
+    topics.update(f"district:{district}" for district in districts)
+    executor_ids = list(message.get("executor_ids") or [])
+    if message.get("executor_id") is not None:
+        executor_ids.append(message["executor_id"])
+    topics.update(f"executor:{executor_id}" for executor_id in executor_ids)
+    if message.get("type"):
+        topics.add(f"type:{message['type']}")
+    return topics
+
+
+class _BufferedEvent(NamedTuple):
+    seq: int
+    topics: frozenset[str]
+    frame: str
+
+
+class _Client:
+    def __init__(self, websocket: WebSocket, queue_size: int) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task | None = None
+        self.topics: set[str] = set()
+        # подключился без ?topics= и ещё ни на что не подписывался явно
+        self.implicit_all = False
+
+
+class NotificationHub:
+    """
+    Рассылка уведомлений по WebSocket.
+    publish() только кладёт событие во входящую очередь (O(1) для запроса);
+    диспетчер сериализует его один раз и раскладывает по очередям клиентов,
+    у каждого клиента свой писатель. Переполнил очередь или не принял кадр
+    за send_timeout — отключаем, остальные клиенты этого не замечают.
+
+    Клиент получает только события своих топиков: подписки задаются
+    при подключении (?topics=complaint:1,district:Центральный) и кадрами
+    {"action": "subscribe" | "unsubscribe", "topics": [...]}.
+    Без ?topics= клиент подписан на all, первая явная подписка это заменяет.
+    Для рассылки держим обратный индекс топик → клиенты.
+
+    Каждое событие получает монотонный seq; последние события лежат
+    в кольцевом буфере. При подключении клиент получает hello с epoch
+    и текущим seq, после обрыва переподключается с ?since=<seq>&epoch=<epoch>
+    (epoch можно не передавать — тогда считается текущим) и получает только
+    пропущенные события своих топиков. Если их уже нет в буфере (или клиент
+    передал другой epoch — хаб перезапускался), приходит reset
+    и клиент перечитывает данные целиком.
+    """
+
+    def __init__(
+        self,
+        client_queue_size: int = settings.ws_client_queue_size,
+        send_timeout: float = settings.ws_send_timeout,
+        heartbeat_seconds: float = settings.ws_heartbeat_seconds,
+        inbound_queue_size: int = settings.ws_inbound_queue_size,
+        max_topics_per_client: int = settings.ws_max_topics_per_client,
+        replay_buffer_size: int = settings.ws_replay_buffer_size,
+    ) -> None:
+        self._client_queue_size = client_queue_size
+        self._send_timeout = send_timeout
+        self._heartbeat_seconds = heartbeat_seconds
+        self._inbound: asyncio.Queue[dict] = asyncio.Queue(maxsize=inbound_queue_size)
+        self._max_topics = max_topics_per_client
+        self._clients: dict[WebSocket, _Client] = {}
+        self._subscribers: dict[str, set[_Client]] = {}
+        self._subscriptions_by_kind: dict[str, int] = {}
+        # seq уникален только в пределах epoch — после рестарта счёт начинается заново
+        self.epoch = uuid.uuid4().hex[:12]
+        self._seq = 0
+        self._buffer: deque[_BufferedEvent] = deque(maxlen=replay_buffer_size)
+        self._tasks: set[asyncio.Task] = set()
+
+    # ======== жизненный цикл ========
+
+    async def start(self) -> None:
+        self._spawn(self._dispatch_loop())
+        self._spawn(self._heartbeat_loop())
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for client in list(self._clients.values()):
+            await self._evict(client, code=1001, reason="server shutdown")
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    # ======== публикация ========
+
+    def publish(self, message: dict) -> None:
+        try:
+            self._inbound.put_nowait(message)
+        except asyncio.QueueFull:
+            # диспетчер не успевает — теряем событие, но не тормозим запрос
+            metrics.incr("notifications.dropped")
+            return
+        metrics.incr("notifications.published")
+
+    async def publish_confirmed(self, message: dict) -> None:
+        """
+        Как publish, но не теряет событие: ждёт места во входящей очереди.
+        Сколько ждать, решает вызывающий (asyncio.wait_for).
+        """
+        await self._inbound.put(message)
+        metrics.incr("notifications.published")
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            message = await self._inbound.get()
+            try:
+                self._route(message)
+            except Exception:
+                logger.exception("notifications: ошибка рассылки %s", message)
+
+    def _route(self, message: dict) -> None:
+        self._seq += 1
+        topics = event_topics(message)
+        # сериализуем один раз: и для рассылки, и для буфера повторов
+        frame = json.dumps({**message, "seq": self._seq}, ensure_ascii=False, default=str)
+        self._buffer.append(_BufferedEvent(self._seq, frozenset(topics), frame))
+        recipients: set[_Client] = set()
+        for topic in topics:
+            subscribers = self._subscribers.get(topic)
+            if not subscribers:
+                continue
+            # метрики по виду топика, а не по каждому id — иначе их число не ограничено
+            metrics.incr(f"notifications.topic.{topic_kind(topic)}.matched", len(subscribers))
+            recipients |= subscribers
+        if not recipients:
+            metrics.incr("notifications.unrouted")
+            return
+        self._fan_out(frame, recipients)
+
+    def _fan_out(self, frame: str, clients: Iterable[_Client]) -> None:
+        for client in list(clients):
+            self._enqueue(client, frame)
+
+    def _enqueue(self, client: _Client, frame: str) -> None:
+        try:
+            client.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            metrics.incr("notifications.evicted_slow")
+            self._spawn(
+                self._evict(client, code=_SLOW_CONSUMER_CLOSE_CODE, reason="slow consumer")
+            )
+
+    async def _heartbeat_loop(self) -> None:
+        # ping через ту же очередь: зависший клиент рано или поздно переполнит её
+        while True:
+            await asyncio.sleep(self._heartbeat_seconds)
+            self._fan_out(_PING_FRAME, self._clients.values())
+
+    # ======== подписки ========
+
+    def _subscribe(self, client: _Client, topics: Iterable[str]) -> None:
+        topics = set(topics)
+        if client.implicit_all:
+            # первая явная подписка заменяет подписку «на всё» по умолчанию
+            client.implicit_all = False
+            if TOPIC_ALL not in topics:
+                self._unsubscribe(client, [TOPIC_ALL])
+        new_topics = topics - client.topics
+        if len(client.topics) + len(new_topics) > self._max_topics:
+            raise ValueError(f"Не больше {self._max_topics} топиков на соединение")
+        for topic in new_topics:
+            self._subscribers.setdefault(topic, set()).add(client)
+            client.topics.add(topic)
+            self._count_subscription(topic, 1)
+
+    def _unsubscribe(self, client: _Client, topics: Iterable[str]) -> None:
+        for topic in set(topics) & client.topics:
+            client.topics.discard(topic)
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self._subscribers[topic]
+            self._count_subscription(topic, -1)
+
+    def _count_subscription(self, topic: str, delta: int) -> None:
+        kind = topic_kind(topic)
+        count = self._subscriptions_by_kind.get(kind, 0) + delta
+        self._subscriptions_by_kind[kind] = count
+        metrics.set(f"notifications.subscriptions.{kind}", count)
+
+    # ======== повтор пропущенных событий ========
+
+    def _replay(self, client: _Client, since: int | None, epoch: str | None) -> None:
+        """
+        Кладёт в очередь клиента hello и пропущенные события после since
+        (или reset, если восстановить их нельзя). Вызывается синхронно сразу
+        после регистрации клиента, поэтому новые события идут строго после повторённых.
+        """
+        hello = {"type": "hello", "epoch": self.epoch, "seq": self._seq}
+        if since is None:
+            self._enqueue(client, json.dumps(hello))
+            return
+        oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+        missed: list[str] = []
+        # since + 1 < oldest — часть событий уже вытеснена из буфера;
+        # без epoch считаем, что клиент говорит о текущем
+        can_replay = (
+            epoch in (None, self.epoch) and since <= self._seq and since + 1 >= oldest
+        )
+        if can_replay:
+            missed = [
+                event.frame
+                for event in self._buffer
+                if event.seq > since and not event.topics.isdisjoint(client.topics)
+            ]
+            # повтор не должен сам переполнить очередь клиента
+            can_replay = len(missed) < self._client_queue_size
+        if not can_replay:
+            metrics.incr("notifications.replay_resets")
+            self._enqueue(client, json.dumps({**hello, "type": "reset"}))
+            return
+        self._enqueue(client, json.dumps(hello))
+        for frame in missed:
+            self._enqueue(client, frame)
+        metrics.incr("notifications.replayed", len(missed))
+
+    def _handle_frame(self, client: _Client, raw: str) -> None:
+        try:
+            frame = json.loads(raw)
+        except ValueError:
+            # pong и прочие не-JSON кадры игнорируем
+            return
+        if not isinstance(frame, dict) or "action" not in frame:
+            return
+        action = frame["action"]
+        try:
+            if action not in ("subscribe", "unsubscribe"):
+                raise ValueError(f"Неизвестное действие: {str(action)[:50]!r}")
+            raw_topics = frame.get("topics")
+            if not isinstance(raw_topics, list):
+                raise TypeError("topics должен быть списком")
+            topics = validate_topics(raw_topics)
+            if action == "subscribe":
+                self._subscribe(client, topics)
+            else:
+                client.implicit_all = False
+                self._unsubscribe(client, topics)
+        except (TypeError, ValueError) as e:
+            reply = {"type": "error", "action": action, "detail": str(e)}
+        else:
+            reply = {"type": "subscribed", "topics": sorted(client.topics)}
+        self._enqueue(client, json.dumps(reply, ensure_ascii=False))
+
+    # ======== подключения ========
+
+    async def serve(self, websocket: WebSocket) -> None:
+        """
+        Полный цикл соединения: регистрация, чтение входящих кадров до отключения.
+        """
+        await websocket.accept()
+        raw_topics = websocket.query_params.get("topics")
+        raw_since = websocket.query_params.get("since")
+        epoch = websocket.query_params.get("epoch")
+        try:
+            since = int(raw_since) if raw_since is not None else None
+            if since is not None and since < 0:
+                raise ValueError("since должен быть неотрицательным")
+            initial_topics = validate_topics(
+                topic for topic in (raw_topics or "").split(",") if topic.strip()
+            )
+            if len(set(initial_topics)) > self._max_topics:
+                raise ValueError(f"Не больше {self._max_topics} топиков на соединение")
+        except ValueError as e:
+            await websocket.close(code=_BAD_SUBSCRIPTION_CLOSE_CODE, reason=str(e)[:120])
+            return
+        client = _Client(websocket, self._client_queue_size)
+        self._clients[websocket] = client
+        if raw_topics is None:
+            initial_topics = [TOPIC_ALL]
+        self._subscribe(client, initial_topics)
+        client.implicit_all = raw_topics is None
+        self._replay(client, since, epoch)
+        client.writer = self._spawn(self._writer(client))
+        metrics.set("notifications.clients", len(self._clients))
+        try:
+            while True:
+                self._handle_frame(client, await websocket.receive_text())
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            await self._evict(client)
+
+    async def _writer(self, client: _Client) -> None:
+        while True:
+            frame = await client.queue.get()
+            try:
+                await asyncio.wait_for(
+                    client.websocket.send_text(frame), timeout=self._send_timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                metrics.incr("notifications.evicted_errors")
+                self._spawn(self._evict(client, code=_SLOW_CONSUMER_CLOSE_CODE, reason="send failed"))
+                return
+            metrics.incr("notifications.sent")
+
+    async def _evict(
+        self, client: _Client, code: int | None = None, reason: str = ""
+    ) -> None:
+        if self._clients.pop(client.websocket, None) is None:
+            return
+        self._unsubscribe(client, list(client.topics))
+        metrics.set("notifications.clients", len(self._clients))
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        if code is not None:
+            try:
+                await asyncio.wait_for(
+                    client.websocket.close(code=code, reason=reason),
+                    timeout=self._send_timeout,
+                )
+            except Exception:
+                # клиент уже отвалился — закрыть нечего, но причину оставляем в логе
+                logger.debug(
+                    "notifications: не удалось закрыть соединение (%s)", reason, exc_info=True
+                )
+
+
+hub = NotificationHub()
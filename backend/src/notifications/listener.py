@@ -0,0 +1,89 @@
+import asyncio
+import json
+import logging
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.notifications.hub import NotificationHub
+
+logger = logging.getLogger(__name__)
+
+_RECONNECT_MIN_SECONDS = 1.0
+_RECONNECT_MAX_SECONDS = 30.0
+
+
+def _asyncpg_dsn() -> str:
+    # postgresql+asyncpg://… → postgresql://… для asyncpg.connect
+    url = make_url(str(settings.database_url)).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class PgNotificationListener:
+    """
+    Отдельное соединение с LISTEN на канал событий; каждое NOTIFY уходит в хаб.
+    При обрыве переподключается с экспоненциальной паузой.
+    События, пришедшие во время обрыва, теряются.
+    """
+
+    def __init__(
+        self,
+        notification_hub: NotificationHub,
+        channel: str = settings.notifications_channel,
+        dsn: str | None = None,
+    ) -> None:
+        self._hub = notification_hub
+        self._channel = channel
+        self._dsn = dsn or _asyncpg_dsn()
+        self._task: asyncio.Task | None = None
+        self.connected = False
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = _RECONNECT_MIN_SECONDS
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                # closed привязываем аргументом по умолчанию: лямбда переживает итерацию цикла
+                conn.add_termination_listener(lambda _conn, closed=closed: closed.set())
+                await conn.add_listener(self._channel, self._on_notify)
+                self._set_connected(True)
+                delay = _RECONNECT_MIN_SECONDS
+                logger.info("notifier: LISTEN %s", self._channel)
+                await closed.wait()
+                logger.warning("notifier: соединение LISTEN потеряно")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("notifier: не удалось подписаться на %s", self._channel)
+            finally:
+                self._set_connected(False)
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RECONNECT_MAX_SECONDS)
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.exception("notifier: некорректное событие %r", payload[:200])
+            return
+        metrics.incr("notifier.received")
+        self._hub.publish(message)
+
+    def _set_connected(self, connected: bool) -> None:
+        self.connected = connected
+        metrics.set("notifier.listening", int(connected))
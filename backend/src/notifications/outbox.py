@@ -0,0 +1,114 @@
+"""
+Диспетчер outbox_events: сервисы пишут события в ту же транзакцию, что и
+изменения заявок, а диспетчер рассылает их пачками через publisher
+(хаб этого процесса или NOTIFY для notifier) и отмечает разосланными.
+
+Доставка «хотя бы один раз»: строка отмечается разосланной только после
+того, как publisher подтвердил передачу (NOTIFY — в той же транзакции);
+если отметка не закоммитилась, событие уйдёт повторно — у каждого
+сообщения есть event_id для отсева дублей.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.db.session import unit_of_work
+from src.protocols.notifications import NotificationPublisherProtocol
+from src.protocols.repo import OutboxRepositoryProtocol
+
+logger = logging.getLogger(__name__)
+
+_CLEANUP_INTERVAL_SECONDS = 600.0
+_CLEANUP_BATCH = 5000
+
+# Сервис будит диспетчер своего процесса сразу после коммита,
+# чтобы не ждать очередного опроса
+_wakeup = asyncio.Event()
+
+
+def wake_outbox_dispatcher() -> None:
+    _wakeup.set()
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        outbox_repo: OutboxRepositoryProtocol,
+        publisher: NotificationPublisherProtocol,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = settings.outbox_batch_size,
+        poll_interval: float = settings.outbox_poll_interval,
+        retention_hours: float = settings.outbox_retention_hours,
+    ) -> None:
+        self._outbox_repo = outbox_repo
+        self._publisher = publisher
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._retention = timedelta(hours=retention_hours)
+        self._last_cleanup = 0.0
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        while not stop_event.is_set():
+            _wakeup.clear()
+            try:
+                sent = await self.run_once()
+            except Exception:
+                logger.exception("outbox: ошибка рассылки событий")
+                sent = 0
+            if sent >= self._batch_size:
+                # очередь не пуста — сразу берём следующую пачку
+                continue
+            await self._cleanup()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(_wakeup.wait(), timeout=self._poll_interval)
+
+    async def run_once(self) -> int:
+        async with self._session_factory() as session, unit_of_work(session):
+            events = await self._outbox_repo.claim_events(session, self._batch_size)
+            if not events:
+                return 0
+            # отметку ставим только после подтверждённой передачи: исключение
+            # откатывает транзакцию, и пачка уйдёт при следующей попытке
+            await self._publisher.publish_batch(
+                session,
+                [{**event.payload, "event_id": event.event_id} for event in events],
+            )
+            now = datetime.utcnow()
+            for event in events:
+                metrics.observe(
+                    "outbox.lag_seconds", (now - event.created_at).total_seconds()
+                )
+            await self._outbox_repo.mark_published(
+                session, [event.event_id for event in events]
+            )
+        metrics.incr("outbox.published", len(events))
+        return len(events)
+
+    async def _cleanup(self) -> None:
+        if time.monotonic() - self._last_cleanup < _CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = time.monotonic()
+        try:
+            async with self._session_factory() as session, unit_of_work(session):
+                deleted = await self._outbox_repo.delete_published(
+                    session, datetime.utcnow() - self._retention, _CLEANUP_BATCH
+                )
+        except Exception:
+            logger.exception("outbox: ошибка очистки разосланных событий")
+            return
+        metrics.incr("outbox.deleted", deleted)
+
+
+def start_outbox_dispatcher(
+    dispatcher: OutboxDispatcher, stop_event: asyncio.Event
+) -> list[asyncio.Task]:
+    if not settings.outbox_dispatcher_enabled:
+        return []
+    return [asyncio.create_task(dispatcher.run(stop_event), name="outbox-dispatcher")]
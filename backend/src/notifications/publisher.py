@@ -0,0 +1,88 @@
+import asyncio
+import json
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.notifications.hub import NotificationHub, hub
+from src.protocols.notifications import NotificationPublisherProtocol
+
+logger = logging.getLogger(__name__)
+
+# Лимит payload у NOTIFY — 8000 байт
+_MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+
+class LocalNotificationPublisher(NotificationPublisherProtocol):
+    """
+    Клиенты подключены к этому же процессу: отдаём события прямо в хаб,
+    дожидаясь места в его очереди.
+    """
+
+    def __init__(
+        self,
+        notification_hub: NotificationHub,
+        timeout: float = settings.outbox_publish_timeout,
+    ) -> None:
+        self._hub = notification_hub
+        self._timeout = timeout
+
+    async def start(self) -> None:
+        await self._hub.start()
+
+    async def stop(self) -> None:
+        await self._hub.stop()
+
+    async def publish_batch(self, session: AsyncSession, messages: list[dict]) -> None:
+        # хаб переполнен дольше timeout — TimeoutError, пачка останется в outbox;
+        # уже принятые события придут повторно, клиенты отсеют их по event_id
+        for message in messages:
+            await asyncio.wait_for(self._hub.publish_confirmed(message), self._timeout)
+
+
+class PgNotifyPublisher(NotificationPublisherProtocol):
+    """
+    События для notifier через Postgres NOTIFY. pg_notify выполняется
+    в транзакции диспетчера outbox: NOTIFY уходит ровно при коммите
+    отметки «разослано» и пропадает вместе с её откатом.
+    """
+
+    def __init__(self, channel: str = settings.notifications_channel) -> None:
+        self._channel = channel
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish_batch(self, session: AsyncSession, messages: list[dict]) -> None:
+        payloads = []
+        for message in messages:
+            payload = json.dumps(message, ensure_ascii=False, default=str)
+            if len(payload.encode("utf-8")) > _MAX_NOTIFY_PAYLOAD_BYTES:
+                # такое событие не пройдёт через NOTIFY ни с какой попытки —
+                # пропускаем, иначе оно навсегда застопорит outbox
+                metrics.incr("notifications.too_large")
+                logger.error("notifications: событие больше лимита NOTIFY: %s", payload[:200])
+                continue
+            payloads.append(payload)
+        if not payloads:
+            return
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            [{"channel": self._channel, "payload": payload} for payload in payloads],
+        )
+        metrics.incr("notifications.published", len(payloads))
+
+
+def create_publisher() -> NotificationPublisherProtocol:
+    if settings.notifications_backend == "postgres":
+        return PgNotifyPublisher()
+    return LocalNotificationPublisher(hub)
+
+
+publisher = create_publisher()
@@ -0,0 +1,49 @@
+"""
+notifier: отдельный процесс, который держит все подключения /ws/notifications.
+API-воркеры публикуют события через Postgres NOTIFY
+(settings.notifications_backend = "postgres"), notifier слушает канал
+и рассылает их клиентам; масштабируется независимо от API.
+
+    uv run uvicorn src.notifier.main:app --host 0.0.0.0 --port 8002
+"""
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, WebSocket
+
+from src.api.metrics import router as metrics_router
+from src.notifications.hub import hub
+from src.notifications.listener import PgNotificationListener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await hub.start()
+    listener = PgNotificationListener(hub)
+    await listener.start()
+    app.state.listener = listener
+
+    yield
+
+    await listener.stop()
+    await hub.stop()
+
+
+app = FastAPI(
+    title="Lobachevsky notifier",
+    lifespan=lifespan,
+)
+
+app.include_router(metrics_router)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "listening": app.state.listener.connected}
+
+
+# settings.websocket_notifier_url указывает на /ws; /ws/notifications —
+# тот же путь, что был у API, чтобы фронту хватило смены хоста
+@app.websocket("/ws")
+@app.websocket("/ws/notifications")
+async def websocket_endpoint(websocket: WebSocket):
+    await hub.serve(websocket)
@@ -1,5 +1,6 @@
-from typing import Protocol
+from typing import List, Protocol
 
+from src.schemas.ai_service import AnalyzeRequest
 from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
 
 
@@ -10,3 +11,19 @@ class AIClientProtocol(Protocol):
         complaint_description: str,
         update: ExecutorUpdateRequest,
     ) -> ExecutorUpdateResult: ...
+
+
+class AIUnavailableError(RuntimeError):
+    """Модель недоступна (breaker, перегрузка, ошибка вызова) — повторить позже."""
+
+
+class AIBatchSizeMismatch(RuntimeError):
+    """analyze_batch вернул не столько результатов, сколько было запросов."""
+
+
+class BatchAIClientProtocol(AIClientProtocol, Protocol):
+    # Результаты — по одному на запрос, в том же порядке;
+    # иначе реализация обязана поднять AIBatchSizeMismatch
+    async def analyze_batch(
+        self, items: List[AnalyzeRequest]
+    ) -> List[ExecutorUpdateResult]: ...
@@ -0,0 +1,17 @@
+from typing import Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class NotificationPublisherProtocol(Protocol):
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def publish_batch(self, session: AsyncSession, messages: list[dict]) -> None:
+        """
+        Передаёт пачку событий дальше в транзакции session диспетчера outbox.
+        Вернулся без исключения — события приняты; исключение — ни одно
+        не считается доставленным, строки outbox остаются неразосланными.
+        """
+        ...
@@ -1,8 +1,20 @@
 # app/adapters/repositories.py
 from datetime import datetime
-from typing import List, Optional, Protocol
+from typing import AsyncIterator, Dict, List, Optional, Protocol, Sequence, Tuple
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.db.models import Executor, Complaint, Moderator, TicketStatus
+
+from src.core.pagination import Keyset
+from src.schemas.complaint import ComplaintFilter
+from src.db.models import (
+    Executor,
+    Complaint,
+    Moderator,
+    TicketStatus,
+    ExecutorUpdateJob,
+    IdempotencyKey,
+    OutboxEvent,
+)
 
 
 class ExecutorRepositoryProtocol(Protocol):
@@ -23,6 +35,18 @@ class ExecutorRepositoryProtocol(Protocol):
         self, session: AsyncSession, name: str
     ) -> Optional[Executor]: ...
 
+    async def get_existing_executor_ids(
+        self, session: AsyncSession, executor_ids: Sequence[int]
+    ) -> set[int]: ...
+
+    async def upsert_executors(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> List[Tuple[int, bool]]: ...
+
+    async def deactivate_executors_except(
+        self, session: AsyncSession, normalized_names: Sequence[str]
+    ) -> List[int]: ...
+
     async def update_executor(
         self,
         session: AsyncSession,
@@ -49,14 +73,58 @@ class ComplaintRepositoryProtocol(Protocol):
         address: str,
     ) -> Complaint: ...
 
+    async def allocate_complaint_ids(
+        self, session: AsyncSession, count: int
+    ) -> List[int]: ...
+
+    async def copy_complaints(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> None: ...
+
     async def get_complaint(
-        self, session: AsyncSession, complaint_id: int
+        self, session: AsyncSession, complaint_id: int, for_update: bool = False
     ) -> Optional[Complaint]: ...
 
+    async def get_complaints(
+        self, session: AsyncSession, complaint_ids: Sequence[int]
+    ) -> List[Complaint]: ...
+
+    async def bulk_update_complaints(
+        self, session: AsyncSession, complaint_ids: Sequence[int], values: dict
+    ) -> List[Complaint]: ...
+
     async def list_complaints(
-        self, session: AsyncSession, limit: int = 50, offset: int = 0
+        self,
+        session: AsyncSession,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Keyset] = None,
+        filters: Optional[ComplaintFilter] = None,
     ) -> List[Complaint]: ...
 
+    async def search_complaints(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        filters: Optional[ComplaintFilter] = None,
+    ) -> List[Tuple[Complaint, float, str]]: ...
+
+    def stream_complaints(
+        self,
+        session: AsyncSession,
+        filters: Optional[ComplaintFilter] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]: ...
+
+    def stream_complaint_timelines(
+        self,
+        session: AsyncSession,
+        filters: Optional[ComplaintFilter] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]: ...
+
     async def update_complaint(
         self,
         session: AsyncSession,
@@ -65,7 +133,8 @@ class ComplaintRepositoryProtocol(Protocol):
         resolution: Optional[str],
         executor_id: Optional[int],
         address: Optional[str],
-    ) -> Complaint: ...
+        final_status_at: Optional[datetime] = None,
+    ) -> Optional[Complaint]: ...
 
     async def delete_complaint(
         self, session: AsyncSession, complaint_id: int
@@ -112,10 +181,26 @@ class TicketStatusRepositoryProtocol(Protocol):
         executor_id: Optional[int],
     ) -> TicketStatus: ...
 
+    async def create_ticket_statuses(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> None: ...
+
+    async def copy_ticket_statuses(
+        self, session: AsyncSession, rows: Sequence[dict]
+    ) -> None: ...
+
     async def get_ticket_status(
         self, session: AsyncSession, complaint_id: int,
     ) -> List[TicketStatus]: ...
 
+    async def has_executor_status(
+        self, session: AsyncSession, complaint_id: int, executor_id: Optional[int],
+    ) -> bool: ...
+
+    async def get_ticket_statuses(
+        self, session: AsyncSession, complaint_ids: Sequence[int],
+    ) -> Dict[int, List[TicketStatus]]: ...
+
     async def update_ticket_status(
         self,
         session: AsyncSession,
@@ -129,3 +214,76 @@ class TicketStatusRepositoryProtocol(Protocol):
     async def delete_ticket_status(
         self, session: AsyncSession, complaint_id: int, status_code: str, data: datetime
     ) -> None: ...
+
+
+class ExecutorUpdateJobRepositoryProtocol(Protocol):
+    async def enqueue_job(
+        self,
+        session: AsyncSession,
+        complaint_id: int,
+        payload: dict,
+        max_attempts: int,
+    ) -> ExecutorUpdateJob: ...
+
+    async def get_job(
+        self, session: AsyncSession, job_id: int
+    ) -> Optional[ExecutorUpdateJob]: ...
+
+    async def claim_jobs(
+        self, session: AsyncSession, limit: int, lease_seconds: float
+    ) -> List[ExecutorUpdateJob]: ...
+
+    async def fail_exhausted_jobs(self, session: AsyncSession) -> int: ...
+
+    async def complete_job(self, session: AsyncSession, job_id: int) -> None: ...
+
+    async def fail_job(
+        self,
+        session: AsyncSession,
+        job_id: int,
+        error: str,
+        retry_at: Optional[datetime],
+    ) -> None: ...
+
+
+class IdempotencyKeyRepositoryProtocol(Protocol):
+    async def get_key(
+        self, session: AsyncSession, scope: str, key: str
+    ) -> Optional[IdempotencyKey]: ...
+
+    async def claim_key(
+        self, session: AsyncSession, scope: str, key: str, request_hash: str
+    ) -> bool: ...
+
+    async def takeover_key(
+        self, session: AsyncSession, scope: str, key: str, locked_before: datetime
+    ) -> bool: ...
+
+    async def save_response(
+        self,
+        session: AsyncSession,
+        scope: str,
+        key: str,
+        status_code: int,
+        response: dict,
+    ) -> None: ...
+
+    async def delete_key(self, session: AsyncSession, scope: str, key: str) -> None: ...
+
+
+class OutboxRepositoryProtocol(Protocol):
+    async def add_event(
+        self, session: AsyncSession, event_type: str, payload: dict
+    ) -> None: ...
+
+    async def claim_events(
+        self, session: AsyncSession, limit: int
+    ) -> List[OutboxEvent]: ...
+
+    async def mark_published(
+        self, session: AsyncSession, event_ids: Sequence[int]
+    ) -> None: ...
+
+    async def delete_published(
+        self, session: AsyncSession, published_before: datetime, limit: int
+    ) -> int: ...
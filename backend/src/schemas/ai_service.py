@@ -0,0 +1,18 @@
+
+from pydantic import BaseModel, Field
+
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+
+class AnalyzeRequest(BaseModel):
+    complaint_description: str
+    update: ExecutorUpdateRequest
+
+
+class AnalyzeBatchRequest(BaseModel):
+    items: list[AnalyzeRequest] = Field(min_length=1, max_length=100)
+
+
+class AnalyzeBatchResponse(BaseModel):
+    # в том же порядке, что и items запроса
+    results: list[ExecutorUpdateResult]
@@ -0,0 +1,58 @@
+# app/schemas/bulk.py
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.schemas.complaint import ComplaintCreate, NaiveUTCDatetime
+
+# ============================
+# Импорт исторических жалоб
+# ============================
+
+
+# Одна строка CSV/JSONL: те же поля, что при создании жалобы,
+# плюс исторические даты (время со смещением приводится к UTC) и резолюция
+class ComplaintImportRow(ComplaintCreate):
+    district: str | None = Field(None, max_length=255)
+    address: str = Field("", max_length=100)
+    resolution: str | None = None
+    created_at: NaiveUTCDatetime | None = None
+    execution_date: NaiveUTCDatetime | None = None
+    final_status_at: NaiveUTCDatetime | None = None
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = []
+    # ошибок больше, чем помещается в отчёт
+    errors_truncated: bool = False
+
+
+# ============================
+# Синхронизация справочника исполнителей
+# ============================
+
+
+class ExecutorSyncItem(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    name: str = Field(..., min_length=1, max_length=255)
+    organization: str | None = Field(None, max_length=255)
+    phone: str | None = Field(None, max_length=50)
+    email: str | None = Field(None, max_length=255)
+
+
+class ExecutorSyncReport(BaseModel):
+    total: int
+    created: list[int] = []
+    updated: list[int] = []
+    unchanged: int = 0
+    deactivated: list[int] = []
+    # повторы одного имени в файле (после нормализации) — взята последняя запись
+    duplicates: list[str] = []
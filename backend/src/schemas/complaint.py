@@ -1,10 +1,24 @@
 # app/schemas/complaint.py
-from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from datetime import UTC, datetime
+from typing import Annotated, List, Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
 from enum import StrEnum
 
 
+def to_naive_utc(value: datetime) -> datetime:
+    """
+    В БД TIMESTAMP WITHOUT TIME ZONE в UTC: время со смещением
+    (2025-01-01T03:00:00+03:00) приводим к UTC и убираем tzinfo —
+    asyncpg не кодирует aware datetime в TIMESTAMP.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+NaiveUTCDatetime = Annotated[datetime, AfterValidator(to_naive_utc)]
+
+
 class ComplaintStatus(StrEnum):
     NEW = "new"
     ASSIGNED_RESPONSIBLE = "assigned_responsible"
@@ -30,8 +44,18 @@ class ComplaintUpdate(BaseModel):
     address: Optional[str] = None
 
 
-# Для чтения жалобы (детали)
+# Массовый переход: одни и те же изменения для набора жалоб
+class ComplaintBulkTransition(BaseModel):
+    complaint_ids: List[int] = Field(..., min_length=1)
+    status: Optional[ComplaintStatus] = None
+    resolution: Optional[str] = None
+    executor_id: Optional[int] = None
+
+
+# Для чтения жалобы (детали); неизменяемый снимок, не привязанный к сессии
 class ComplaintRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     complaint_id: int
     description: str
     district: Optional[str]
@@ -54,6 +78,16 @@ class ComplaintList(BaseModel):
     created_at: datetime
 
 
+# Фильтры списка жалоб (любая комбинация, все условия через AND)
+class ComplaintFilter(BaseModel):
+    status: Optional[ComplaintStatus] = None
+    district: Optional[str] = None
+    executor_id: Optional[int] = None
+    created_from: Optional[NaiveUTCDatetime] = None  # created_at >= created_from
+    created_to: Optional[NaiveUTCDatetime] = None  # created_at < created_to
+    open_only: bool = False  # только незакрытые: final_status_at IS NULL
+
+
 # ============================
 # Moderator Pydantic Schemas
 # ============================
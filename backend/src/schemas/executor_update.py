@@ -25,3 +25,6 @@ class ExecutorUpdateResult(BaseModel):
     target_executor_name: Optional[str] = None
     moderator_message: Optional[str] = None
     ai_badge: Optional[str] = None
+    # Уверенность решения (0..1) и путь, которым оно получено: "rule" | "llm" | "cache"
+    confidence: Optional[float] = None
+    source: Optional[str] = None
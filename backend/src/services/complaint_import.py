@@ -0,0 +1,258 @@
+# app/services/complaint_import.py
+import codecs
+import csv
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.repo import (
+    ComplaintRepositoryProtocol,
+    ExecutorRepositoryProtocol,
+    TicketStatusRepositoryProtocol,
+)
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.db.session import unit_of_work
+from src.schemas.bulk import ComplaintImportRow, ImportReport, ImportRowError
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "jsonl"]
+
+
+# ============================
+# Разбор входного потока
+# ============================
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Байтовые куски (тело запроса, файл) → строки без перевода строки.
+    UTF-8, BOM в начале файла отбрасывается.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        tail += decoder.decode(chunk)
+        *lines, tail = tail.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+async def iter_records(
+    lines: AsyncIterator[str], format: ImportFormat
+) -> AsyncIterator[tuple[int, Any]]:
+    """
+    (номер строки, dict) для каждой записи; при ошибке разбора вместо dict —
+    строка с описанием ошибки. Пустые строки пропускаются.
+    """
+    if format == "jsonl":
+        line_no = 0
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "JSON object expected"
+                continue
+            yield line_no, record
+        return
+
+    # CSV: первая строка — заголовок; поле в кавычках может содержать перевод
+    # строки, поэтому копим физические строки, пока кавычки не сбалансированы
+    header: list[str] | None = None
+    line_no = 0
+    record_start = 0
+    pending: list[str] = []
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            record_start = line_no
+        pending.append(line)
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+        text, pending = "\n".join(pending), []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_start, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        # пустая ячейка = поле не задано (сработает значение по умолчанию)
+        yield record_start, {
+            name: value for name, value in zip(header, values, strict=True) if value != ""
+        }
+    if pending:
+        yield record_start, "unterminated quoted field"
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+# ============================
+# Импорт
+# ============================
+
+
+class ComplaintImportService:
+    """
+    Массовая загрузка исторических жалоб: строки валидируются схемой
+    ComplaintImportRow, валидные пачками грузятся через COPY вместе
+    с начальным статусом. Ошибочные строки (и строки, отвергнутые базой)
+    попадают в отчёт, импорт идёт дальше.
+    """
+
+    def __init__(
+        self,
+        complaint_repo: ComplaintRepositoryProtocol,
+        ticket_status_repo: TicketStatusRepositoryProtocol,
+        executor_repo: ExecutorRepositoryProtocol,
+    ):
+        self._complaint_repo = complaint_repo
+        self._ticket_status_repo = ticket_status_repo
+        self._executor_repo = executor_repo
+
+    async def import_complaints(
+        self,
+        session: AsyncSession,
+        chunks: AsyncIterator[bytes],
+        format: ImportFormat,
+        batch_size: int = settings.import_batch_size,
+    ) -> ImportReport:
+        report = ImportReport()
+        batch: list[tuple[int, ComplaintImportRow]] = []
+
+        async for line_no, record in iter_records(iter_lines(chunks), format):
+            report.total += 1
+            if isinstance(record, str):
+                self._add_error(report, line_no, record)
+                continue
+            try:
+                batch.append((line_no, ComplaintImportRow.model_validate(record)))
+            except ValidationError as e:
+                self._add_error(report, line_no, _format_validation_error(e))
+                continue
+            if len(batch) >= batch_size:
+                await self._load_batch(session, batch, report)
+                batch = []
+
+        if batch:
+            await self._load_batch(session, batch, report)
+
+        metrics.incr("complaint_import.imported", report.imported)
+        metrics.incr("complaint_import.failed", report.failed)
+        return report
+
+    async def _load_batch(
+        self,
+        session: AsyncSession,
+        batch: list[tuple[int, ComplaintImportRow]],
+        report: ImportReport,
+    ) -> None:
+        """
+        Одна пачка — одна транзакция. Если COPY пачки упал (одна плохая строка
+        валит весь COPY), пачка перезагружается построчно: в отчёт попадают
+        только строки, которые не загрузились и поодиночке.
+        """
+        rejected: list[tuple[int, str]] = []
+        rows: list[ComplaintImportRow] = []
+        try:
+            async with unit_of_work(session):
+                known_executors = await self._executor_repo.get_existing_executor_ids(
+                    session,
+                    list({row.executor_id for _, row in batch if row.executor_id is not None}),
+                )
+                for line_no, row in batch:
+                    if row.executor_id is not None and row.executor_id not in known_executors:
+                        rejected.append(
+                            (line_no, f"executor_id: executor {row.executor_id} not found")
+                        )
+                    else:
+                        rows.append(row)
+                if rows:
+                    await self._copy_rows(session, rows)
+        except Exception as e:
+            if len(batch) > 1:
+                logger.exception(
+                    "complaint import: пачка из %d строк не загружена, грузим построчно",
+                    len(batch),
+                )
+                metrics.incr("complaint_import.batch_retries")
+                for item in batch:
+                    await self._load_batch(session, [item], report)
+                return
+            line_no, _ = batch[0]
+            logger.warning("complaint import: строка %d не загружена: %r", line_no, e)
+            self._add_error(report, line_no, f"insert failed: {e}")
+            return
+
+        for line_no, error in rejected:
+            self._add_error(report, line_no, error)
+        report.imported += len(rows)
+
+    async def _copy_rows(
+        self, session: AsyncSession, rows: list[ComplaintImportRow]
+    ) -> None:
+        complaint_ids = await self._complaint_repo.allocate_complaint_ids(
+            session, len(rows)
+        )
+        now = datetime.utcnow()
+        complaints = []
+        statuses = []
+        for complaint_id, row in zip(complaint_ids, rows, strict=True):
+            created_at = row.created_at or now
+            complaints.append(
+                {
+                    "complaint_id": complaint_id,
+                    "created_at": created_at,
+                    "execution_date": row.execution_date,
+                    "final_status_at": row.final_status_at,
+                    "status": row.status.value,
+                    "address": row.address,
+                    "executor_id": row.executor_id,
+                    "district": row.district,
+                    "description": row.description,
+                    "resolution": row.resolution,
+                }
+            )
+            # начальный статус, как при create_complaint
+            statuses.append(
+                {
+                    "status_code": row.status.value,
+                    "complaint_id": complaint_id,
+                    "data": created_at,
+                    "executor_id": row.executor_id,
+                    "sort_order": 1,
+                    "description": "Заявка импортирована",
+                }
+            )
+        await self._complaint_repo.copy_complaints(session, complaints)
+        await self._ticket_status_repo.copy_ticket_statuses(session, statuses)
+
+    @staticmethod
+    def _add_error(report: ImportReport, line_no: int, error: str) -> None:
+        report.failed += 1
+        if len(report.errors) < settings.import_max_errors:
+            report.errors.append(ImportRowError(line=line_no, error=error))
+        else:
+            report.errors_truncated = True
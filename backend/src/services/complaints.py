@@ -1,18 +1,28 @@
 # app/services/complaints.py
+import hashlib
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
+from sqlalchemy import RowMapping
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.adapters.repo import (
     ComplaintRepositoryProtocol,
+    ExecutorUpdateJobRepositoryProtocol,
     ExecutorRepositoryProtocol,
     ModeratorRepositoryProtocol,
+    OutboxRepositoryProtocol,
     TicketStatusRepositoryProtocol,
 )
-from src.adapters.ai import AIClientProtocol
-from src.api.ws import send_notification_to_clients
-from src.schemas.complaint import ComplaintStatus
+from src.protocols.ai import AIClientProtocol
+from src.core.config import settings
+from src.core.pagination import decode_cursor, encode_cursor
+from src.core.singleflight import SingleFlight
+from src.db.models import Complaint
+from src.db.session import unit_of_work
+from src.notifications.outbox import wake_outbox_dispatcher
+from src.schemas.complaint import ComplaintFilter, ComplaintRead, ComplaintStatus
 from src.schemas.executor_update import ExecutorUpdateRequest
 
 
@@ -24,12 +34,20 @@ class ComplaintService:
         moderator_repo: ModeratorRepositoryProtocol,
         ticket_status_repo: TicketStatusRepositoryProtocol,
         ai_client: AIClientProtocol,
+        job_repo: ExecutorUpdateJobRepositoryProtocol,
+        outbox_repo: OutboxRepositoryProtocol,
     ):
         self._complaint_repo = complaint_repo
         self._executor_repo = executor_repo
         self._moderator_repo = moderator_repo
         self._ticket_status_repo = ticket_status_repo
         self._ai_client = ai_client
+        self._job_repo = job_repo
+        self._outbox_repo = outbox_repo
+        # Повторы одного и того же запроса, пока первый ещё выполняется,
+        # ждут его результат вместо второго вызова ИИ / второго SELECT
+        self._ai_calls = SingleFlight("ai_analysis")
+        self._complaint_reads = SingleFlight("complaint_read")
 
     # ============================
     # CRUD для Complaint
@@ -44,37 +62,114 @@ class ComplaintService:
         executor_id: Optional[int] = None,
         address: str = "",
     ):
-        complaint = await self._complaint_repo.create_complaint(
-            session,
-            description=description,
-            district=district,
-            status=status.value,  # Преобразуем статус в строку
-            executor_id=executor_id,
-            address=address,
-        )
-        # Создаем начальный статус для заявки
-        await self._ticket_status_repo.create_ticket_status(
-            session,
-            complaint_id=complaint.complaint_id,
-            status_code=status.value,
-            sort_order=1,
-            description="Заявка создана",
-            executor_id=executor_id,
-        )
+        # Заявка и её начальный статус — одна транзакция
+        async with unit_of_work(session):
+            complaint = await self._complaint_repo.create_complaint(
+                session,
+                description=description,
+                district=district,
+                status=status.value,  # Преобразуем статус в строку
+                executor_id=executor_id,
+                address=address,
+            )
+            # Создаем начальный статус для заявки
+            await self._ticket_status_repo.create_ticket_status(
+                session,
+                complaint_id=complaint.complaint_id,
+                status_code=status.value,
+                sort_order=1,
+                description="Заявка создана",
+                executor_id=executor_id,
+            )
 
-        await session.commit()
-        await session.refresh(complaint)
+        # complaint_id вернул INSERT … RETURNING, created_at задан на стороне Python —
+        # перечитывать строку после коммита не нужно
         return complaint
 
-    async def get_complaint(self, session: AsyncSession, complaint_id: int):
-        return await self._complaint_repo.get_complaint(session, complaint_id)
+    async def get_complaint(
+        self, session: AsyncSession, complaint_id: int
+    ) -> Optional[ComplaintRead]:
+        # Результат схлопнутого чтения получают все одновременные вызывающие,
+        # поэтому отдаём снимок, а не ORM-объект из сессии первого из них
+        return await self._complaint_reads.do(
+            complaint_id,
+            lambda: self._read_complaint(session, complaint_id),
+        )
+
+    async def _read_complaint(
+        self, session: AsyncSession, complaint_id: int
+    ) -> Optional[ComplaintRead]:
+        complaint = await self._complaint_repo.get_complaint(session, complaint_id)
+        if complaint is None:
+            return None
+        return ComplaintRead.model_validate(complaint)
 
     async def list_complaints(
-        self, session: AsyncSession, limit: int = 50, offset: int = 0
+        self,
+        session: AsyncSession,
+        limit: int = 50,
+        offset: int = 0,
+        filters: Optional[ComplaintFilter] = None,
     ):
         return await self._complaint_repo.list_complaints(
-            session, limit=limit, offset=offset
+            session, limit=limit, offset=offset, filters=filters
+        )
+
+    async def list_complaints_page(
+        self,
+        session: AsyncSession,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        filters: Optional[ComplaintFilter] = None,
+    ) -> Tuple[List[Complaint], Optional[str]]:
+        """
+        Страница заявок по keyset-курсору (новые сверху) с необязательными фильтрами.
+        Возвращает (заявки, курсор следующей страницы или None, если это последняя).
+        Курсор действителен только с теми же фильтрами. Некорректный курсор — InvalidCursorError.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # берём на одну строку больше, чтобы узнать, есть ли следующая страница
+        complaints = await self._complaint_repo.list_complaints(
+            session, limit=limit + 1, after=after, filters=filters
+        )
+        if len(complaints) <= limit:
+            return complaints, None
+        complaints = complaints[:limit]
+        last = complaints[-1]
+        return complaints, encode_cursor(last.created_at, last.complaint_id)
+
+    async def search_complaints(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        filters: Optional[ComplaintFilter] = None,
+    ) -> List[Tuple[Complaint, float, str]]:
+        """
+        Полнотекстовый поиск (websearch-синтаксис: слова, "фраза", -исключение).
+        Возвращает (заявка, ранг, сниппет с подсветкой) по убыванию ранга.
+        """
+        return await self._complaint_repo.search_complaints(
+            session, query=query, limit=limit, offset=offset, filters=filters
+        )
+
+    def stream_complaints(
+        self,
+        session: AsyncSession,
+        filters: Optional[ComplaintFilter] = None,
+        with_timelines: bool = False,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Порции строк для выгрузки: заявки или заявки × статусы (по complaint_id).
+        Сессия должна жить, пока итератор не дочитан.
+        """
+        stream = (
+            self._complaint_repo.stream_complaint_timelines
+            if with_timelines
+            else self._complaint_repo.stream_complaints
         )
+        return stream(session, filters=filters, yield_per=settings.export_yield_per)
 
     async def update_complaint(
         self,
@@ -85,39 +180,112 @@ class ComplaintService:
         executor_id: Optional[int] = None,
         address: Optional[str] = None,
     ):
-        complaint = await self._complaint_repo.get_complaint(session, complaint_id)
-        if complaint is None:
-            return None
+        # Смена статуса = UPDATE … RETURNING + INSERT в хронологию, без SELECT до и после
+        async with unit_of_work(session):
+            complaint = await self._complaint_repo.update_complaint(
+                session,
+                complaint_id,
+                status=status.value if status is not None else None,
+                resolution=resolution,
+                executor_id=executor_id,
+                address=address,
+            )
+            if complaint is None:
+                return None
+
+            if status is not None:
+                # Обновляем статус в TicketStatus
+                await self._ticket_status_repo.create_ticket_status(
+                    session,
+                    complaint_id=complaint_id,
+                    status_code=status.value,
+                    sort_order=2,  # следующий статус
+                    description=resolution if resolution else "Обновлено",
+                    executor_id=complaint.executor_id,
+                )
+
+        return complaint
 
-        # Обновляем поля
+    async def get_complaints(
+        self, session: AsyncSession, complaint_ids: List[int]
+    ) -> List[Complaint]:
+        """
+        Несколько заявок одним запросом, в порядке complaint_ids; отсутствующие пропускаются.
+        """
+        complaints = {
+            complaint.complaint_id: complaint
+            for complaint in await self._complaint_repo.get_complaints(session, complaint_ids)
+        }
+        return [complaints[cid] for cid in complaint_ids if cid in complaints]
+
+    async def bulk_transition(
+        self,
+        session: AsyncSession,
+        complaint_ids: List[int],
+        status: Optional[ComplaintStatus] = None,
+        resolution: Optional[str] = None,
+        executor_id: Optional[int] = None,
+    ) -> List[Complaint]:
+        """
+        Одинаковые изменения для набора заявок: один UPDATE … RETURNING,
+        при смене статуса — один многострочный INSERT в ticket_statuses
+        и одно общее событие в outbox в той же транзакции. Возвращает обновлённые заявки.
+        """
+        values = {}
         if status is not None:
-            complaint.status = status.value
+            values["status"] = status.value
         if resolution is not None:
-            complaint.resolution = resolution
+            values["resolution"] = resolution
         if executor_id is not None:
-            complaint.executor_id = executor_id
-        if address is not None:
-            complaint.address = address
-
-        await self._complaint_repo.update_complaint(session, complaint)
-        await session.commit()
-        await session.refresh(complaint)
+            values["executor_id"] = executor_id
+        if not values:
+            raise ValueError("Nothing to update")
 
-        if status is not None:
-            # Обновляем статус в TicketStatus
-            await self._ticket_status_repo.create_ticket_status(
-                session,
-                complaint_id=complaint_id,
-                status_code=status.value if status else complaint.status,
-                sort_order=2,  # следующий статус
-                description=resolution if resolution else "Обновлено",
-                executor_id=executor_id,
+        async with unit_of_work(session):
+            complaints = await self._complaint_repo.bulk_update_complaints(
+                session, complaint_ids, values
             )
+            if status is not None and complaints:
+                now = datetime.utcnow()
+                await self._ticket_status_repo.create_ticket_statuses(
+                    session,
+                    [
+                        {
+                            "complaint_id": complaint.complaint_id,
+                            "status_code": status.value,
+                            "data": now,
+                            "sort_order": 2,  # следующий статус
+                            "description": resolution if resolution else "Обновлено",
+                            "executor_id": complaint.executor_id,
+                        }
+                        for complaint in complaints
+                    ],
+                )
+            if complaints:
+                await self._outbox_repo.add_event(
+                    session,
+                    "bulk_transition",
+                    {
+                        "complaint_ids": [complaint.complaint_id for complaint in complaints],
+                        "districts": sorted(
+                            {complaint.district for complaint in complaints if complaint.district}
+                        ),
+                        "executor_ids": sorted(
+                            {complaint.executor_id for complaint in complaints if complaint.executor_id}
+                        ),
+                        "type": "bulk_transition",
+                        "status": status.value if status is not None else None,
+                        "description": f"Массово обновлено заявок: {len(complaints)}",
+                    },
+                )
 
-        return complaint
+        if complaints:
+            wake_outbox_dispatcher()
+        return complaints
 
     async def delete_complaint(self, session: AsyncSession, complaint_id: int):
-        await self._complaint_repo.delete_complaint(session, complaint_id)
+        async with unit_of_work(session):
+            await self._complaint_repo.delete_complaint(session, complaint_id)
 
     # ============================
     # CRUD для Executor
@@ -131,9 +299,10 @@ class ComplaintService:
         phone: Optional[str],
         email: Optional[str],
     ):
-        return await self._executor_repo.create_executor(
-            session, name, organization, phone, email
-        )
+        async with unit_of_work(session):
+            return await self._executor_repo.create_executor(
+                session, name, organization, phone, email
+            )
 
     async def get_executor(self, session: AsyncSession, executor_id: int):
         return await self._executor_repo.get_executor(session, executor_id)
@@ -155,12 +324,14 @@ class ComplaintService:
         phone: Optional[str],
         email: Optional[str],
     ):
-        return await self._executor_repo.update_executor(
-            session, executor_id, name, organization, phone, email
-        )
+        async with unit_of_work(session):
+            return await self._executor_repo.update_executor(
+                session, executor_id, name, organization, phone, email
+            )
 
     async def delete_executor(self, session: AsyncSession, executor_id: int):
-        await self._executor_repo.delete_executor(session, executor_id)
+        async with unit_of_work(session):
+            await self._executor_repo.delete_executor(session, executor_id)
 
     # ============================
     # CRUD для Moderator
@@ -174,9 +345,10 @@ class ComplaintService:
         email: Optional[str],
         phone: Optional[str],
     ):
-        return await self._moderator_repo.create_moderator(
-            session, username, full_name, email, phone
-        )
+        async with unit_of_work(session):
+            return await self._moderator_repo.create_moderator(
+                session, username, full_name, email, phone
+            )
 
     async def get_moderator(self, session: AsyncSession, moderator_id: int):
         return await self._moderator_repo.get_moderator(session, moderator_id)
@@ -190,12 +362,14 @@ class ComplaintService:
         email: Optional[str],
         phone: Optional[str],
     ):
-        return await self._moderator_repo.update_moderator(
-            session, moderator_id, username, full_name, email, phone
-        )
+        async with unit_of_work(session):
+            return await self._moderator_repo.update_moderator(
+                session, moderator_id, username, full_name, email, phone
+            )
 
     async def delete_moderator(self, session: AsyncSession, moderator_id: int):
-        await self._moderator_repo.delete_moderator(session, moderator_id)
+        async with unit_of_work(session):
+            await self._moderator_repo.delete_moderator(session, moderator_id)
 
     # ============================
     # Обработка запроса от Executor
@@ -207,174 +381,146 @@ class ComplaintService:
             complaint_id: int,
             update: ExecutorUpdateRequest,
     ):
+        # Фаза 1: читаем заявку и сразу отдаём соединение обратно в пул,
+        # чтобы оно не простаивало всё время, пока думает ИИ
         complaint = await self._complaint_repo.get_complaint(session, complaint_id)
         if complaint is None:
             return None
-
-        # Запускаем анализ с помощью ИИ
-        ai_result = await self._ai_client.analyze_executor_response(
-            complaint_description=complaint.description,
-            update=update,
+        complaint_description = complaint.description
+        await session.rollback()
+
+        # Запускаем анализ с помощью ИИ (соединение с БД не удерживается).
+        # Модель недоступна — AIUnavailableError: заявка остаётся как есть,
+        # воркер повторит задание с backoff, API ответит 503
+        response_hash = hashlib.sha256(update.response_text.encode("utf-8")).hexdigest()
+        ai_result = await self._ai_calls.do(
+            (complaint_id, response_hash),
+            lambda: self._ai_client.analyze_executor_response(
+                complaint_description=complaint_description,
+                update=update,
+            ),
         )
+        # Фаза 2: короткая транзакция — выбираем переход и применяем его одним
+        # UPDATE … RETURNING (заявку могли удалить, пока шёл анализ — тогда None)
+        # и одним INSERT в хронологию
+        new_status = ComplaintStatus.MODERATED
+        new_executor_id = None
+        final_status_at = None
+        notification_message = None
+        async with unit_of_work(session):
+            # Логика перенаправления заявки или закрытия
+            if ai_result.is_forward and ai_result.target_executor_name:
+                # Перенаправляем заявку другому исполнителю
+                target_executor = await self._executor_repo.get_executor_by_name(
+                    session, ai_result.target_executor_name
+                )
+                if target_executor:
+                    new_executor_id = target_executor.executor_id  # Изменяем только executor_id
 
-        ticket_statuses = await self._ticket_status_repo.get_ticket_status(session, complaint_id)
-
-        # Логика перенаправления заявки или закрытия
-        if ai_result.is_forward and ai_result.target_executor_name:
-            # Перенаправляем заявку другому исполнителю
-            ex_id = await self._executor_repo.get_executor_by_name(
-                session, ai_result.target_executor_name
-            )
-            if ex_id:
-                complaint.executor_id = ex_id.executor_id  # Изменяем только executor_id
-
-                flag = False
-                for status in ticket_statuses:
-                    if status.executor_id == update.executor_id:
-                        flag = True
-
-                if flag:
-                    complaint.status = ComplaintStatus.BLOCK_WORKFLOW.value
-                    complaint.final_status_at = datetime.utcnow()
-
-                    await self._complaint_repo.update_complaint(
-                        session,
-                        complaint.complaint_id,  # Не изменяем complaint_id
-                        complaint.status,
-                        update.response_text,
-                        complaint.executor_id,
-                        complaint.address,
-                    )
-
-                    await self._ticket_status_repo.create_ticket_status(
-                        session,
-                        complaint_id=complaint.complaint_id,
-                        status_code=ComplaintStatus.BLOCK_WORKFLOW.value,
-                        sort_order=2,  # следующий статус
-                        description=update.response_text,
-                        executor_id=complaint.executor_id,
+                    # исполнитель уже был в хронологии заявки — заявка ходит по кругу
+                    flag = await self._ticket_status_repo.has_executor_status(
+                        session, complaint_id, update.executor_id
                     )
 
-                    notification_message = {
-                        "complaint_id": complaint.complaint_id,
-                        "type": "block",
-                        "description": "Произошла блокировка",
-                    }
-                    await send_notification_to_clients(notification_message)
+                    if flag:
+                        new_status = ComplaintStatus.BLOCK_WORKFLOW
+                        final_status_at = datetime.utcnow()
+                        notification_message = {
+                            "complaint_id": complaint_id,
+                            "type": "block",
+                            "description": "Произошла блокировка",
+                        }
+                    else:
+                        new_status = ComplaintStatus.ASSIGNED_RESPONSIBLE
+                        notification_message = {
+                            "complaint_id": complaint_id,
+                            "type": "redirect",
+                            "description": "Перенаправили заявку другому исполнителю",
+                        }
                 else:
-                    complaint.status = ComplaintStatus.ASSIGNED_RESPONSIBLE.value
-
-                    await self._complaint_repo.update_complaint(
-                        session,
-                        complaint.complaint_id,  # Не изменяем complaint_id
-                        complaint.status,
-                        update.response_text,
-                        complaint.executor_id,
-                        complaint.address,
-                    )
-
-                    # Создаем новую запись в ticket_status
-                    await self._ticket_status_repo.create_ticket_status(
-                        session,
-                        complaint_id=complaint.complaint_id,
-                        status_code=ComplaintStatus.ASSIGNED_RESPONSIBLE.value,
-                        sort_order=2,  # следующий статус
-                        description=update.response_text,
-                        executor_id=complaint.executor_id,
-                    )
-
+                    new_status = ComplaintStatus.NEW
+                    final_status_at = datetime.utcnow()
                     notification_message = {
-                        "complaint_id": complaint.complaint_id,
-                        "type": "redirect",
-                        "description": "Перенаправили заявку другому исполнителю",
+                        "complaint_id": complaint_id,
+                        "type": "block",
+                        "description": "Произошла блокировка, обновили статус на новый",
                     }
-                    await send_notification_to_clients(notification_message)
-
-            else:
-                complaint.status = ComplaintStatus.NEW.value
-                complaint.final_status_at = datetime.utcnow()
-
-                await self._complaint_repo.update_complaint(
-                    session,
-                    complaint.complaint_id,  # Не изменяем complaint_id
-                    complaint.status,
-                    update.response_text,
-                    complaint.executor_id,
-                    complaint.address,
-                )
-
-                await self._ticket_status_repo.create_ticket_status(
-                    session,
-                    complaint_id=complaint.complaint_id,
-                    status_code=ComplaintStatus.NEW.value,
-                    sort_order=2,  # следующий статус
-                    description=update.response_text,
-                    executor_id=complaint.executor_id,
-                )
 
+            elif ai_result.is_blocking_bounce:
+                # Если задача не может быть выполнена (отфутболена), блокируем заявку
+                new_status = ComplaintStatus.NEW
+                final_status_at = datetime.utcnow()
                 notification_message = {
-                    "complaint_id": complaint.complaint_id,
+                    "complaint_id": complaint_id,
                     "type": "block",
                     "description": "Произошла блокировка, обновили статус на новый",
                 }
-                await send_notification_to_clients(notification_message)
 
-        elif ai_result.is_blocking_bounce:
-            # Если задача не может быть выполнена (отфутболена), блокируем заявку
-            complaint.status = ComplaintStatus.NEW.value
-            complaint.final_status_at = datetime.utcnow()
-
-            await self._complaint_repo.update_complaint(
+            # Иначе всё хорошо — статус "MODERATED"
+            complaint = await self._complaint_repo.update_complaint(
                 session,
-                complaint.complaint_id,  # Не изменяем complaint_id
-                complaint.status,
-                update.response_text,
-                complaint.executor_id,
-                complaint.address,
+                complaint_id,
+                status=new_status.value,
+                resolution=update.response_text,
+                executor_id=new_executor_id,
+                address=None,
+                final_status_at=final_status_at,
             )
+            if complaint is None:
+                return None
 
+            # Создаем новую запись в ticket_status
             await self._ticket_status_repo.create_ticket_status(
                 session,
-                complaint_id=complaint.complaint_id,
-                status_code=ComplaintStatus.NEW.value,
+                complaint_id=complaint_id,
+                status_code=new_status.value,
                 sort_order=2,  # следующий статус
                 description=update.response_text,
                 executor_id=complaint.executor_id,
             )
 
-            notification_message = {
-                "complaint_id": complaint.complaint_id,
-                "type": "block",
-                "description": "Произошла блокировка, обновили статус на новый",
-            }
-            await send_notification_to_clients(notification_message)
+            # Событие коммитится вместе с переходом: откатился переход — нет
+            # и уведомления, а после коммита его точно разошлёт диспетчер outbox
+            if notification_message is not None:
+                # district / executor_id — для подписок по топикам (см. NotificationHub)
+                notification_message["district"] = complaint.district
+                notification_message["executor_id"] = complaint.executor_id
+                await self._outbox_repo.add_event(
+                    session, notification_message["type"], notification_message
+                )
 
-        else:
-            # Если все хорошо, отправляем на статус "MODERATED"
-            complaint.status = ComplaintStatus.MODERATED.value
+        if notification_message is not None:
+            wake_outbox_dispatcher()
+        return complaint
 
-            # Создаем новую запись в ticket_status
-            await self._ticket_status_repo.create_ticket_status(
-                session,
-                complaint_id=complaint.complaint_id,
-                status_code=ComplaintStatus.MODERATED.value,
-                sort_order=2,  # следующий статус
-                description=update.response_text,
-                executor_id=complaint.executor_id,
-            )
+    # ============================
+    # Асинхронная обработка запроса от Executor (очередь заданий)
+    # ============================
 
-            await self._complaint_repo.update_complaint(
-                session,
-                complaint.complaint_id,  # Не изменяем complaint_id
-                complaint.status,
-                update.response_text,
-                complaint.executor_id,
-                complaint.address,
-            )
-        await session.commit()
-        await session.refresh(complaint)
+    async def enqueue_executor_update(
+            self,
+            session: AsyncSession,
+            complaint_id: int,
+            update: ExecutorUpdateRequest,
+    ):
+        """
+        Кладём запрос исполнителя в очередь executor_update_jobs — одна вставка,
+        анализ выполнит воркер. None, если заявки нет.
+        """
+        try:
+            async with unit_of_work(session):
+                return await self._job_repo.enqueue_job(
+                    session,
+                    complaint_id=complaint_id,
+                    payload=update.model_dump(mode="json"),
+                    max_attempts=settings.executor_update_job_max_attempts,
+                )
+        except IntegrityError:
+            # FK на complaints: заявки не существует
+            return None
 
-        return complaint
+    async def get_executor_update_job(self, session: AsyncSession, job_id: int):
+        return await self._job_repo.get_job(session, job_id)
 
     # ============================
     # CRUD для TicketStatus
@@ -389,9 +535,10 @@ class ComplaintService:
         description: Optional[str],
         executor_id: Optional[int],
     ):
-        return await self._ticket_status_repo.create_ticket_status(
-            session, complaint_id, status_code, sort_order, description, executor_id
-        )
+        async with unit_of_work(session):
+            return await self._ticket_status_repo.create_ticket_status(
+                session, complaint_id, status_code, sort_order, description, executor_id
+            )
 
     async def get_ticket_status(
         self, session: AsyncSession, complaint_id: int
@@ -400,6 +547,13 @@ class ComplaintService:
             session, complaint_id
         )
 
+    async def get_ticket_statuses(
+        self, session: AsyncSession, complaint_ids: List[int]
+    ):
+        return await self._ticket_status_repo.get_ticket_statuses(
+            session, complaint_ids
+        )
+
     async def update_ticket_status(
         self,
         session: AsyncSession,
@@ -409,13 +563,15 @@ class ComplaintService:
         sort_order: int,
         executor_id: Optional[int],
     ):
-        return await self._ticket_status_repo.update_ticket_status(
-            session, complaint_id, status_code, description, sort_order, executor_id
-        )
+        async with unit_of_work(session):
+            return await self._ticket_status_repo.update_ticket_status(
+                session, complaint_id, status_code, description, sort_order, executor_id
+            )
 
     async def delete_ticket_status(
         self, session: AsyncSession, complaint_id: int, status_code: str, data: datetime
     ):
-        await self._ticket_status_repo.delete_ticket_status(
-            session, complaint_id, status_code, data
-        )
+        async with unit_of_work(session):
+            await self._ticket_status_repo.delete_ticket_status(
+                session, complaint_id, status_code, data
+            )
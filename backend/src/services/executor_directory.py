@@ -0,0 +1,71 @@
+# app/services/executor_directory.py
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.repo import ExecutorRepositoryProtocol
+from src.core.metrics import metrics
+from src.db.models import normalize_executor_name
+from src.db.session import unit_of_work
+from src.schemas.bulk import ExecutorSyncItem, ExecutorSyncReport
+
+# Строк в одном INSERT … VALUES: держимся далеко от лимита параметров asyncpg
+_UPSERT_CHUNK_SIZE = 1000
+
+
+class ExecutorDirectoryService:
+    """
+    Синхронизация справочника исполнителей с полным списком организаций города.
+    """
+
+    def __init__(self, executor_repo: ExecutorRepositoryProtocol):
+        self._executor_repo = executor_repo
+
+    async def sync(
+        self,
+        session: AsyncSession,
+        items: Sequence[ExecutorSyncItem],
+        deactivate_missing: bool = True,
+    ) -> ExecutorSyncReport:
+        """
+        Upsert по нормализованному имени одной транзакцией; отсутствующих
+        в списке исполнителей выключаем (is_active=false), а не удаляем —
+        на них ссылаются заявки и история статусов.
+        """
+        if not items and deactivate_missing:
+            # пустой файл выключил бы весь справочник
+            raise ValueError("Executor list is empty")
+
+        rows: dict[str, dict] = {}
+        duplicates = []
+        for item in items:
+            key = normalize_executor_name(item.name)
+            if key in rows:
+                duplicates.append(item.name)
+            rows[key] = {
+                "name": item.name,
+                "normalized_name": key,
+                "organization": item.organization,
+                "phone": item.phone,
+                "email": item.email,
+            }
+
+        report = ExecutorSyncReport(total=len(items), duplicates=duplicates)
+        values = list(rows.values())
+        async with unit_of_work(session):
+            for start in range(0, len(values), _UPSERT_CHUNK_SIZE):
+                changed = await self._executor_repo.upsert_executors(
+                    session, values[start:start + _UPSERT_CHUNK_SIZE]
+                )
+                for executor_id, inserted in changed:
+                    (report.created if inserted else report.updated).append(executor_id)
+            if deactivate_missing:
+                report.deactivated = await self._executor_repo.deactivate_executors_except(
+                    session, list(rows)
+                )
+        report.unchanged = len(values) - len(report.created) - len(report.updated)
+
+        metrics.incr("executor_sync.created", len(report.created))
+        metrics.incr("executor_sync.updated", len(report.updated))
+        metrics.incr("executor_sync.deactivated", len(report.deactivated))
+        return report
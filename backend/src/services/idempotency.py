@@ -0,0 +1,93 @@
+# app/services/idempotency.py
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.repo import IdempotencyKeyRepositoryProtocol
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.db.models import IdempotencyKey
+from src.db.session import unit_of_work
+
+
+class IdempotencyConflictError(Exception):
+    """
+    Ключ уже использован с другим телом запроса или запрос с ним ещё выполняется.
+    """
+
+    def __init__(self, detail: str, in_progress: bool = False) -> None:
+        super().__init__(detail)
+        self.in_progress = in_progress
+
+
+def hash_request(payload: dict) -> str:
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class IdempotencyService:
+    def __init__(self, idempotency_repo: IdempotencyKeyRepositoryProtocol):
+        self._repo = idempotency_repo
+
+    async def begin(
+        self, session: AsyncSession, scope: str, key: str, payload: dict
+    ) -> IdempotencyKey | None:
+        """
+        Сохранённый ответ, если это повтор (одно чтение по первичному ключу),
+        иначе занимаем ключ под текущий запрос и возвращаем None.
+        """
+        request_hash = hash_request(payload)
+
+        stored = await self._repo.get_key(session, scope, key)
+        if stored is None:
+            async with unit_of_work(session):
+                claimed = await self._repo.claim_key(session, scope, key, request_hash)
+            if claimed:
+                return None
+            # ключ занял параллельный запрос
+            stored = await self._repo.get_key(session, scope, key)
+            if stored is None:
+                raise IdempotencyConflictError("Request with this key is in progress", True)
+
+        if stored.request_hash != request_hash:
+            raise IdempotencyConflictError(
+                "Idempotency-Key was already used with a different request"
+            )
+
+        if stored.response is None:
+            locked_before = datetime.utcnow() - timedelta(
+                seconds=settings.idempotency_lock_seconds
+            )
+            async with unit_of_work(session):
+                taken = await self._repo.takeover_key(session, scope, key, locked_before)
+            if taken:
+                return None
+            raise IdempotencyConflictError("Request with this key is in progress", True)
+
+        metrics.incr(f"idempotency.{scope}.replayed")
+        return stored
+
+    async def complete(
+        self,
+        session: AsyncSession,
+        scope: str,
+        key: str,
+        status_code: int,
+        response: dict,
+    ) -> None:
+        """
+        Сохраняет ответ в текущей транзакции: вызывается внутри outer_transaction,
+        чтобы ответ закоммитился вместе с изменениями обработчика — иначе падение
+        между двумя коммитами оставит ключ без ответа и повтор выполнит запрос снова.
+        """
+        await self._repo.save_response(session, scope, key, status_code, response)
+
+    async def abort(self, session: AsyncSession, scope: str, key: str) -> None:
+        """
+        Запрос упал — освобождаем ключ, чтобы клиент мог повторить.
+        """
+        await session.rollback()
+        async with unit_of_work(session):
+            await self._repo.delete_key(session, scope, key)
@@ -0,0 +1,166 @@
+"""
+Воркеры очереди executor_update_jobs.
+
+Запускаются внутри API (settings.executor_update_workers > 0) или отдельным процессом:
+    uv run python -m src.workers.executor_updates
+"""
+import asyncio
+import contextlib
+import logging
+import random
+from datetime import datetime, timedelta
+
+from dishka import AsyncContainer
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.metrics import metrics
+from src.db.models import ExecutorUpdateJob
+from src.db.session import AsyncSessionLocal, engine, unit_of_work
+from src.di.container import container
+from src.notifications.outbox import (
+    OutboxDispatcher,
+    start_outbox_dispatcher,
+    wake_outbox_dispatcher,
+)
+from src.notifications.publisher import publisher
+from src.protocols.repo import (
+    ExecutorUpdateJobRepositoryProtocol,
+    OutboxRepositoryProtocol,
+)
+from src.schemas.executor_update import ExecutorUpdateRequest
+from src.services.complaints import ComplaintService
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorUpdateWorker:
+    def __init__(
+        self,
+        container: AsyncContainer,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = settings.executor_update_job_batch_size,
+        poll_interval: float = settings.executor_update_job_poll_interval,
+        lease_seconds: float = settings.executor_update_job_lease_seconds,
+    ) -> None:
+        # Зависимости берём из контейнера лениво: клиент ИИ создаётся
+        # только когда действительно пришло задание
+        self._container = container
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        while not stop_event.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("executor_update_jobs: ошибка выборки заданий")
+                processed = 0
+            if processed:
+                # Очередь не пуста — сразу берём следующую пачку
+                continue
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop_event.wait(), timeout=self._poll_interval)
+
+    async def run_once(self) -> int:
+        job_repo = await self._container.get(ExecutorUpdateJobRepositoryProtocol)
+        async with self._session_factory() as session, unit_of_work(session):
+            exhausted = await job_repo.fail_exhausted_jobs(session)
+            jobs = await job_repo.claim_jobs(
+                session, limit=self._batch_size, lease_seconds=self._lease_seconds
+            )
+        if exhausted:
+            metrics.incr("executor_update_jobs.failed", exhausted)
+            logger.warning(
+                "executor_update_jobs: %s заданий исчерпали попытки с истёкшей арендой",
+                exhausted,
+            )
+        if jobs:
+            await asyncio.gather(*(self._process(job) for job in jobs))
+        return len(jobs)
+
+    async def _process(self, job: ExecutorUpdateJob) -> None:
+        job_repo = await self._container.get(ExecutorUpdateJobRepositoryProtocol)
+        update = ExecutorUpdateRequest.model_validate(job.payload)
+        async with self._session_factory() as session:
+            try:
+                complaint_service = await self._container.get(ComplaintService)
+                complaint = await complaint_service.handle_executor_update(
+                    session, complaint_id=job.complaint_id, update=update
+                )
+            except Exception as e:
+                retry_at = self._retry_at(job)
+                async with unit_of_work(session):
+                    await job_repo.fail_job(session, job.job_id, str(e), retry_at)
+                metrics.incr(
+                    "executor_update_jobs.retried" if retry_at else "executor_update_jobs.failed"
+                )
+                logger.warning(
+                    "executor_update_jobs: задание %s упало (попытка %s/%s): %s",
+                    job.job_id, job.attempts, job.max_attempts, e,
+                )
+                return
+
+            if complaint is None:
+                async with unit_of_work(session):
+                    await job_repo.fail_job(
+                        session, job.job_id, "Complaint not found", None
+                    )
+                metrics.incr("executor_update_jobs.failed")
+                return
+
+            async with unit_of_work(session):
+                await job_repo.complete_job(session, job.job_id)
+            metrics.incr("executor_update_jobs.done")
+
+    @staticmethod
+    def _retry_at(job: ExecutorUpdateJob):
+        if job.attempts >= job.max_attempts:
+            return None
+        # Экспоненциальный backoff с джиттером
+        delay = min(
+            settings.executor_update_job_backoff_seconds * 2 ** (job.attempts - 1),
+            settings.executor_update_job_backoff_max_seconds,
+        )
+        delay *= random.uniform(0.8, 1.2)
+        return datetime.utcnow() + timedelta(seconds=delay)
+
+
+def start_workers(
+    worker: ExecutorUpdateWorker, count: int, stop_event: asyncio.Event
+) -> list[asyncio.Task]:
+    return [
+        asyncio.create_task(worker.run(stop_event), name=f"executor-update-worker-{i}")
+        for i in range(count)
+    ]
+
+
+async def main(count: int = max(settings.executor_update_workers, 1)) -> None:
+    worker = ExecutorUpdateWorker(container, session_factory=AsyncSessionLocal)
+    stop_event = asyncio.Event()
+    # уведомления о переходах (при notifications_backend = "postgres" — в notifier):
+    # события из outbox_events сразу рассылает диспетчер этого же процесса
+    await publisher.start()
+    dispatcher = OutboxDispatcher(
+        await container.get(OutboxRepositoryProtocol),
+        publisher,
+        session_factory=AsyncSessionLocal,
+    )
+    try:
+        await asyncio.gather(
+            *start_workers(worker, count, stop_event),
+            *start_outbox_dispatcher(dispatcher, stop_event),
+        )
+    finally:
+        stop_event.set()
+        wake_outbox_dispatcher()
+        await publisher.stop()
+        await container.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
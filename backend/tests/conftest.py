@@ -0,0 +1,126 @@
+import asyncio
+import os
+from contextlib import contextmanager
+
+import pytest
+from dishka import Provider, Scope, make_async_container
+from dishka.integrations.fastapi import FastapiProvider, setup_dishka
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.adapters.repo import (
+    ComplaintRepository,
+    ExecutorRepository,
+    ExecutorUpdateJobRepository,
+    IdempotencyKeyRepository,
+    ModeratorRepository,
+    OutboxRepository,
+    TicketStatusRepository,
+)
+from src.db.base import Base
+from src.db import models  # noqa: F401  — регистрирует таблицы в Base.metadata
+from src.db.session import get_session
+from src.services.complaints import ComplaintService
+from src.services.idempotency import IdempotencyService
+
+# Тесты с настоящим Postgres (планы запросов, число запросов) запускаются,
+# только если задан TEST_DATABASE_URL; база пересоздаётся на каждый тест
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+requires_postgres = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL не задан"
+)
+
+
+@pytest.fixture
+def run():
+    """
+    Запуск корутины в свежем цикле событий: тестам хватает asyncio.run,
+    без отдельного плагина для async-тестов.
+    """
+    def _run(coro):
+        return asyncio.run(coro)
+
+    return _run
+
+
+@pytest.fixture
+def pg_engine(run):
+    # NullPool: каждый тест работает в своём цикле событий, соединения не переиспользуем
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+
+    async def reset_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    run(reset_schema())
+    yield engine
+    run(engine.dispose())
+
+
+@pytest.fixture
+def pg_session_factory(pg_engine):
+    return async_sessionmaker(bind=pg_engine, expire_on_commit=False)
+
+
+def make_complaint_service(ai_client=None) -> ComplaintService:
+    """
+    ComplaintService на настоящих репозиториях; ИИ-клиент подставляет тест.
+    """
+    return ComplaintService(
+        complaint_repo=ComplaintRepository(),
+        executor_repo=ExecutorRepository(),
+        moderator_repo=ModeratorRepository(),
+        ticket_status_repo=TicketStatusRepository(),
+        ai_client=ai_client,
+        job_repo=ExecutorUpdateJobRepository(),
+        outbox_repo=OutboxRepository(),
+    )
+
+
+def make_api_client(
+    session_factory: async_sessionmaker,
+    router: APIRouter,
+    idempotency_service: IdempotencyService | None = None,
+    raise_server_exceptions: bool = True,
+) -> TestClient:
+    """
+    Приложение с одним роутером поверх тестовой базы: сессии из session_factory,
+    сервисы на настоящих репозиториях, без ИИ.
+    """
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_session] = override_session
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: make_complaint_service(), provides=ComplaintService)
+    provider.provide(
+        lambda: idempotency_service or IdempotencyService(IdempotencyKeyRepository()),
+        provides=IdempotencyService,
+    )
+    setup_dishka(make_async_container(provider, FastapiProvider()), app)
+    return TestClient(app, raise_server_exceptions=raise_server_exceptions)
+
+
+@contextmanager
+def capture_queries(engine: AsyncEngine):
+    """
+    Собирает (sql, parameters) всех запросов к базе внутри блока.
+    """
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
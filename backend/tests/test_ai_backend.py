@@ -0,0 +1,36 @@
+import logging
+
+import pytest
+
+import src.adapters.ai as ai_module
+from src.adapters.ai import YandexAIClient
+from src.adapters.ai_stub import StubAIClient
+from src.core.config import settings
+from src.di.container import create_llm_client
+
+
+@pytest.fixture
+def local_backend(monkeypatch):
+    monkeypatch.setattr(settings, "ai_backend", "local")
+    return monkeypatch
+
+
+def test_local_backend_without_keys_falls_back_to_stub(local_backend, caplog):
+    local_backend.setattr(ai_module, "YC_FOLDER_ID", None)
+    local_backend.setattr(ai_module, "YC_API_KEY", None)
+
+    with caplog.at_level(logging.WARNING, logger="src.di.container"):
+        client = create_llm_client()
+
+    assert isinstance(client, StubAIClient)
+    assert "YC_FOLDER_ID" in caplog.text
+
+
+def test_local_backend_with_keys_uses_yandex(local_backend, run):
+    local_backend.setattr(ai_module, "YC_FOLDER_ID", "folder")
+    local_backend.setattr(ai_module, "YC_API_KEY", "key")
+
+    client = create_llm_client()
+
+    assert isinstance(client, YandexAIClient)
+    run(client.aclose())
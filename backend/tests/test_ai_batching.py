@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import src.adapters.ai as ai_module
+from src.adapters.ai import YandexAIClient
+from src.adapters.ai_batching import MicroBatchingAIClient, batch_call_timeout
+from src.adapters.ai_http import HttpAIClient
+from src.protocols.ai import AIBatchSizeMismatch
+from src.schemas.ai_service import AnalyzeRequest
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+
+def _result(text: str) -> ExecutorUpdateResult:
+    return ExecutorUpdateResult(
+        decision="ok", is_forward=False, is_blocking_bounce=False, moderator_message=text
+    )
+
+
+class _BatchClient:
+    def __init__(self, drop: int = 0, error: Exception | None = None):
+        self.batches = []
+        self._drop = drop
+        self._error = error
+
+    async def analyze_batch(self, items):
+        self.batches.append(len(items))
+        if self._error is not None:
+            raise self._error
+        results = [_result(item.update.response_text) for item in items]
+        return results[: len(results) - self._drop]
+
+
+async def _analyze_many(client, count):
+    return await asyncio.wait_for(
+        asyncio.gather(
+            *(
+                client.analyze_executor_response(
+                    complaint_description="Яма",
+                    update=ExecutorUpdateRequest(executor_id=1, response_text=str(i)),
+                )
+                for i in range(count)
+            ),
+            return_exceptions=True,
+        ),
+        timeout=1,
+    )
+
+
+def test_concurrent_calls_share_one_batch_in_order(run):
+    inner = _BatchClient()
+    client = MicroBatchingAIClient(inner, window_ms=10, max_batch_size=10)
+
+    results = run(_analyze_many(client, 3))
+
+    assert inner.batches == [3]
+    assert [result.moderator_message for result in results] == ["0", "1", "2"]
+
+
+def test_full_batch_is_sent_without_waiting_for_window(run):
+    inner = _BatchClient()
+    client = MicroBatchingAIClient(inner, window_ms=10_000, max_batch_size=2)
+
+    results = run(_analyze_many(client, 4))
+
+    assert inner.batches == [2, 2]
+    assert all(isinstance(result, ExecutorUpdateResult) for result in results)
+
+
+def test_short_result_list_fails_every_waiter_instead_of_hanging(run):
+    client = MicroBatchingAIClient(_BatchClient(drop=1), window_ms=10, max_batch_size=10)
+
+    results = run(_analyze_many(client, 3))
+
+    assert all(isinstance(result, AIBatchSizeMismatch) for result in results)
+
+
+def test_upstream_error_is_propagated_to_all_waiters(run):
+    error = RuntimeError("upstream down")
+    client = MicroBatchingAIClient(_BatchClient(error=error), window_ms=10, max_batch_size=10)
+
+    results = run(_analyze_many(client, 2))
+
+    assert results == [error, error]
+
+
+@pytest.mark.parametrize("returned", [0, 2])
+def test_http_client_checks_result_count(run, returned):
+    def handler(request):
+        return httpx.Response(
+            200, json={"results": [_result("x").model_dump()] * returned}
+        )
+
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://ai"
+        ) as http_client:
+            client = HttpAIClient(http_client=http_client)
+            item = AnalyzeRequest(
+                complaint_description="Яма",
+                update=ExecutorUpdateRequest(executor_id=1, response_text="ok"),
+            )
+            await client.analyze_batch([item])
+
+    with pytest.raises(AIBatchSizeMismatch):
+        run(scenario())
+
+
+def test_batch_timeout_grows_with_batch_size():
+    assert batch_call_timeout(1, base=30, per_item=2) == 30
+    assert batch_call_timeout(16, base=30, per_item=2) == 60
+
+
+def _yandex_client(monkeypatch, complete):
+    monkeypatch.setattr(ai_module, "YC_FOLDER_ID", "folder")
+    monkeypatch.setattr(ai_module, "YC_API_KEY", "key")
+    client = YandexAIClient(timeout=0.2, batch_item_timeout=0.1)
+    monkeypatch.setattr(client, "_complete", complete)
+    return client
+
+
+def _items(count):
+    return [
+        AnalyzeRequest(
+            complaint_description="Яма",
+            update=ExecutorUpdateRequest(executor_id=1, response_text=str(i)),
+        )
+        for i in range(count)
+    ]
+
+
+def test_yandex_batch_fallback_runs_within_batch_deadline(run, monkeypatch):
+    timeouts = []
+
+    async def complete(instructions, payload, max_output_tokens=400, timeout=None):
+        if isinstance(payload, list):
+            timeouts.append(timeout)
+            return "не JSON"
+        await asyncio.sleep(10)
+
+    client = _yandex_client(monkeypatch, complete)
+
+    async def scenario():
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.analyze_batch(_items(2))
+        return time.monotonic() - started
+
+    elapsed = run(scenario())
+
+    assert timeouts == [pytest.approx(0.3)]
+    assert elapsed < 1
+
+
+def test_yandex_batch_fails_without_fallback_when_deadline_spent(run, monkeypatch):
+    single_calls = []
+
+    async def complete(instructions, payload, max_output_tokens=400, timeout=None):
+        if isinstance(payload, list):
+            await asyncio.sleep(timeout)
+            return "не JSON"
+        single_calls.append(payload)
+        return "{}"
+
+    client = _yandex_client(monkeypatch, complete)
+
+    with pytest.raises(ValueError):
+        run(client.analyze_batch(_items(2)))
+    assert single_calls == []
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.adapters.ai_resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    ResilientAIClient,
+)
+from src.protocols.ai import AIUnavailableError
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+from src.services.complaints import ComplaintService
+
+UPDATE = ExecutorUpdateRequest(executor_id=1, response_text="Посмотрим")
+
+
+def _ok() -> ExecutorUpdateResult:
+    return ExecutorUpdateResult(
+        decision="ok", is_forward=False, is_blocking_bounce=False, source="llm"
+    )
+
+
+class _Inner:
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.calls = 0
+        self.delay = delay
+        self.error = error
+
+    async def analyze_executor_response(self, *, complaint_description, update):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return _ok()
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    return breaker
+
+
+# ======== CircuitBreaker ========
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_reset():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    # один пробный вызов
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_cancelled_trial_does_not_stick_in_half_open(run):
+    inner = _Inner(delay=10)
+    client = ResilientAIClient(inner, breaker=_open_breaker(), call_timeout=30)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                client.analyze_executor_response(complaint_description="", update=UPDATE),
+                timeout=0.05,
+            )
+        inner.delay = 0
+        return await client.analyze_executor_response(complaint_description="", update=UPDATE)
+
+    result = run(scenario())
+
+    assert inner.calls == 2
+    assert result.source == "llm"
+    assert client._breaker.state == "closed"
+
+
+def test_upstream_error_raises_unavailable_and_opens_breaker(run):
+    inner = _Inner(error=RuntimeError("boom"))
+    client = ResilientAIClient(inner, breaker=CircuitBreaker(failure_threshold=1))
+
+    with pytest.raises(AIUnavailableError):
+        run(client.analyze_executor_response(complaint_description="", update=UPDATE))
+    assert client._breaker.state == "open"
+
+    # открытый breaker отвечает сразу, не трогая модель
+    with pytest.raises(AIUnavailableError):
+        run(client.analyze_executor_response(complaint_description="", update=UPDATE))
+    assert inner.calls == 1
+
+
+# ======== AdaptiveConcurrencyLimiter ========
+
+
+def test_slow_burst_decreases_limit_once(run):
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=10, min_limit=1, target_latency_ms=1, backoff_ratio=0.5
+    )
+
+    async def scenario():
+        started = time.monotonic() - 1  # все вызовы «медленные»
+        for _ in range(5):
+            await limiter.acquire()
+        for _ in range(5):
+            await limiter.release(started, ok=True)
+
+    run(scenario())
+
+    assert limiter.limit == 5
+
+
+def test_cancelled_call_does_not_change_limit(run):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+    async def scenario():
+        await limiter.acquire()
+        await limiter.release(time.monotonic() - 100, ok=None)
+
+    run(scenario())
+
+    assert limiter.limit == 4
+
+
+def test_fast_success_grows_limit(run):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, target_latency_ms=10_000)
+
+    async def scenario():
+        for _ in range(4):
+            await limiter.acquire()
+            await limiter.release(time.monotonic(), ok=True)
+
+    run(scenario())
+
+    assert limiter.limit == 3
+
+
+# ======== недоступность модели не применяется как переход ========
+
+
+class _UnavailableAI:
+    async def analyze_executor_response(self, *, complaint_description, update):
+        raise AIUnavailableError("ИИ временно недоступен")
+
+
+class _ComplaintRepo:
+    async def get_complaint(self, session, complaint_id):
+        return SimpleNamespace(complaint_id=complaint_id, description="Яма")
+
+    async def update_complaint(self, *args, **kwargs):
+        raise AssertionError("переход не должен применяться")
+
+
+class _Session:
+    async def rollback(self):
+        pass
+
+
+def test_service_leaves_complaint_when_ai_unavailable(run):
+    service = ComplaintService(
+        complaint_repo=_ComplaintRepo(),
+        executor_repo=None,
+        moderator_repo=None,
+        ticket_status_repo=None,
+        ai_client=_UnavailableAI(),
+        job_repo=None,
+        outbox_repo=None,
+    )
+
+    with pytest.raises(AIUnavailableError):
+        run(service.handle_executor_update(_Session(), complaint_id=1, update=UPDATE))
@@ -0,0 +1,111 @@
+import pytest
+
+from src.adapters.ai_rules import RuleBasedClassifier, RuleFirstAIClient
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+
+THRESHOLD = 0.8
+
+
+class _Session:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _ExecutorRepo:
+    def __init__(self, names):
+        self._names = {name.lower() for name in names}
+        self.lookups = []
+
+    async def get_executor_by_name(self, session, name):
+        self.lookups.append(name)
+        return object() if name.lower() in self._names else None
+
+
+class _LLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_executor_response(self, *, complaint_description, update):
+        self.calls += 1
+        return ExecutorUpdateResult(
+            decision="ok", is_forward=False, is_blocking_bounce=False, source="llm"
+        )
+
+
+def _update(text: str) -> ExecutorUpdateRequest:
+    return ExecutorUpdateRequest(executor_id=1, response_text=text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Заявка передана в работу",
+        "Обращение направлено в работу подрядчику",
+        "Заявка включена в план на следующий месяц",
+        "Передано в бригаду, ожидайте",
+        "Заявка направлена в исполнение",
+    ],
+)
+def test_progress_phrases_are_not_forwards(text):
+    result = RuleBasedClassifier().classify(text)
+
+    assert not result.is_forward
+    assert result.target_executor_name is None
+    assert result.decision == "ok"
+
+
+def test_forward_to_organization():
+    result = RuleBasedClassifier().classify("Заявка перенаправлена в ГИБДД")
+
+    assert result.is_forward
+    assert result.target_executor_name == "ГИБДД"
+    assert result.confidence >= THRESHOLD
+
+
+def test_vague_forward_is_stop():
+    result = RuleBasedClassifier().classify("Обратитесь в соответствующую организацию")
+
+    assert result.decision == "stop"
+
+
+def test_unresolved_forward_target_goes_to_llm(run):
+    llm = _LLM()
+    repo = _ExecutorRepo(["Водоканал"])
+    client = RuleFirstAIClient(
+        llm, confidence_threshold=THRESHOLD, executor_repo=repo, session_factory=_Session
+    )
+
+    result = run(
+        client.analyze_executor_response(
+            complaint_description="Яма на дороге",
+            update=_update("Заявка перенаправлена в ГИБДД"),
+        )
+    )
+
+    assert repo.lookups == ["ГИБДД"]
+    assert llm.calls == 1
+    assert result.source == "llm"
+
+
+def test_resolved_forward_target_skips_llm(run):
+    llm = _LLM()
+    client = RuleFirstAIClient(
+        llm,
+        confidence_threshold=THRESHOLD,
+        executor_repo=_ExecutorRepo(["ГИБДД"]),
+        session_factory=_Session,
+    )
+
+    result = run(
+        client.analyze_executor_response(
+            complaint_description="Яма на дороге",
+            update=_update("Заявка перенаправлена в ГИБДД"),
+        )
+    )
+
+    assert llm.calls == 0
+    assert result.source == "rule"
+    assert result.target_executor_name == "ГИБДД"
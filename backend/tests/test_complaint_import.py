@@ -0,0 +1,99 @@
+import json
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from src.adapters.repo import ComplaintRepository, ExecutorRepository, TicketStatusRepository
+from src.db.models import Complaint
+from src.schemas.bulk import ComplaintImportRow
+from src.services.complaint_import import ComplaintImportService
+from tests.conftest import requires_postgres
+
+CSV = (
+    "description,status,address,created_at\n"
+    "Яма,new,ул. Ленина 1,2024-05-01T10:00:00+03:00\n"
+    "Лужа,unknown,ул. Ленина 2,2024-05-01T10:00:00Z\n"
+    "Мусор,closed,ул. Ленина 3,2024-05-01T10:00:00\n"
+)
+
+
+async def _chunks(data: str):
+    yield data.encode("utf-8")
+
+
+def test_import_row_dates_are_naive_utc():
+    row = ComplaintImportRow(
+        description="Яма",
+        status="new",
+        created_at="2024-05-01T10:00:00+03:00",
+        final_status_at="2024-05-02T00:00:00Z",
+    )
+
+    assert row.created_at == datetime(2024, 5, 1, 7, 0)
+    assert row.final_status_at == datetime(2024, 5, 2, 0, 0)
+
+
+def test_import_row_rejects_garbage_date():
+    with pytest.raises(ValidationError):
+        ComplaintImportRow(description="Яма", status="new", created_at="вчера")
+
+
+@requires_postgres
+def test_offset_dates_do_not_fail_the_batch(run, pg_session_factory):
+    service = ComplaintImportService(
+        ComplaintRepository(), TicketStatusRepository(), ExecutorRepository()
+    )
+
+    async def scenario():
+        async with pg_session_factory() as session:
+            report = await service.import_complaints(session, _chunks(CSV), "csv")
+        async with pg_session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(Complaint.description, Complaint.created_at).order_by(
+                        Complaint.complaint_id
+                    )
+                )
+            ).all()
+        return report, rows
+
+    report, rows = run(scenario())
+
+    assert (report.total, report.imported, report.failed) == (3, 2, 1)
+    assert [error.line for error in report.errors] == [3]
+    assert rows == [
+        ("Яма", datetime(2024, 5, 1, 7, 0)),
+        ("Мусор", datetime(2024, 5, 1, 10, 0)),
+    ]
+
+
+@requires_postgres
+def test_row_rejected_by_database_does_not_fail_its_batch(run, pg_session_factory):
+    # NUL в тексте проходит схему, но Postgres отвергает его — падает весь COPY
+    jsonl = "\n".join(
+        json.dumps({"description": description, "status": "new"})
+        for description in ("Яма", "Лу\u0000жа", "Мусор")
+    )
+    service = ComplaintImportService(
+        ComplaintRepository(), TicketStatusRepository(), ExecutorRepository()
+    )
+
+    async def scenario():
+        async with pg_session_factory() as session:
+            report = await service.import_complaints(session, _chunks(jsonl), "jsonl")
+        async with pg_session_factory() as session:
+            descriptions = (
+                await session.scalars(
+                    select(Complaint.description).order_by(Complaint.complaint_id)
+                )
+            ).all()
+        return report, descriptions
+
+    report, descriptions = run(scenario())
+
+    assert (report.total, report.imported, report.failed) == (3, 2, 1)
+    assert [error.line for error in report.errors] == [2]
+    assert report.errors[0].error.startswith("insert failed:")
+    assert descriptions == ["Яма", "Мусор"]
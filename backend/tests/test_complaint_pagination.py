@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from src.api.complaints import router as complaints_router
+from src.api.tickets_front import router as tickets_router
+from src.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from src.db.models import Complaint
+from src.schemas.complaint import ComplaintStatus
+from tests.conftest import make_api_client, make_complaint_service, requires_postgres
+
+NOW = datetime(2025, 1, 1)
+
+
+def test_cursor_round_trips():
+    cursor = encode_cursor(NOW, 42)
+
+    assert decode_cursor(cursor) == (NOW, 42)
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90LWpzb24", "WzFd", "WyJ4IiwxXQ"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+# ======== keyset-страницы (нужен Postgres) ========
+
+
+async def _seed(session_factory, created_at: list[datetime]) -> None:
+    # complaint_id идут по порядку вставки: 1, 2, …
+    async with session_factory() as session:
+        await session.execute(
+            insert(Complaint),
+            [
+                {
+                    "description": f"Жалоба {i}",
+                    "status": ComplaintStatus.NEW.value,
+                    "address": "",
+                    "created_at": moment,
+                }
+                for i, moment in enumerate(created_at)
+            ],
+        )
+        await session.commit()
+
+
+async def _all_pages(session_factory, limit: int) -> list[list[int]]:
+    service = make_complaint_service()
+    pages, cursor = [], None
+    async with session_factory() as session:
+        while True:
+            complaints, cursor = await service.list_complaints_page(
+                session, limit=limit, cursor=cursor
+            )
+            pages.append([c.complaint_id for c in complaints])
+            if cursor is None:
+                return pages
+
+
+@requires_postgres
+def test_pages_walk_every_complaint_once_newest_first(run, pg_session_factory):
+    async def scenario():
+        await _seed(pg_session_factory, [NOW + timedelta(minutes=i) for i in range(7)])
+        return await _all_pages(pg_session_factory, limit=3)
+
+    assert run(scenario()) == [[7, 6, 5], [4, 3, 2], [1]]
+
+
+@requires_postgres
+def test_equal_created_at_is_split_by_complaint_id(run, pg_session_factory):
+    # граница страницы внутри группы с одинаковым created_at:
+    # без complaint_id в ключе строки дублировались бы или терялись
+    async def scenario():
+        await _seed(pg_session_factory, [NOW, NOW, NOW, NOW, NOW - timedelta(days=1)])
+        return await _all_pages(pg_session_factory, limit=2)
+
+    assert run(scenario()) == [[4, 3], [2, 1], [5]]
+
+
+@pytest.fixture(params=["complaints", "tickets"])
+def paged_api(request, run, pg_session_factory):
+    run(_seed(pg_session_factory, [NOW] * 3 + [NOW + timedelta(hours=1)] * 2))
+    if request.param == "complaints":
+        client = make_api_client(pg_session_factory, complaints_router)
+        return client, "/complaints/", "complaint_id"
+    client = make_api_client(pg_session_factory, tickets_router)
+    return client, "/api/tickets", "id"
+
+
+@requires_postgres
+def test_api_pages_follow_next_cursor_header(paged_api):
+    client, path, id_field = paged_api
+    pages, params = [], {"limit": 2}
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        pages.append([item[id_field] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert pages == [[5, 4], [3, 2], [1]]
+
+
+@requires_postgres
+def test_api_rejects_invalid_cursor(paged_api):
+    client, path, _ = paged_api
+
+    response = client.get(path, params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
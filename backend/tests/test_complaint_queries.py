@@ -0,0 +1,116 @@
+import pytest
+
+from src.adapters.repo import ExecutorRepository, TicketStatusRepository
+from src.schemas.complaint import ComplaintStatus
+from src.schemas.executor_update import ExecutorUpdateRequest, ExecutorUpdateResult
+from tests.conftest import capture_queries, make_complaint_service, requires_postgres
+
+# Число запросов на путях изменения заявки не должно зависеть от длины
+# хронологии: ни SELECT перед UPDATE, ни перечитывания строки после коммита
+
+
+class _FakeAI:
+    def __init__(self, result: ExecutorUpdateResult):
+        self.result = result
+
+    async def analyze_executor_response(self, *, complaint_description, update):
+        return self.result
+
+
+def _verbs(queries) -> list[str]:
+    return [statement.split(None, 1)[0].upper() for statement, _ in queries]
+
+
+async def _seed(session_factory, service, history: int) -> tuple[int, int]:
+    """
+    Заявка с history записями в хронологии (без исполнителей — переадресация
+    не считается зацикливанием) и два исполнителя.
+    """
+    async with session_factory() as session:
+        executors = ExecutorRepository()
+        first = await executors.create_executor(session, "УК Север", None, None, None)
+        await executors.create_executor(session, "УК Юг", None, None, None)
+        await session.commit()
+        first_id = first.executor_id
+
+    async with session_factory() as session:
+        complaint = await service.create_complaint(
+            session, description="Яма во дворе", address="ул. Ленина 1"
+        )
+    async with session_factory() as session:
+        statuses = TicketStatusRepository()
+        for _ in range(history):
+            await statuses.create_ticket_status(
+                session,
+                complaint_id=complaint.complaint_id,
+                status_code=ComplaintStatus.NEW.value,
+                sort_order=2,
+                description="Повтор",
+                executor_id=None,
+            )
+        await session.commit()
+    return complaint.complaint_id, first_id
+
+
+@pytest.fixture
+def service():
+    return make_complaint_service()
+
+
+@requires_postgres
+def test_create_complaint_does_not_reread(run, pg_engine, pg_session_factory, service):
+    async def scenario():
+        with capture_queries(pg_engine) as queries:
+            async with pg_session_factory() as session:
+                await service.create_complaint(session, description="Яма", address="ул. Ленина 1")
+        return queries
+
+    assert _verbs(run(scenario())) == ["INSERT", "INSERT"]
+
+
+@requires_postgres
+@pytest.mark.parametrize("history", [0, 30])
+def test_update_complaint_is_update_and_insert(run, pg_engine, pg_session_factory, service, history):
+    async def scenario():
+        complaint_id, _ = await _seed(pg_session_factory, service, history)
+        with capture_queries(pg_engine) as queries:
+            async with pg_session_factory() as session:
+                complaint = await service.update_complaint(
+                    session, complaint_id, status=ComplaintStatus.MODERATED, resolution="Готово"
+                )
+        return complaint, queries
+
+    complaint, queries = run(scenario())
+
+    assert complaint.status == ComplaintStatus.MODERATED.value
+    assert _verbs(queries) == ["UPDATE", "INSERT"]
+
+
+@requires_postgres
+@pytest.mark.parametrize("history", [0, 30])
+def test_executor_forward_query_count_is_constant(run, pg_engine, pg_session_factory, history):
+    service = make_complaint_service(
+        _FakeAI(
+            ExecutorUpdateResult(
+                decision="forward",
+                is_forward=True,
+                is_blocking_bounce=False,
+                target_executor_name="УК Юг",
+                source="rule",
+            )
+        )
+    )
+
+    async def scenario():
+        complaint_id, executor_id = await _seed(pg_session_factory, service, history)
+        update = ExecutorUpdateRequest(executor_id=executor_id, response_text="Не наш адрес")
+        with capture_queries(pg_engine) as queries:
+            async with pg_session_factory() as session:
+                complaint = await service.handle_executor_update(session, complaint_id, update)
+        return complaint, queries
+
+    complaint, queries = run(scenario())
+
+    assert complaint.status == ComplaintStatus.ASSIGNED_RESPONSIBLE.value
+    # заявка, исполнитель по имени, EXISTS по хронологии, переход, хронология, outbox
+    assert _verbs(queries) == ["SELECT", "SELECT", "SELECT", "UPDATE", "INSERT", "INSERT"]
@@ -0,0 +1,32 @@
+from sqlalchemy import insert
+
+from src.adapters.repo import ComplaintRepository
+from src.db.models import Complaint
+from tests.conftest import requires_postgres
+
+
+@requires_postgres
+def test_snippet_escapes_complaint_text(run, pg_session_factory):
+    async def scenario():
+        async with pg_session_factory() as session:
+            await session.execute(
+                insert(Complaint),
+                [
+                    {
+                        "description": 'глубокая яма <script>alert(1)</script> 5 < 6 > 4 \ue000 на дороге',
+                        "status": "new",
+                        "address": "",
+                    }
+                ],
+            )
+            await session.commit()
+            return await ComplaintRepository().search_complaints(session, "яма")
+
+    [(_, rank, snippet)] = run(scenario())
+
+    assert rank > 0
+    assert "<b>яма</b>" in snippet
+    # кроме разметки совпадений — никаких тегов из текста жалобы
+    assert "<" not in snippet.replace("<b>", "").replace("</b>", "")
+    assert "5 &lt; 6 &gt; 4" in snippet
+    assert "\ue000" not in snippet
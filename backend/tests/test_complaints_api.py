@@ -0,0 +1,43 @@
+import pytest
+
+from src.adapters.repo import ComplaintRepository
+from src.api.complaints import router
+from tests.conftest import make_api_client, requires_postgres
+
+
+@pytest.fixture
+def client(run, pg_session_factory):
+    async def seed():
+        async with pg_session_factory() as session:
+            repo = ComplaintRepository()
+            for description in ("Яма", "Лужа", "Мусор"):
+                await repo.create_complaint(
+                    session,
+                    description=description,
+                    district=None,
+                    status="new",
+                    executor_id=None,
+                    address="ул. Ленина 1",
+                )
+            await session.commit()
+
+    run(seed())
+    return make_api_client(pg_session_factory, router)
+
+
+@requires_postgres
+def test_complaints_without_ids_lists(client):
+    for path in ("/complaints", "/complaints/"):
+        response = client.get(path, params={"limit": 2}, follow_redirects=False)
+
+        assert response.status_code == 200
+        assert [c["description"] for c in response.json()] == ["Мусор", "Лужа"]
+        assert response.headers["X-Next-Cursor"]
+
+
+@requires_postgres
+def test_complaints_with_ids_keeps_order(client):
+    response = client.get("/complaints", params={"ids": "3,1,42"})
+
+    assert response.status_code == 200
+    assert [c["complaint_id"] for c in response.json()] == [3, 1]
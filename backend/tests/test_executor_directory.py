@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from src.adapters.repo import ExecutorRepository
+from src.db.models import normalize_executor_name
+from src.schemas.bulk import ExecutorSyncItem
+from src.services.executor_directory import ExecutorDirectoryService
+from tests.conftest import requires_postgres
+
+
+@requires_postgres
+def test_deactivated_executor_is_not_found_by_name(run, pg_session_factory):
+    repo = ExecutorRepository()
+    service = ExecutorDirectoryService(repo)
+
+    async def scenario():
+        async with pg_session_factory() as session:
+            await service.sync(
+                session,
+                [ExecutorSyncItem(name="УК Север"), ExecutorSyncItem(name="УК Юг")],
+            )
+        async with pg_session_factory() as session:
+            report = await service.sync(session, [ExecutorSyncItem(name="УК Север")])
+        async with pg_session_factory() as session:
+            active = await repo.get_executor_by_name(session, "ук  север")
+            inactive = await repo.get_executor_by_name(session, "УК Юг")
+        return report, active, inactive
+
+    report, active, inactive = run(scenario())
+
+    assert len(report.deactivated) == 1
+    assert active is not None and active.name == "УК Север"
+    assert inactive is None
+
+
+SCHEMA_SQL = Path(__file__).resolve().parents[2] / "db" / "schema.sql"
+NAMES = [
+    "УК Север",
+    "  ук\tсевер  ",
+    "УК\u00a0Север",
+    "УК\u2003\u3000Север\u202f",
+    "Ёлкин\nИ.\u2028П.",
+    "ООО «Ёж»\x1c",
+]
+
+
+def _backfill_expression() -> str:
+    sql = SCHEMA_SQL.read_text(encoding="utf-8")
+    start = sql.index("SET normalized_name = ") + len("SET normalized_name = ")
+    return sql[start : sql.index("WHERE normalized_name IS NULL", start)]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_normalized_name_ignores_case_yo_and_any_whitespace(name):
+    assert normalize_executor_name(name) in {"ук север", "елкин и. п.", "ооо «еж»"}
+
+
+@requires_postgres
+def test_schema_backfill_matches_python_normalization(run, pg_session_factory):
+    query = text(
+        f"SELECT {_backfill_expression()} "
+        "FROM (SELECT CAST(:name AS VARCHAR) AS name) AS executors"
+    )
+
+    async def scenario():
+        async with pg_session_factory() as session:
+            return [(await session.execute(query, {"name": name})).scalar_one() for name in NAMES]
+
+    assert run(scenario()) == [normalize_executor_name(name) for name in NAMES]
@@ -0,0 +1,49 @@
+from sqlalchemy.dialects import postgresql
+
+from src.adapters.repo import ExecutorUpdateJobRepository
+
+
+class _Result:
+    rowcount = 0
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt, *args, **kwargs):
+        self.statements.append(stmt)
+        return _Result()
+
+    async def flush(self):
+        pass
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_claim_skips_jobs_without_attempts_left(run):
+    session = _RecordingSession()
+
+    run(ExecutorUpdateJobRepository().claim_jobs(session, limit=4, lease_seconds=60))
+
+    sql = _sql(session.statements[0])
+    assert "executor_update_jobs.attempts < executor_update_jobs.max_attempts" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_exhausted_jobs_are_failed(run):
+    session = _RecordingSession()
+
+    run(ExecutorUpdateJobRepository().fail_exhausted_jobs(session))
+
+    sql = _sql(session.statements[0])
+    assert sql.startswith("UPDATE executor_update_jobs SET status=")
+    assert "executor_update_jobs.attempts >= executor_update_jobs.max_attempts" in sql
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.adapters.repo import ComplaintRepository
+from src.api import export
+from src.db.models import Complaint
+from src.schemas.complaint import ComplaintFilter
+from src.services.complaints import ComplaintService
+from tests.conftest import requires_postgres
+
+
+def _service() -> ComplaintService:
+    return ComplaintService(
+        complaint_repo=ComplaintRepository(),
+        executor_repo=None,
+        moderator_repo=None,
+        ticket_status_repo=None,
+        ai_client=None,
+        job_repo=None,
+        outbox_repo=None,
+    )
+
+
+class _ExhaustedSession:
+    closed = False
+
+    async def connection(self):
+        raise PoolTimeoutError("QueuePool limit reached")
+
+    async def close(self):
+        self.closed = True
+
+
+def test_exhausted_export_pool_is_503_before_streaming(run, monkeypatch):
+    session = _ExhaustedSession()
+    monkeypatch.setattr(export, "ExportSessionLocal", lambda: session)
+
+    with pytest.raises(HTTPException) as exc_info:
+        run(export._stream(_service(), ComplaintFilter(), "ndjson", False, "complaints"))
+
+    assert exc_info.value.status_code == 503
+    assert "Retry-After" in exc_info.value.headers
+    assert session.closed
+
+
+@requires_postgres
+def test_export_streams_rows_and_releases_session(run, monkeypatch, pg_session_factory):
+    sessions = []
+
+    def session_factory():
+        sessions.append(pg_session_factory())
+        return sessions[-1]
+
+    monkeypatch.setattr(export, "ExportSessionLocal", session_factory)
+
+    async def scenario():
+        async with pg_session_factory() as session:
+            await session.execute(
+                insert(Complaint),
+                [{"description": f"Жалоба {i}", "status": "new", "address": ""} for i in range(3)],
+            )
+            await session.commit()
+        response = await export._stream(
+            _service(), ComplaintFilter(), "ndjson", False, "complaints"
+        )
+        # соединение уже взято до начала потока
+        assert sessions[0].in_transaction()
+        body = "".join([chunk async for chunk in response.body_iterator])
+        return body
+
+    lines = [json.loads(line) for line in run(scenario()).splitlines()]
+
+    assert [line["description"] for line in lines] == ["Жалоба 0", "Жалоба 1", "Жалоба 2"]
+    assert not sessions[0].in_transaction()
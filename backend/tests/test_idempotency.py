@@ -0,0 +1,84 @@
+from sqlalchemy import func, select
+
+from src.adapters.repo import IdempotencyKeyRepository
+from src.api.complaints import router
+from src.db.models import Complaint, IdempotencyKey, TicketStatus
+from src.schemas.complaint import ComplaintCreate
+from src.services.idempotency import IdempotencyService
+from tests.conftest import make_api_client, requires_postgres
+
+BODY = {"description": "Яма во дворе", "status": "new", "address": "ул. Ленина 1"}
+HEADERS = {"Idempotency-Key": "k-1"}
+
+
+async def _counts(session_factory) -> tuple[int, int, int]:
+    async with session_factory() as session:
+        return tuple(
+            [
+                await session.scalar(select(func.count()).select_from(model))
+                for model in (Complaint, TicketStatus, IdempotencyKey)
+            ]
+        )
+
+
+class _FailingSaveRepository(IdempotencyKeyRepository):
+    async def save_response(self, *args, **kwargs):
+        raise RuntimeError("ответ не записался")
+
+
+@requires_postgres
+def test_retry_replays_stored_response(run, pg_session_factory):
+    client = make_api_client(pg_session_factory, router)
+
+    first = client.post("/complaints", json=BODY, headers=HEADERS)
+    second = client.post("/complaints", json=BODY, headers=HEADERS)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert run(_counts(pg_session_factory)) == (1, 1, 1)
+
+
+@requires_postgres
+def test_same_key_with_different_body_is_422(pg_session_factory):
+    client = make_api_client(pg_session_factory, router)
+
+    client.post("/complaints", json=BODY, headers=HEADERS)
+    response = client.post("/complaints", json={**BODY, "address": "ул. Ленина 2"}, headers=HEADERS)
+
+    assert response.status_code == 422
+
+
+@requires_postgres
+def test_key_in_progress_is_409(run, pg_session_factory):
+    service = IdempotencyService(IdempotencyKeyRepository())
+
+    async def claim():
+        # запрос с тем же ключом ещё выполняется: ключ занят, ответа нет
+        async with pg_session_factory() as session:
+            payload = ComplaintCreate(**BODY).model_dump(mode="json")
+            await service.begin(session, "create_complaint", "k-1", payload)
+
+    run(claim())
+    response = make_api_client(pg_session_factory, router).post(
+        "/complaints", json=BODY, headers=HEADERS
+    )
+
+    assert response.status_code == 409
+    assert run(_counts(pg_session_factory)) == (0, 0, 1)
+
+
+@requires_postgres
+def test_response_is_committed_with_the_writes(run, pg_session_factory):
+    client = make_api_client(
+        pg_session_factory,
+        router,
+        idempotency_service=IdempotencyService(_FailingSaveRepository()),
+        raise_server_exceptions=False,
+    )
+
+    response = client.post("/complaints", json=BODY, headers=HEADERS)
+
+    # ответ не сохранился — откатилась и заявка, ключ освобождён под повтор
+    assert response.status_code == 500
+    assert run(_counts(pg_session_factory)) == (0, 0, 0)
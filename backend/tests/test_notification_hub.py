@@ -0,0 +1,219 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from src.notifications.hub import (
+    NotificationHub,
+    _Client,
+    event_topics,
+    validate_topics,
+)
+
+
+def _client(**hub_options) -> TestClient:
+    hub = NotificationHub(heartbeat_seconds=1000, **hub_options)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await hub.start()
+        yield
+        await hub.stop()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        await hub.serve(websocket)
+
+    # publish() должен идти из цикла событий хаба, а не из потока теста
+    @app.post("/publish")
+    async def publish(message: dict):
+        hub.publish(message)
+
+    return TestClient(app)
+
+
+def _receive(ws) -> dict:
+    return json.loads(ws.receive_text())
+
+
+# ======== рассылка ========
+
+
+class _FakeWebSocket:
+    def __init__(self) -> None:
+        self.close_code = None
+
+    async def close(self, code: int, reason: str = "") -> None:
+        self.close_code = code
+
+
+def test_every_client_receives_broadcast():
+    with _client() as client:
+        with client.websocket_connect("/ws") as first, client.websocket_connect("/ws") as second:
+            _receive(first), _receive(second)
+
+            client.post("/publish", json={"complaint_id": 1, "type": "redirect"})
+
+            assert _receive(first)["complaint_id"] == 1
+            assert _receive(second)["complaint_id"] == 1
+
+
+def test_slow_consumer_is_evicted_without_blocking_others(run):
+    async def scenario():
+        hub = NotificationHub(heartbeat_seconds=1000)
+        slow_ws, fast_ws = _FakeWebSocket(), _FakeWebSocket()
+        slow, fast = _Client(slow_ws, queue_size=1), _Client(fast_ws, queue_size=10)
+        for websocket, client in ((slow_ws, slow), (fast_ws, fast)):
+            hub._clients[websocket] = client
+            hub._subscribe(client, ["all"])
+
+        hub._route({"complaint_id": 1})
+        hub._route({"complaint_id": 2})
+        # вытеснение идёт отдельной задачей
+        await asyncio.sleep(0.01)
+        result = slow_ws.close_code, fast.queue.qsize(), set(hub._clients.values()) == {fast}
+        await hub.stop()
+        return result
+
+    close_code, fast_queued, only_fast_left = run(scenario())
+
+    assert close_code == 1013
+    assert fast_queued == 2
+    assert only_fast_left
+
+
+# ======== топики ========
+
+
+def test_event_topics_cover_complaint_district_executor_and_type():
+    topics = event_topics(
+        {"complaint_ids": [1, 2], "district": "Центр", "executor_id": 7, "type": "block"}
+    )
+
+    assert topics == {
+        "all",
+        "complaint:1",
+        "complaint:2",
+        "district:Центр",
+        "executor:7",
+        "type:block",
+    }
+
+
+@pytest.mark.parametrize("topic", ["bad topic", "complaint:x", "type:Block", "district:"])
+def test_validate_topics_rejects_malformed(topic):
+    with pytest.raises(ValueError):
+        validate_topics([topic])
+
+
+def test_clients_receive_only_their_topics():
+    with _client() as client:
+        with (
+            client.websocket_connect("/ws") as everything,
+            client.websocket_connect("/ws?topics=district:Центр") as district,
+        ):
+            assert _receive(everything)["type"] == "hello"
+            assert _receive(district)["type"] == "hello"
+
+            client.post("/publish", json={"complaint_id": 1, "type": "redirect", "district": "Центр"})
+            client.post("/publish", json={"complaint_id": 2, "type": "block", "district": "Юг"})
+
+            assert [_receive(everything)["complaint_id"] for _ in range(2)] == [1, 2]
+            assert _receive(district) == {
+                "complaint_id": 1, "type": "redirect", "district": "Центр", "seq": 1,
+            }
+
+
+def test_subscribe_frame_replaces_implicit_all():
+    with _client() as client, client.websocket_connect("/ws") as ws:
+        _receive(ws)
+        ws.send_text(json.dumps({"action": "subscribe", "topics": ["type:block"]}))
+        assert _receive(ws) == {"type": "subscribed", "topics": ["type:block"]}
+
+        client.post("/publish", json={"complaint_id": 1, "type": "redirect"})
+        client.post("/publish", json={"complaint_id": 2, "type": "block"})
+
+        assert _receive(ws)["complaint_id"] == 2
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        {"action": "subscribe", "topics": ["bad topic"]},
+        {"action": "subscribe", "topics": "type:block"},
+        {"action": "rename", "topics": []},
+    ],
+)
+def test_bad_subscribe_frame_gets_error_and_keeps_connection(frame):
+    with _client() as client, client.websocket_connect("/ws") as ws:
+        _receive(ws)
+        ws.send_text(json.dumps(frame))
+        assert _receive(ws)["type"] == "error"
+
+        client.post("/publish", json={"complaint_id": 1, "type": "block"})
+        assert _receive(ws)["complaint_id"] == 1
+
+
+def test_bad_topics_in_query_close_with_policy_violation():
+    with _client() as client, client.websocket_connect("/ws?topics=complaint:x") as ws:
+        message = ws.receive()
+
+    assert message["type"] == "websocket.close"
+    assert message["code"] == 1008
+
+
+# ======== seq и повтор ========
+
+
+def test_reconnect_with_since_replays_missed_events_of_own_topics():
+    with _client() as client:
+        with client.websocket_connect("/ws?topics=type:block") as ws:
+            hello = _receive(ws)
+            client.post("/publish", json={"complaint_id": 1, "type": "block"})
+            assert _receive(ws)["seq"] == 1
+
+        client.post("/publish", json={"complaint_id": 2, "type": "redirect"})
+        client.post("/publish", json={"complaint_id": 3, "type": "block"})
+
+        url = f"/ws?topics=type:block&since=1&epoch={hello['epoch']}"
+        with client.websocket_connect(url) as ws:
+            assert _receive(ws) == {"type": "hello", "epoch": hello["epoch"], "seq": 3}
+            assert _receive(ws) == {"complaint_id": 3, "type": "block", "seq": 3}
+
+
+def test_reconnect_with_since_only_assumes_current_epoch():
+    with _client() as client:
+        with client.websocket_connect("/ws") as ws:
+            epoch = _receive(ws)["epoch"]
+        client.post("/publish", json={"complaint_id": 1, "type": "block"})
+
+        with client.websocket_connect("/ws?since=0") as ws:
+            assert _receive(ws) == {"type": "hello", "epoch": epoch, "seq": 1}
+            assert _receive(ws) == {"complaint_id": 1, "type": "block", "seq": 1}
+
+
+@pytest.mark.parametrize("query", ["since=1", "since=0&epoch=other"])
+def test_reconnect_gets_reset_when_events_cannot_be_replayed(query):
+    # в буфере только 3 последних события, since=1 уже вытеснен;
+    # другой epoch — хаб перезапускался, seq несравнимы
+    with _client(replay_buffer_size=3) as client:
+        with client.websocket_connect("/ws") as ws:
+            epoch = _receive(ws)["epoch"]
+        for complaint_id in range(5):
+            client.post("/publish", json={"complaint_id": complaint_id, "type": "block"})
+
+        with client.websocket_connect(f"/ws?{query}") as ws:
+            assert _receive(ws) == {"type": "reset", "epoch": epoch, "seq": 5}
+
+
+def test_bad_connect_query_closes_with_policy_violation():
+    with _client() as client, client.websocket_connect("/ws?since=-1") as ws:
+        message = ws.receive()
+
+    assert message["type"] == "websocket.close"
+    assert message["code"] == 1008
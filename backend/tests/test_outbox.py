@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import asyncpg
+import pytest
+from sqlalchemy import select
+
+from src.adapters.repo import OutboxRepository
+from src.db.models import OutboxEvent
+from src.notifications.hub import NotificationHub
+from src.notifications.outbox import OutboxDispatcher
+from src.notifications.publisher import LocalNotificationPublisher, PgNotifyPublisher
+from tests.conftest import TEST_DATABASE_URL, requires_postgres
+
+CHANNEL = "test_complaint_events"
+
+
+class _FailingPublisher:
+    async def publish_batch(self, session, messages):
+        raise ConnectionError("notifier недоступен")
+
+
+class _FailingMarkRepository(OutboxRepository):
+    async def mark_published(self, session, event_ids):
+        raise RuntimeError("отметка не записалась")
+
+
+async def _add_events(session_factory, count: int = 2) -> None:
+    async with session_factory() as session:
+        repo = OutboxRepository()
+        for n in range(count):
+            await repo.add_event(session, "redirect", {"complaint_id": n, "type": "redirect"})
+        await session.commit()
+
+
+async def _unpublished(session_factory) -> int:
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(OutboxEvent.event_id).filter(OutboxEvent.published_at.is_(None))
+        )
+        return len(rows.all())
+
+
+def _dispatcher(session_factory, publisher, repo=None) -> OutboxDispatcher:
+    return OutboxDispatcher(repo or OutboxRepository(), publisher, session_factory)
+
+
+@requires_postgres
+def test_failed_publish_leaves_events_unpublished(run, pg_session_factory):
+    async def scenario():
+        await _add_events(pg_session_factory)
+        with pytest.raises(ConnectionError):
+            await _dispatcher(pg_session_factory, _FailingPublisher()).run_once()
+        return await _unpublished(pg_session_factory)
+
+    assert run(scenario()) == 2
+
+
+@requires_postgres
+def test_full_hub_keeps_events_until_there_is_room(run, pg_session_factory):
+    async def scenario():
+        await _add_events(pg_session_factory)
+        # хаб не запущен: входящую очередь никто не разбирает
+        hub = NotificationHub(inbound_queue_size=1)
+        hub.publish({"type": "ping"})
+        dispatcher = _dispatcher(
+            pg_session_factory, LocalNotificationPublisher(hub, timeout=0.05)
+        )
+        with pytest.raises(asyncio.TimeoutError):
+            await dispatcher.run_once()
+        stuck = await _unpublished(pg_session_factory)
+
+        hub = NotificationHub()
+        dispatcher = _dispatcher(pg_session_factory, LocalNotificationPublisher(hub))
+        sent = await dispatcher.run_once()
+        delivered = [hub._inbound.get_nowait() for _ in range(hub._inbound.qsize())]
+        return stuck, sent, delivered, await _unpublished(pg_session_factory)
+
+    stuck, sent, delivered, left = run(scenario())
+
+    assert stuck == 2
+    assert sent == 2
+    assert [message["complaint_id"] for message in delivered] == [0, 1]
+    assert all("event_id" in message for message in delivered)
+    assert left == 0
+
+
+async def _listen(received: list) -> asyncpg.Connection:
+    conn = await asyncpg.connect(TEST_DATABASE_URL.replace("+asyncpg", ""))
+    await conn.add_listener(
+        CHANNEL, lambda _conn, _pid, _channel, payload: received.append(json.loads(payload))
+    )
+    return conn
+
+
+@requires_postgres
+def test_notify_is_sent_with_the_published_mark(run, pg_session_factory):
+    async def scenario():
+        received = []
+        conn = await _listen(received)
+        try:
+            await _add_events(pg_session_factory)
+            sent = await _dispatcher(
+                pg_session_factory, PgNotifyPublisher(channel=CHANNEL)
+            ).run_once()
+            await asyncio.sleep(0.2)
+        finally:
+            await conn.close()
+        return sent, received, await _unpublished(pg_session_factory)
+
+    sent, received, left = run(scenario())
+
+    assert sent == 2
+    assert [message["complaint_id"] for message in received] == [0, 1]
+    assert left == 0
+
+
+@requires_postgres
+def test_notify_is_rolled_back_with_the_mark(run, pg_session_factory):
+    async def scenario():
+        received = []
+        conn = await _listen(received)
+        try:
+            await _add_events(pg_session_factory)
+            with pytest.raises(RuntimeError):
+                await _dispatcher(
+                    pg_session_factory,
+                    PgNotifyPublisher(channel=CHANNEL),
+                    repo=_FailingMarkRepository(),
+                ).run_once()
+            await asyncio.sleep(0.2)
+        finally:
+            await conn.close()
+        return received, await _unpublished(pg_session_factory)
+
+    received, left = run(scenario())
+
+    assert received == []
+    assert left == 2
@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from src.core.singleflight import SingleFlight
+from src.schemas.complaint import ComplaintRead
+from src.services.complaints import ComplaintService
+
+
+def test_concurrent_calls_share_one_execution(run):
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+
+    assert run(scenario()) == [1] * 5
+    assert calls == 1
+
+
+def test_error_reaches_every_waiter(run):
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(flight.do("k", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    results = run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_waiter_retries_when_leader_is_cancelled(run):
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert run(scenario()) == "value"
+    assert calls == 2
+
+
+class _ComplaintRepo:
+    def __init__(self):
+        self.sessions = []
+
+    async def get_complaint(self, session, complaint_id):
+        self.sessions.append(session)
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(
+            complaint_id=complaint_id,
+            description="Яма",
+            district="Центр",
+            status="new",
+            executor_id=None,
+            address="",
+            resolution=None,
+            created_at=datetime(2025, 1, 1),
+            execution_date=None,
+            final_status_at=None,
+        )
+
+
+def test_coalesced_complaint_reads_return_detached_snapshots(run):
+    repo = _ComplaintRepo()
+    service = ComplaintService(
+        complaint_repo=repo,
+        executor_repo=None,
+        moderator_repo=None,
+        ticket_status_repo=None,
+        ai_client=None,
+        job_repo=None,
+        outbox_repo=None,
+    )
+
+    async def scenario():
+        return await asyncio.gather(
+            service.get_complaint("session-a", 7), service.get_complaint("session-b", 7)
+        )
+
+    first, second = run(scenario())
+
+    assert repo.sessions == ["session-a"]
+    assert isinstance(first, ComplaintRead)
+    assert first == second
+    with pytest.raises(ValidationError):
+        first.status = "closed"
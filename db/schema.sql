@@ -11,6 +11,35 @@ CREATE TABLE IF NOT EXISTS executors (
     is_active    BOOLEAN NOT NULL DEFAULT TRUE
 );
 
+-- уникальный нормализованный ключ (src.db.models.normalize_executor_name);
+-- при дублях имён уникальный индекс не создастся — их нужно объединить вручную.
+-- Пробелы — тот же явный набор, что в Python (\s зависит от локали);
+-- lower под C.utf8, иначе в базе с локалью C кириллица не переводится в нижний регистр
+ALTER TABLE executors ADD COLUMN IF NOT EXISTS normalized_name VARCHAR(255);
+
+UPDATE executors
+SET normalized_name = replace(
+    lower(
+        btrim(
+            regexp_replace(
+                name,
+                '[\t\n\v\f\r\u001c-\u001f \u0085\u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+',
+                ' ',
+                'g'
+            ),
+            ' '
+        ) COLLATE "C.utf8"
+    ),
+    'ё',
+    'е'
+)
+WHERE normalized_name IS NULL;
+
+ALTER TABLE executors ALTER COLUMN normalized_name SET NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS executors_normalized_name_key
+    ON executors (normalized_name);
+
 -- ============================
 -- COMPLAINTS
 -- ============================
@@ -20,6 +49,7 @@ CREATE TABLE IF NOT EXISTS complaints (
     execution_date   TIMESTAMP,
     final_status_at  TIMESTAMP,
     status           VARCHAR(50) NOT NULL,
+    address          VARCHAR(100) NOT NULL,
     executor_id      BIGINT REFERENCES executors(executor_id),
     district         VARCHAR(255),
     description      TEXT NOT NULL,
@@ -31,6 +61,37 @@ CREATE INDEX IF NOT EXISTS idx_complaints_created_at
 
 CREATE INDEX IF NOT EXISTS idx_complaints_executor_id
     ON complaints (executor_id);
+
+-- ленты заявок: ORDER BY created_at DESC, complaint_id DESC (keyset-пагинация)
+CREATE INDEX IF NOT EXISTS ix_complaints_created_at_id
+    ON complaints (created_at, complaint_id);
+
+-- фильтры списка заявок: равенство по полю + сортировка/курсор по (created_at, complaint_id)
+CREATE INDEX IF NOT EXISTS ix_complaints_status_created_at
+    ON complaints (status, created_at, complaint_id);
+
+CREATE INDEX IF NOT EXISTS ix_complaints_district_created_at
+    ON complaints (district, created_at, complaint_id);
+
+CREATE INDEX IF NOT EXISTS ix_complaints_executor_id_created_at
+    ON complaints (executor_id, created_at, complaint_id);
+
+-- открытые заявки
+CREATE INDEX IF NOT EXISTS ix_complaints_open_created_at
+    ON complaints (created_at, complaint_id)
+    WHERE final_status_at IS NULL;
+
+-- полнотекстовый поиск (GET /complaints/search)
+ALTER TABLE complaints
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'A') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(address, '')), 'B') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(resolution, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_complaints_search_vector
+    ON complaints USING GIN (search_vector);
+
 -- ============================
 -- MODERATORS
 -- ============================
@@ -65,4 +126,8 @@ CREATE TABLE IF NOT EXISTS ticket_statuses (
 CREATE INDEX IF NOT EXISTS idx_ticket_statuses_complaint_id
     ON ticket_statuses (complaint_id);
 
+-- хронология заявки: WHERE complaint_id = ? ORDER BY data
+CREATE INDEX IF NOT EXISTS ix_ticket_statuses_complaint_id_data
+    ON ticket_statuses (complaint_id, data);
+
 